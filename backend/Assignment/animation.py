@@ -1,19 +1,19 @@
 import json
 from manim import *
 import os
-from manim_narration import NarrationScene
-from manim_narration.speech import KokoroService
+from narration_prefetch import PrefetchNarrationScene
+from speech_services import kokoro_voice
 from manim_narration import config as nar_config
 # import helper functions and solver function
 from helper_funcs import AnimationHelpers
-from line_finder import solve_lines
+from hungarian import hungarian
 
 # --- START: MODIFICATIONS FOR API INTEGRATION ---
 
-class MyScene(NarrationScene):
+class MyScene(PrefetchNarrationScene):
     def construct(self):
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # self.next_section(skip_animations=True)
         # Load the data from the file path provided via arguments
@@ -25,6 +25,7 @@ class MyScene(NarrationScene):
                 table_data = saved_data["matrix"]
                 question_data = saved_data["matrix"]
                 problem_type = saved_data.get("type", "minimization")
+                restrictions = saved_data.get("restrictions") or []
         except (FileNotFoundError, KeyError) as e:
             # This default data is now just a fallback for direct execution
             print(f"Could not load : {e}. Using default matrix.")
@@ -62,7 +63,7 @@ class MyScene(NarrationScene):
             self.wait(0.75)
             self.play(step_one_a.animate.scale(0.75))
              
-            new_data, new_table = AnimationHelpers.animate_maximization_transform(self, table, table_data)
+            new_data, new_table = AnimationHelpers.animate_maximization_transform(self, table, table_data, restrictions)
             table_data = new_data  # Update the table data to the new minimization data
             table = new_table      # Update the table reference to the new Manim table
             self.play(FadeOut(step_one_a))
@@ -88,6 +89,11 @@ class MyScene(NarrationScene):
             self.play(step_one_b.animate.scale(0.75))
              
             new_data, new_table = AnimationHelpers.animate_add_dummies(self, table, table_data)
+            if restrictions:
+                # Dummy cells are never restricted
+                size = len(new_data)
+                restrictions = [list(row) + [False] * (size - len(row)) for row in restrictions]
+                restrictions += [[False] * size for _ in range(size - len(restrictions))]
             table_data = new_data  # Update the table data to the new balanced data
             table = new_table      # Update the table reference to the new Manim table
             self.play(FadeOut(step_one_b))
@@ -105,7 +111,7 @@ class MyScene(NarrationScene):
         self.play(explain_row_reduction.animate.scale(0.75))
 
         # Call the new row reduction function
-        new_data, new_table = AnimationHelpers.animate_row_reduction(self, table, table_data)
+        new_data, new_table = AnimationHelpers.animate_row_reduction(self, table, table_data, restrictions)
         
         # Update the main variables to the new state
         table_data = new_data
@@ -135,7 +141,7 @@ class MyScene(NarrationScene):
         self.wait(0.5)
 
         # Call the new column reduction function
-        new_data, new_table = AnimationHelpers.animate_column_reduction(self, table, table_data)
+        new_data, new_table = AnimationHelpers.animate_column_reduction(self, table, table_data, restrictions)
         
         # Update the main variables to the new state
         table_data = new_data
@@ -154,14 +160,14 @@ class MyScene(NarrationScene):
         self.wait(1)
         #dimension of the table
         dimension = len(table_data)
-        # This loop repeats until an optimal solution is found
-        while True :
-            print("DEBUG: Matrix being sent to solve_lines:")
-            for row in table_data:
-                print(row)
-            # 1. Find the lines for the current matrix using your solver
-            rows_to_cover, cols_to_cover = solve_lines(table_data)
-            num_lines = len(rows_to_cover) + len(cols_to_cover)
+        # The same Hungarian run as the JSON answer: one entry per cover,
+        # the last one with as many lines as the dimension
+        cover_steps = []
+        hungarian(table_data, trace=cover_steps, forbidden=restrictions or None)
+        for cover in cover_steps:
+            # 1. The minimum lines for the current matrix
+            rows_to_cover, cols_to_cover = cover['rows_covered'], cover['cols_covered']
+            num_lines = cover['lines']
             print(f"DEBUG: Found {num_lines} lines to cover all zeros.")
 
             # 2. Animate drawing the lines
@@ -179,7 +185,7 @@ class MyScene(NarrationScene):
                     self.play(Write(optimal_text), run_time=narration.duration)
                 self.wait(1)
                 self.play(FadeOut(lines_mobject), FadeOut(optimal_text), FadeOut(step_four))
-                break # Exit the while loop
+                break # Last cover, n lines
             else:
                 # If not optimal, show message, then adjust the matrix
                 self.play(FadeOut(Header))
@@ -196,7 +202,7 @@ class MyScene(NarrationScene):
                  
                 # Call the adjustment function to get the new data and table
                 new_data, new_table = AnimationHelpers.animate_matrix_adjustment(
-                self, table, table_data, rows_to_cover, cols_to_cover, lines_mobject)
+                self, table, table_data, rows_to_cover, cols_to_cover, lines_mobject, restrictions)
 
                 print("DEBUG: Adjusted the matrix for the next iteration. ", new_data)
                 # Update the main variables for the next loop iteration
@@ -210,7 +216,7 @@ class MyScene(NarrationScene):
             self.play(Write(step_five), run_time=narration.duration)
         self.wait(0.75)
         
-        final_assignments, source_cells_for_cost= AnimationHelpers.animate_final_assignment(self, table, table_data, step_five, question_data)
+        final_assignments, source_cells_for_cost= AnimationHelpers.animate_final_assignment(self, table, table_data, step_five, question_data, restrictions)
         
         self.wait(1)
         AnimationHelpers.animate_assignment_summary(
@@ -2,9 +2,11 @@ import argparse
 import sys
 import json
 import numpy as np
-import subprocess  # Used to call Manim
 import os          # Used to get file paths
-import shutil      # Used to move the final video file
+
+# --- Shared Manim renderer (backend/manim_render.py) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manim_render import render_scene
 
 # --- Import the solver logic ---
 # We assume assignment_solver.py is in the same directory
@@ -14,42 +16,6 @@ except ImportError:
     print(f"[ERROR] Could not import 'AssignmentSolver' from assignment_solver.py.", file=sys.stderr)
     sys.exit(1)
 
-# --- Manim Helper Function ---
-def _run_manim_scene(script_name, scene_name, cwd_dir):
-    """
-    Runs a specific Manim scene and handles errors.
-    """
-    animation_script_path = os.path.join(cwd_dir, script_name)
-    
-    # Command: manim -ql <script_name> <scene_name>
-    manim_command = ["manim", "-ql", animation_script_path, scene_name, "--disable_caching"]
-    
-    print(f"Running command: {' '.join(manim_command)}")
-    
-    result = subprocess.run(manim_command, cwd=cwd_dir, capture_output=True, text=True, encoding='utf-8')
-
-    if result.returncode != 0:
-        print("--- MANIM FAILED ---", file=sys.stderr)
-        print("STDOUT:", result.stdout, file=sys.stdout)
-        print("STDERR:", result.stderr, file=sys.stderr)
-        raise Exception(f"Manim rendering for {script_name} failed. See stderr.")
-    
-    print(f"Manim render complete for {scene_name}")
-    
-    script_name_no_ext = os.path.splitext(script_name)[0]
-    
-    # Manim saves to: media/videos/<script_name_no_ext>/<quality>/<scene_name>.mp4
-    rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p15", f"{scene_name}.mp4")
-
-    if not os.path.exists(rendered_file_path):
-        print(f"Warning: Could not find 480p file. Trying 720p30...", file=sys.stderr)
-        rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "720p30", f"{scene_name}.mp4")
-        if not os.path.exists(rendered_file_path):
-            print(f"Error: Could not find rendered file at {rendered_file_path}", file=sys.stderr)
-            raise Exception("Manim rendered, but output file not found.")
-            
-    return rendered_file_path
-
 # --- Main Generation Functions ---
 
 def generate_direct_solution(input_data, output_file):
@@ -63,7 +29,7 @@ def generate_direct_solution(input_data, output_file):
         problem_type = input_data['problemType']
         
         # Call your solver
-        solver = AssignmentSolver(cost_matrix, problem_type)
+        solver = AssignmentSolver(cost_matrix, problem_type, input_data.get('restrictions'))
         solution = solver.solve()
         
         print(f"[SUCCESS] Solver finished.")
@@ -98,6 +64,7 @@ def generate_video(input_data, output_video_path):
     print("Starting Manim video generation process for Assignment Problem...")
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    narration_mode = input_data.get('videoMode', 'narrated') # 'narrated' or 'subtitles'
     
     # 1. --- Prepare Manim Input File (assignment_problem.json) ---
     # This is the file your animation.py will read
@@ -107,7 +74,7 @@ def generate_video(input_data, output_video_path):
     manim_data = {
         "matrix": input_data['tableData'],
         "type": input_data['problemType'],
-        "restrictions": [] # You can add this to your frontend/model later
+        "restrictions": input_data.get('restrictions') or [] # True = worker can't take that task
     }
     
     try:
@@ -120,11 +87,9 @@ def generate_video(input_data, output_video_path):
 
     # 2. --- Run the Manim Scene ---
     # Your animation.py has class MyScene
-    video_path = _run_manim_scene("animation.py", "MyScene", script_dir)
-    
-    # 3. --- Move the final video ---
-    shutil.move(video_path, output_video_path)
-    print(f"Manim video moved to {output_video_path}")
+    render_scene("animation.py", "MyScene", script_dir, output_video_path,
+                 narration_mode=narration_mode)
+    print(f"Manim video saved to {output_video_path}")
 
 
 def generate_pdf_report(input_data, output_file):
@@ -10,77 +10,123 @@ import numpy as np
 from typing import List, Dict, Tuple
 import sys
 
+from hungarian import hungarian
+
 # Import your actual solver and visualization libraries
 # from manim import *  # For video generation
 # from reportlab.lib.pagesizes import letter  # For PDF generation
-# from scipy.optimize import linear_sum_assignment  # For solving
+
+
+def restriction_mask(restrictions, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Turns the request's 'restrictions' (rows x cols booleans, True where
+    that worker can't take that task) into a boolean mask. None or [] means
+    no restrictions.
+    """
+    if restrictions is None or len(restrictions) == 0:
+        return np.zeros(shape, dtype=bool)
+    mask = np.array(restrictions, dtype=bool)
+    if mask.shape != tuple(shape):
+        raise ValueError(f"Restrictions must be a {shape[0]}x{shape[1]} matrix, got {mask.shape}.")
+    return mask
 
 
 class AssignmentSolver:
     """Hungarian Algorithm Implementation"""
     
-    def __init__(self, cost_matrix: np.ndarray, problem_type: str = 'min'):
+    def __init__(self, cost_matrix: np.ndarray, problem_type: str = 'min', restrictions=None):
         self.original_matrix = cost_matrix.copy()
         self.matrix = cost_matrix.copy()
         self.problem_type = problem_type
         self.rows, self.cols = cost_matrix.shape
+        # Forbidden cells: skipped by every step and never assigned, so
+        # their values don't need to be huge placeholder numbers
+        self.restricted = restriction_mask(restrictions, cost_matrix.shape)
         self.steps = []  # Store solution steps for visualization
         
     def solve(self) -> Dict:
         """Solve the assignment problem"""
+        if self.restricted.all():
+            raise ValueError("Every cell is restricted.")
         
         # Convert maximization to minimization if needed
         if self.problem_type == 'max':
-            max_val = np.max(self.matrix)
+            max_val = np.max(self.matrix[~self.restricted])
             self.matrix = max_val - self.matrix
             self.steps.append({
                 'step': 'Convert to Minimization',
                 'description': f'Subtract all values from {max_val}',
-                'matrix': self.matrix.tolist()
+                'matrix': self._matrix_list()
             })
         
-        # Make matrix square if needed
+        # Non-square problems are solved as they are. The dummy rows/columns
+        # (cost 0) are only implied: they'd hold every minimum on the larger
+        # side, so that side is simply not reduced.
+        size = min(self.rows, self.cols)
         if self.rows != self.cols:
-            self.matrix = self._make_square()
+            dummies = 'workers' if self.rows < self.cols else 'tasks'
             self.steps.append({
                 'step': 'Make Square Matrix',
-                'description': f'Added dummy rows/columns to make {max(self.rows, self.cols)}x{max(self.rows, self.cols)}',
-                'matrix': self.matrix.tolist()
+                'description': f'{abs(self.rows - self.cols)} dummy {dummies} with cost 0 make it '
+                               f'{max(self.rows, self.cols)}x{max(self.rows, self.cols)} (not stored)',
+                'matrix': self._matrix_list()
             })
         
-        # Step 1: Row Reduction
-        for i in range(len(self.matrix)):
-            min_val = np.min(self.matrix[i])
-            self.matrix[i] -= min_val
+        # Step 1: Row Reduction (over the allowed cells)
+        if self.rows <= self.cols:
+            for i in range(self.rows):
+                allowed = self.matrix[i][~self.restricted[i]]
+                if allowed.size == 0:
+                    raise ValueError(f"Worker {i + 1} has every task restricted.")
+                self.matrix[i] -= np.min(allowed)
+            description = 'Subtract minimum value from each row'
+        else:
+            description = 'Skipped: every row has a dummy task costing 0'
             
         self.steps.append({
             'step': 'Row Reduction',
-            'description': 'Subtract minimum value from each row',
-            'matrix': self.matrix.tolist()
+            'description': description,
+            'matrix': self._matrix_list()
         })
         
         # Step 2: Column Reduction
-        for j in range(len(self.matrix[0])):
-            min_val = np.min(self.matrix[:, j])
-            self.matrix[:, j] -= min_val
+        if self.cols <= self.rows:
+            for j in range(self.cols):
+                allowed = self.matrix[:, j][~self.restricted[:, j]]
+                if allowed.size == 0:
+                    raise ValueError(f"Task {j + 1} has every worker restricted.")
+                self.matrix[:, j] -= np.min(allowed)
+            description = 'Subtract minimum value from each column'
+        else:
+            description = 'Skipped: every column has a dummy worker costing 0'
             
         self.steps.append({
             'step': 'Column Reduction',
-            'description': 'Subtract minimum value from each column',
-            'matrix': self.matrix.tolist()
+            'description': description,
+            'matrix': self._matrix_list()
         })
         
-        # Step 3: Find optimal assignment
-        # Using scipy's implementation (you can replace with your own)
-        try:
-            from scipy.optimize import linear_sum_assignment
-            row_ind, col_ind = linear_sum_assignment(self.matrix)
-        except ImportError:
-            # Fallback to simple greedy assignment for demo
-            row_ind, col_ind = self._greedy_assignment()
-        
-        # Calculate total cost
-        total_cost = sum(self.original_matrix[i, j] for i, j in zip(row_ind, col_ind))
+        # Step 3: Cover the zeros with the fewest lines and adjust the
+        # matrix until min(rows, cols) lines are needed (Kuhn-Munkres on
+        # the rectangular matrix, see hungarian.py)
+        cover_steps = []
+        col_ind, _, _ = hungarian(self.matrix, trace=cover_steps, forbidden=self.restricted)
+        row_ind = list(range(len(col_ind)))
+        for cover in cover_steps:
+            self.steps.append({
+                'step': 'Cover Zeros',
+                'description': f"{cover['lines']} lines cover all zeros",
+                'matrix': cover['matrix'],
+                'rows_covered': cover['rows_covered'],
+                'cols_covered': cover['cols_covered']
+            })
+            if cover['min_uncovered'] is not None:
+                self.steps.append({
+                    'step': 'Adjust Matrix',
+                    'description': f"Lines ({cover['lines']}) < dimension ({size}): subtract "
+                                   f"{cover['min_uncovered']} from uncovered cells, add it where lines cross",
+                    'min_uncovered': cover['min_uncovered']
+                })
         
         # Create assignment mapping
         assignments = [
@@ -90,9 +136,12 @@ class AssignmentSolver:
                 'cost': float(self.original_matrix[i, j])
             }
             for i, j in zip(row_ind, col_ind)
-            if i < self.rows and j < self.cols  # Exclude dummy assignments
+            if j >= 0  # Rows left over when there are more workers than tasks
         ]
         
+        # Calculate total cost
+        total_cost = sum(assignment['cost'] for assignment in assignments)
+        
         return {
             'assignments': assignments,
             'total_cost': float(total_cost),
@@ -101,39 +150,11 @@ class AssignmentSolver:
             'optimal': True
         }
     
-    def _make_square(self) -> np.ndarray:
-        """Add dummy rows or columns to make matrix square"""
-        size = max(self.rows, self.cols)
-        square_matrix = np.zeros((size, size))
-        
-        # Copy original values
-        square_matrix[:self.rows, :self.cols] = self.matrix
-        
-        # Fill dummy cells with large values (for minimization)
-        # or zero (they won't affect the solution)
-        if self.rows < size:
-            square_matrix[self.rows:, :] = np.max(self.matrix) * 10
-        if self.cols < size:
-            square_matrix[:, self.cols:] = np.max(self.matrix) * 10
-            
-        return square_matrix
-    
-    def _greedy_assignment(self) -> Tuple[np.ndarray, np.ndarray]:
-        """Simple greedy assignment as fallback"""
-        n = len(self.matrix)
-        row_ind = []
-        col_ind = []
-        used_cols = set()
-        
-        for i in range(n):
-            available_cols = [j for j in range(n) if j not in used_cols]
-            if available_cols:
-                min_col = min(available_cols, key=lambda j: self.matrix[i, j])
-                row_ind.append(i)
-                col_ind.append(min_col)
-                used_cols.add(min_col)
-        
-        return np.array(row_ind), np.array(col_ind)
+    def _matrix_list(self) -> List[List]:
+        """The current matrix for a step, None in the restricted cells."""
+        if not self.restricted.any():
+            return self.matrix.tolist()
+        return np.where(self.restricted, None, self.matrix).tolist()
 
 
 def generate_video(input_data: Dict, output_path: str) -> None:
@@ -194,7 +215,7 @@ def main():
         print(f"Output type: {args.type}")
         
         # Solve the problem
-        solver = AssignmentSolver(cost_matrix, problem_type)
+        solver = AssignmentSolver(cost_matrix, problem_type, input_data.get('restrictions'))
         solution = solver.solve()
         
         # Generate output based on type
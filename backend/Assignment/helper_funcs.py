@@ -1,6 +1,7 @@
 from manim import *
 from manim_narration import NarrationScene
-from manim_narration.speech import KokoroService
+from speech_services import kokoro_voice
+from matrix_table import MatrixTable, integer_glyphs
 
 class AnimationHelpers:
     """
@@ -10,22 +11,26 @@ class AnimationHelpers:
 
     def create_and_show_table(self, table_data, restrictions=None):
         """
-        Creates a Manim IntegerTable from a 2D list, animates its creation,
-        and returns the table mobject.
+        Creates a MatrixTable (an IntegerTable with cached glyphs) from a
+        2D list, animates its creation, and returns the table mobject.
         """
         # 1. Determine the dimensions from the data
         num_rows = len(table_data)
         num_cols = len(table_data[0]) if num_rows > 0 else 0
 
         # 2. Generate row and column labels automatically
-        row_labels = [Tex(str(i + 1)) for i in range(num_rows)]
-        col_labels = [Tex(str(chr(65 + i))) for i in range(num_cols)] # A, B, C...
+        row_labels = [str(i + 1) for i in range(num_rows)]
+        col_labels = [chr(65 + i) for i in range(num_cols)] # A, B, C...
 
-        # 3. Create the IntegerTable mobject
-        table = IntegerTable(
+        # 3. Create the table mobject
+        # The Hungarian steps address every row and column directly, so the
+        # whole matrix is always laid out (no scrolling window)
+        table = MatrixTable(
             table_data,
             row_labels=row_labels,
             col_labels=col_labels,
+            max_rows=None,
+            max_cols=None,
             h_buff=1.5 # Add more buffer for readability
         ).scale(0.7).shift(DOWN*0.5) # Shift down to make space for header
 
@@ -34,13 +39,13 @@ class AnimationHelpers:
         self.wait(1)
         return table
 
-    def animate_maximization_transform(self, table, data):
+    def animate_maximization_transform(self, table, data, restrictions=None):
         """
         Animates the conversion of a maximization problem to a minimization problem.
         Returns the new data and the new Manim table object.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # 1. Explain the goal
         explanation = Tex("Maximization Problem:", " Convert to Minimization").scale(0.8).next_to(table, UP, buff=0.65)
@@ -48,10 +53,12 @@ class AnimationHelpers:
             self.play(Write(explanation), table.animate.shift(DOWN*0.75).scale(0.9), run_time=narration.duration)
         self.wait(1)
 
-        # 2. Find the maximum value in the matrix
+        # 2. Find the maximum value in the matrix (restricted cells excluded)
         max_val = 0
-        for row in data:
-            for val in row:
+        for r, row in enumerate(data):
+            for c, val in enumerate(row):
+                if restrictions and restrictions[r][c]:
+                    continue
                 if val > max_val:
                     max_val = val
         
@@ -79,9 +86,10 @@ class AnimationHelpers:
         # We need a local helper to create the new table correctly
         def create_new_table_from_data(table_data, position):
             n_rows, n_cols = len(table_data), len(table_data[0])
-            col_lbls = [Tex(str(chr(65+i))) for i in range(n_cols)]
-            row_lbls = [Tex(str(i+1)) for i in range(n_rows)]
-            new_table_obj = IntegerTable(table_data, col_labels=col_lbls, row_labels=row_lbls, h_buff=1.5).scale(0.7)
+            col_lbls = [chr(65+i) for i in range(n_cols)]
+            row_lbls = [str(i+1) for i in range(n_rows)]
+            new_table_obj = MatrixTable(table_data, row_labels=row_lbls, col_labels=col_lbls,
+                                        max_rows=None, max_cols=None, h_buff=1.5).scale(0.7)
             new_table_obj.move_to(position)
             return new_table_obj
         
@@ -103,7 +111,7 @@ class AnimationHelpers:
         Returns True if it is, False otherwise.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # Get the VGroups for data rows and columns (excluding headers/labels)
         data_rows = VGroup(*table.get_rows()[1:])
@@ -152,7 +160,7 @@ class AnimationHelpers:
         """
         # Set up the speech service
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         
         num_rows = len(data)
@@ -259,7 +267,7 @@ class AnimationHelpers:
         Takes a single table as input and creates the comparison view internally.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # --- 1. Setup the two-table view ---
         # The table on the left is a static reference copy.
@@ -299,13 +307,14 @@ class AnimationHelpers:
             
             # If all cells in row are restricted, skip reduction
             if min_entry == float('inf'):
+                new_data.append(list(current_row_data))
                 continue
             
             row_highlight = SurroundingRectangle(cells_to_change, buff=0.1, color=BLUE)
             self.play(Create(row_highlight), run_time=0.4)
             
-            min_entry = min(current_row_data)
-            min_cell_col_index = current_row_data.index(min_entry)
+            min_cell_col_index = next(j for j, val in enumerate(current_row_data)
+                                      if val == min_entry and not (restrictions and restrictions[i][j]))
             min_cell = original_table.get_rows()[i+1][min_cell_col_index + 1]
             self.play(Indicate(min_cell, color=YELLOW, scale_factor=1.2), run_time=0.6)
 
@@ -315,7 +324,7 @@ class AnimationHelpers:
                 cell_to_transform = cells_to_change[j]
                 new_value = val - min_entry
                 new_row_data.append(new_value)
-                new_mobject = Integer(new_value).move_to(cell_to_transform)
+                new_mobject = integer_glyphs.get(new_value, WHITE).move_to(cell_to_transform)
                 animations.append(Transform(cell_to_transform, new_mobject))
                 
             new_data.append(new_row_data)
@@ -344,7 +353,7 @@ class AnimationHelpers:
         Animates the column reduction process and returns the new data and table.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # Create a copy of the data to modify
         new_data = [row[:] for row in data]
@@ -354,28 +363,18 @@ class AnimationHelpers:
         # Create a highlight rectangle to move across columns
         highlight_rect = SurroundingRectangle(VGroup(*table.get_columns()[1][1:]), color=BLUE)
         self.play(Create(highlight_rect))
-        for i in range(len(data)):
-            current_row_data = data[i]
-            
-            # Find minimum excluding restricted cells
-            min_entry = float('inf')
-            for j, val in enumerate(current_row_data):
-                if restrictions and restrictions[i][j]:
-                    continue  # Skip restricted cells
-                if val < min_entry:
-                    min_entry = val
-            
-            # If all cells in row are restricted, skip reduction
-            if min_entry == float('inf'):
-                continue
 
         for j in range(num_cols):
             # Move highlight to the current column
             col_cells_to_highlight = VGroup(*table.get_columns()[j+1][1:])
             self.play(highlight_rect.animate.move_to(col_cells_to_highlight))
             
-            # Get column values from our reliable data list
-            column_values = [new_data[i][j] for i in range(num_rows)]
+            # Get column values from our reliable data list, skipping
+            # restricted cells (their zeros can't be assigned)
+            allowed_rows = [i for i in range(num_rows) if not (restrictions and restrictions[i][j])]
+            if not allowed_rows:
+                continue
+            column_values = [new_data[i][j] for i in allowed_rows]
             has_zero = 0 in column_values
 
             if has_zero:
@@ -389,7 +388,7 @@ class AnimationHelpers:
                     self.play(highlight_rect.animate.set_color(RED))
                 # Find the minimum value
                 min_entry = min(column_values)
-                min_row_index = column_values.index(min_entry)
+                min_row_index = allowed_rows[column_values.index(min_entry)]
                 min_cell = table.get_rows()[min_row_index + 1][j + 1]
                 with self.narration(speech_service_id="en", text = f"minimum entry is {min_entry}. subtracting each entry of this column with {min_entry}") as narration:
                     self.play(Indicate(min_cell, color=ORANGE, scale_factor=1.2))
@@ -401,7 +400,7 @@ class AnimationHelpers:
                     new_value = new_data[i][j] - min_entry
                     new_data[i][j] = new_value # Update our data list
                     
-                    new_mobject = Integer(new_value).move_to(cell_to_change)
+                    new_mobject = integer_glyphs.get(new_value, WHITE).move_to(cell_to_change)
                     animations.append(Transform(cell_to_change, new_mobject))
                 
                 self.play(AnimationGroup(*animations, lag_ratio=0.15))
@@ -422,7 +421,7 @@ class AnimationHelpers:
         Returns the VGroup of lines and the total number of lines drawn.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         lines = VGroup()
         line_config = {"color": YELLOW, "stroke_width": 3, "stroke_opacity": 0.75}
@@ -462,13 +461,13 @@ class AnimationHelpers:
         self.wait(0.5)       
         return lines
     
-    def animate_matrix_adjustment(self, table, data, covered_rows, covered_cols, lines):
+    def animate_matrix_adjustment(self, table, data, covered_rows, covered_cols, lines, restrictions=None):
         """
         Animates the matrix adjustment process by transforming individual cell entries
         in-place, using the user's preferred animation style.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # --- Step 1: Identify cell categories and find the minimum value ---
         new_data = [row[:] for row in data]
@@ -483,6 +482,8 @@ class AnimationHelpers:
                 is_col_covered = c in covered_cols
                 
                 if not is_row_covered and not is_col_covered:
+                    if restrictions and restrictions[r][c]:
+                        continue # Never the smallest uncovered value
                     uncovered_values.append(data[r][c])
                     uncovered_cells.add(table.get_cell((r + 2, c + 2)))
                 
@@ -509,7 +510,7 @@ class AnimationHelpers:
                 # Check if the cell is uncovered
                 if not (r in covered_rows or c in covered_cols):
                     # Check if this uncovered cell has the minimum value
-                    if data[r][c] == min_val:
+                    if data[r][c] == min_val and not (restrictions and restrictions[r][c]):
                         min_val_location = (r, c)
                         break
             if min_val_location:
@@ -568,7 +569,7 @@ class AnimationHelpers:
         and then columns, including cross-out animations.
         """
         self.set_speech_services(
-            en=KokoroService(voice="af_heart", lang_code="en-us")
+            en=kokoro_voice("af_heart")
         )
         # --- Phase 1: Setup ---
         explanation_text = Tex("Starting Assignment Process...").scale(0.7).next_to(header, DOWN, buff=0.1)
@@ -717,7 +718,7 @@ class AnimationHelpers:
             original_cost = original_data[r][c]
             
             # Create a new Integer mobject for the original cost
-            new_mobject = Integer(original_cost, color=BLUE).move_to(entry_to_replace)
+            new_mobject = integer_glyphs.get(original_cost, BLUE).move_to(entry_to_replace)
             
             # Add the animation to the list
             animations.append(Transform(entry_to_replace, new_mobject))
@@ -0,0 +1,174 @@
+"""
+Kuhn-Munkres (Hungarian) algorithm with dual potentials, O(n^3).
+
+The reduced matrix is never rebuilt: it is cost[i][j] - u[i] - v[j], and a
+cell is a "zero" when that is 0. Starting from the row/column reduction
+(u = row minima, v = column minima of what's left), the zeros are matched
+greedily and then every stage grows alternating paths from all unmatched
+rows at once:
+
+* Rows reached by the search are the uncovered rows, columns reached are
+  the covered columns, and every row the search did not reach is covered.
+  Whenever the search gets stuck that is a minimum line cover of the zeros
+  (as many lines as matched pairs, König), exactly the cover the textbook
+  method draws.
+* The textbook adjustment (subtract the smallest uncovered value from
+  every uncovered cell, add it where two lines cross) is u += delta on the
+  uncovered rows and v -= delta on the covered columns. The smallest
+  uncovered value comes from a per-column 'slack' array, so an adjustment
+  is O(n) instead of a pass over the matrix.
+* A stage ends when a free column is reached: the path to it is flipped,
+  one more pair is matched. n stages of O(n^2) each.
+
+Restricted (forbidden) cells cost infinity, so they are never a zero,
+never the smallest uncovered value and never assigned.
+
+Rectangular matrices are solved as they are, no dummy rows or columns: the
+search always runs from the smaller side (the matrix is transposed when
+there are more rows than columns), with k = min(rows, cols) stages of
+O(rows * cols). Only that side is reduced - with cost-0 dummies the other
+side's minima would all be 0 - and the columns left unmatched keep v = 0,
+which is what makes the k pairs optimal.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+def _reduced(cost: np.ndarray, u: np.ndarray, v: np.ndarray) -> List[List]:
+    """The reduced matrix as lists, None for restricted cells."""
+    reduced = cost - u[:, None] - v[None, :]
+    if reduced.dtype.kind == 'f' and not np.isfinite(reduced).all():
+        return np.where(np.isfinite(reduced), reduced, None).tolist()
+    return reduced.tolist()
+
+
+def hungarian(cost_matrix, trace: Optional[List[Dict]] = None,
+              forbidden=None) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """
+    Solves a minimization assignment problem, square or rectangular.
+
+    Args:
+        cost_matrix: rows x cols costs (list of lists or array).
+        trace: Optional list. Gets one entry per cover-lines iteration:
+               {'matrix', 'rows_covered', 'cols_covered', 'lines',
+                'min_uncovered'}, 'matrix' being the reduced matrix the
+               lines are drawn on and 'min_uncovered' the adjustment made
+               next (None on the last entry, where lines ==
+               min(rows, cols)).
+        forbidden: Optional rows x cols booleans, True where a row may not
+                   take that column. Raises ValueError if every assignment
+                   uses one of those cells.
+
+    Returns:
+        tuple: (assignment, u, v) - assignment[i] is the column of row i
+               (-1 for the rows left over when rows > cols), and u / v are
+               optimal dual potentials (cost - u - v >= 0, 0 on the
+               assigned cells, 0 on the unassigned rows/columns).
+    """
+    cost = np.asarray(cost_matrix)
+    if cost.ndim != 2:
+        raise ValueError(f"The Hungarian method needs a 2D matrix, got {cost.shape}.")
+    if cost.shape[0] > cost.shape[1]:
+        # Search from the smaller side: solve the transpose, map it back
+        flipped = [] if trace is not None else None
+        col_assignment, v, u = hungarian(cost.T, trace=flipped,
+                                         forbidden=None if forbidden is None else np.asarray(forbidden).T)
+        assignment = [-1] * cost.shape[0]
+        for j, i in enumerate(col_assignment):
+            assignment[i] = j
+        if trace is not None:
+            trace.extend({
+                'matrix': [list(column) for column in zip(*step['matrix'])],
+                'rows_covered': step['cols_covered'],
+                'cols_covered': step['rows_covered'],
+                'lines': step['lines'],
+                'min_uncovered': step['min_uncovered']
+            } for step in flipped)
+        return assignment, u, v
+
+    if cost.dtype.kind not in 'iu':
+        cost = cost.astype(float)
+    if forbidden is not None and np.any(forbidden):
+        cost = np.where(forbidden, np.inf, cost.astype(float))
+    n, num_cols = cost.shape
+    # Integer costs stay exact; float ones get a little room for rounding
+    finite = cost[np.isfinite(cost)] if cost.dtype.kind == 'f' else cost
+    tolerance = 0 if cost.dtype.kind in 'iu' else 1e-9 * max(1.0, float(np.abs(finite).max(initial=0)))
+
+    # Row reduction, and column reduction when every column gets a row
+    u = cost.min(axis=1) if num_cols else np.zeros(n, dtype=cost.dtype)
+    if not np.isfinite(u).all():
+        raise ValueError(f"Row {int(np.argmax(~np.isfinite(u))) + 1} has every column restricted.")
+    if n == num_cols and n:
+        v = (cost - u[:, None]).min(axis=0)
+        if not np.isfinite(v).all():
+            raise ValueError(f"Column {int(np.argmax(~np.isfinite(v))) + 1} has every row restricted.")
+    else:
+        v = np.zeros(num_cols, dtype=cost.dtype)
+
+    row_match = np.full(n, -1)
+    col_match = np.full(num_cols, -1)
+    for i in range(n):
+        free_zeros = np.flatnonzero((cost[i] - u[i] - v <= tolerance) & (col_match < 0))
+        if free_zeros.size:
+            row_match[i], col_match[free_zeros[0]] = free_zeros[0], i
+
+    while (row_match < 0).any():
+        in_tree = row_match < 0 # Uncovered rows
+        reached = np.zeros(num_cols, dtype=bool) # Covered columns
+        parent = np.full(num_cols, -1) # Tree row each column was reached from
+        tree_rows = np.flatnonzero(in_tree)
+        slack_all = cost[tree_rows] - u[tree_rows, None] - v[None, :]
+        slack = slack_all.min(axis=0)
+        slack_row = tree_rows[slack_all.argmin(axis=0)]
+
+        while True:
+            tight = np.flatnonzero(~reached & (slack <= tolerance))
+            if not tight.size:
+                # Stuck: the lines are a minimum cover, adjust the matrix
+                delta = slack[~reached].min()
+                if not np.isfinite(delta):
+                    raise ValueError("No assignment avoids every restricted cell.")
+                if trace is not None:
+                    trace.append({
+                        'matrix': _reduced(cost, u, v),
+                        'rows_covered': np.flatnonzero(~in_tree).tolist(),
+                        'cols_covered': np.flatnonzero(reached).tolist(),
+                        'lines': int((~in_tree).sum() + reached.sum()),
+                        'min_uncovered': delta.item()
+                    })
+                u[in_tree] += delta
+                v[reached] -= delta
+                slack[~reached] -= delta
+                continue
+
+            j = int(tight[0])
+            reached[j] = True
+            parent[j] = slack_row[j]
+            if col_match[j] < 0:
+                # Free column: flip the path back to a free row
+                while j >= 0:
+                    i = parent[j]
+                    next_j = row_match[i]
+                    row_match[i], col_match[j] = j, i
+                    j = next_j
+                break
+
+            i = col_match[j]
+            in_tree[i] = True
+            row_slack = cost[i] - u[i] - v
+            better = row_slack < slack
+            slack[better] = row_slack[better]
+            slack_row[better] = i
+
+    if trace is not None:
+        # n lines: every row holds an assigned zero
+        trace.append({
+            'matrix': _reduced(cost, u, v),
+            'rows_covered': list(range(n)),
+            'cols_covered': [],
+            'lines': n,
+            'min_uncovered': None
+        })
+    return row_match.tolist(), u, v
@@ -6,10 +6,10 @@ from helper_funcs import AnimationHelpers
 from PSG_data_EOT import *
 
 # narration imports
-from manim_narration import NarrationScene
-from manim_narration.speech import KokoroService
+from narration_prefetch import PrefetchNarrationScene
+from speech_services import kokoro_voice
 
-class DesignScene(NarrationScene):
+class DesignScene(PrefetchNarrationScene):
     """
     A scene to animate the design and calculation steps for the EOT crane.
     Added narration using KokoroService (speech_service_id="en").
@@ -17,7 +17,7 @@ class DesignScene(NarrationScene):
     def construct(self):
             # setup TTS service
             self.set_speech_services(
-                en=KokoroService(voice="af_jessica", lang_code="en-us")
+                en=kokoro_voice("af_jessica")
             )
 
             script_dir = os.path.dirname(__file__)
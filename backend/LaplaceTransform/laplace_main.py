@@ -3,11 +3,13 @@ import sys
 import json
 import numpy as np
 import pandas as pd
-import subprocess
 import os
-import shutil
 import re
 
+# --- Shared Manim renderer (backend/manim_render.py) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manim_render import render_scene
+
 # --- FIX 1: Import the new, correct solver function ---
 try:
     from laplace_solver import solve_step_by_step
@@ -38,28 +40,6 @@ def to_native_types(obj):
         return [to_native_types(item) for item in obj]
     return obj
 
-# --- Manim Helper Function (Unchanged) ---
-def _run_manim_scene(script_name, scene_name, cwd_dir):
-    animation_script_path = os.path.join(cwd_dir, script_name)
-    manim_command = ["manim", "-ql", animation_script_path, scene_name, "--disable_caching"]
-    print(f"Running command: {' '.join(manim_command)}")
-    result = subprocess.run(manim_command, cwd=cwd_dir, capture_output=True, text=True, encoding='utf-8')
-    if result.returncode != 0:
-        print("--- MANIM FAILED ---", file=sys.stderr)
-        print("STDOUT:", result.stdout, file=sys.stdout)
-        print("STDERR:", result.stderr, file=sys.stderr)
-        raise Exception(f"Manim rendering for {script_name} failed. See stderr.")
-    print(f"Manim render complete for {scene_name}")
-    script_name_no_ext = os.path.splitext(script_name)[0]
-    rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p15", f"{scene_name}.mp4")
-    if not os.path.exists(rendered_file_path):
-        print(f"Warning: Could not find 480p file. Trying 720p30...", file=sys.stderr)
-        rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "720p30", f"{scene_name}.mp4")
-        if not os.path.exists(rendered_file_path):
-            print(f"Error: Could not find rendered file at {rendered_file_path}", file=sys.stderr)
-            raise Exception("Manim rendered, but output file not found.")
-    return rendered_file_path
-
 # --- Helper to parse LaTeX (Unchanged, but I'm renaming it) ---
 def parse_latex_input(latex_full: str) -> str:
     try:
@@ -124,6 +104,7 @@ def generate_video(input_data, output_video_path):
     print("Starting Manim video generation process for Laplace...")
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    narration_mode = input_data.get('videoMode', 'narrated') # 'narrated' or 'subtitles'
     
     # --- Step 1: Solve the problem to get data for Manim ---
     latex_input_full = input_data['latex']
@@ -159,11 +140,9 @@ def generate_video(input_data, output_video_path):
         raise
 
     # --- Step 3: Run the Manim Scene ---
-    video_path = _run_manim_scene("animation.py", "LaplaceTransformScene", script_dir)
-    
-    # --- Step 4: Move the final video ---
-    shutil.move(video_path, output_video_path)
-    print(f"Manim video moved to {output_video_path}")
+    render_scene("animation.py", "LaplaceTransformScene", script_dir, output_video_path,
+                 narration_mode=narration_mode)
+    print(f"Manim video saved to {output_video_path}")
 
 
 def generate_pdf_report(input_data, output_file):
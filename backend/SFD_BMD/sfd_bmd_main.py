@@ -2,12 +2,14 @@ import argparse
 import sys
 import json
 import numpy as np
-import subprocess  # Used to call Manim
 import os          # Used to get file paths
-import shutil      # Used to move the final video file
 import pandas as pd
 from typing import List, Dict, Any
 
+# --- Shared Manim renderer (backend/manim_render.py) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manim_render import render_scene
+
 # --- Import your actual solver function ---
 try:
     # We assume this file is in the same directory (SFD_BMD/)
@@ -44,41 +46,6 @@ def to_native_types(obj):
         return [to_native_types(item) for item in obj]
     return obj
 
-# --- Manim Helper Function (copied from your reference) ---
-def _run_manim_scene(script_name, scene_name, cwd_dir):
-    """
-    Runs a specific Manim scene and handles errors.
-    """
-    animation_script_path = os.path.join(cwd_dir, script_name)
-    
-    # Command: manim -ql <script_name> <scene_name>
-    manim_command = ["manim", "-ql", animation_script_path, scene_name, "--disable_caching"]
-    
-    print(f"Running command: {' '.join(manim_command)}")
-    
-    result = subprocess.run(manim_command, cwd=cwd_dir, capture_output=True, text=True, encoding='utf-8')
-
-    if result.returncode != 0:
-        print("--- MANIM FAILED ---", file=sys.stderr)
-        print("STDOUT:", result.stdout, file=sys.stdout)
-        print("STDERR:", result.stderr, file=sys.stderr)
-        raise Exception(f"Manim rendering for {script_name} failed. See stderr.")
-    
-    print(f"Manim render complete for {scene_name}")
-    
-    script_name_no_ext = os.path.splitext(script_name)[0]
-    
-    rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p15", f"{scene_name}.mp4")
-
-    if not os.path.exists(rendered_file_path):
-        print(f"Warning: Could not find 480p file. Trying 720p30...", file=sys.stderr)
-        rendered_file_path = os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "720p30", f"{scene_name}.mp4")
-        if not os.path.exists(rendered_file_path):
-            print(f"Error: Could not find rendered file at {rendered_file_path}", file=sys.stderr)
-            raise Exception("Manim rendered, but output file not found.")
-            
-    return rendered_file_path
-
 # --- Solver Wrapper ---
 def _call_solver(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -150,6 +117,7 @@ def generate_video(input_data, output_video_path):
     print("Starting Manim video generation process for SFD/BMD...")
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    narration_mode = input_data.get('videoMode', 'narrated') # 'narrated' or 'subtitles'
     
     # --- Step 1: Solve the problem to get data for Manim ---
     try:
@@ -181,11 +149,9 @@ def generate_video(input_data, output_video_path):
     # --- Step 3: Run the Manim Scene ---
     # We assume your animation file is 'sfd_bmd_animation.py'
     # and the scene class is 'SFDBMDScene'
-    video_path = _run_manim_scene("sfd_bmd_animation.py", "SFDBMDScene", script_dir)
-    
-    # --- Step 4: Move the final video ---
-    shutil.move(video_path, output_video_path)
-    print(f"Manim video moved to {output_video_path}")
+    render_scene("sfd_bmd_animation.py", "SFDBMDScene", script_dir, output_video_path,
+                 narration_mode=narration_mode)
+    print(f"Manim video saved to {output_video_path}")
 
 
 def generate_pdf_report(input_data, output_file):
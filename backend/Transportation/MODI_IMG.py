@@ -1,10 +1,10 @@
 from manim import *
 from MODI_IMG_helper import StaticHelpers  # Your new static helpers file
-from VAM_solver import solve_vam
-from MODI_solver import adjust_allocations
+from MODI_solver import cells_from_trace
+from img_to_pdf import StreamingPdfWriter, create_pdf_from_sections
+from vector_pdf import VectorPdfWriter
 import json
 import os
-from PIL import Image
 
 class MODI_Static_PDF(Scene):
     """
@@ -12,6 +12,9 @@ class MODI_Static_PDF(Scene):
     Run with: manim -sqh yourfile.py MODI_Static_PDF
     
     Images will be saved to: images/img1_table_basic.png, img2_..., etc.
+    If the input JSON has a 'pdfOutput' path, the frames go straight into
+    that PDF instead: as vector pages by default (vector_pdf), or as
+    rasterized pages when 'pdfBackend' is "raster" (img_to_pdf).
     """
     def construct(self):
         # --- 0. Setup ---
@@ -20,12 +23,26 @@ class MODI_Static_PDF(Scene):
         
         with open(json_path, "r") as f:
             data = json.load(f)
-            supply = data["supply"]
-            demand = data["demand"]
-            costs = data["costs"]
+            trace = data["trace"]
         
-        # Get initial VAM solution
-        initial_allocation, initial_costs, update_costs, update_demand, update_supply = solve_vam(supply, demand, costs)
+        pdf_output = data.get("pdfOutput")
+        if pdf_output and data.get("pdfBackend", "vector") == "raster":
+            with StreamingPdfWriter(pdf_output) as pdf_writer:
+                self.build_pages(trace, StaticHelpers(pdf_writer))
+        elif pdf_output:
+            with VectorPdfWriter(pdf_output) as pdf_writer:
+                self.build_pages(trace, StaticHelpers(pdf_writer))
+        else:
+            self.build_pages(trace, StaticHelpers())
+    
+    def build_pages(self, trace, helpers):
+        """Adds every step of the solution and saves one frame per step."""
+        # Initial VAM solution, already solved by transportation_main
+        vam = trace["vam"]
+        initial_allocation = vam["allocations"]
+        update_costs = vam["costs_to_solve"]
+        update_supply = vam["supply"]
+        update_demand = vam["demand"]
         
         # --- 1. Title Frame ---
         img_counter = 1
@@ -37,15 +54,11 @@ class MODI_Static_PDF(Scene):
         vam_title = Tex("Initial Solution using Vogel's Approximation Method")
         vam_title.scale(0.75).next_to(Header, DOWN, buff=0.1).set_color(LIGHT_PINK)
         self.add(vam_title)
-        self.wait()
-        self.camera.get_image().save(os.path.join(script_dir, "images", f"img{img_counter}_title.png"))
+        helpers.save_frame(self, f"img{img_counter}_title")
         img_counter += 1
         
         self.remove(vam_title)
         
-        # --- 2. Create Helper ---
-        helpers = StaticHelpers()
-        
         # --- 3. Create Initial Table ---
         (
             table,
@@ -76,12 +89,12 @@ class MODI_Static_PDF(Scene):
         img_counter += 1
         
         # --- 5. MODI ITERATION LOOP ---
-        for iteration in range(5):  # Max 5 iterations
+        for step in trace["modi"]["iterations"]:
             
-            print(f"\n--- ITERATION {iteration + 1} ---")
+            print(f"\n--- ITERATION {step['iteration']} ---")
             
             # --- 5a. Degeneracy Check ---
-            is_degenerate = helpers.animate_degeneracy_check(
+            helpers.animate_degeneracy_check(
                 self,
                 table,
                 alloc_mobject_map,
@@ -94,16 +107,14 @@ class MODI_Static_PDF(Scene):
             epsilon_mob = None
             
             # --- 5b. Handle Degeneracy ---
-            if is_degenerate:
+            if step["is_degenerate"]:
                 (
-                    initial_allocation,
                     alloc_mobject_map,
                     epsilon_mob
                 ) = helpers.handle_degeneracy(
                     self,
                     table,
-                    update_costs,
-                    initial_allocation,
+                    cells_from_trace(step["added_epsilon_cells"]),
                     alloc_mobject_map,
                     Header,
                     img_counter
@@ -112,16 +123,13 @@ class MODI_Static_PDF(Scene):
                 table_alloc.add(epsilon_mob)
             
             # --- 5c. Calculate u_i and v_j ---
-            (
-                u_vals,
-                v_vals,
-                uv_mobs
-            ) = helpers.animate_uv_calculation(
+            u_vals, v_vals = step["u"], step["v"]
+            uv_mobs = helpers.animate_uv_calculation(
                 self,
                 table,
                 update_costs,
-                initial_allocation,
-                alloc_mobject_map,
+                u_vals,
+                v_vals,
                 row_lines,
                 col_lines,
                 Header,
@@ -130,6 +138,7 @@ class MODI_Static_PDF(Scene):
             img_counter += 1
             
             # --- 5d. Calculate Opportunity Costs ---
+            pivot = tuple(step["pivot"]) if step["pivot"] is not None else None
             (
                 opportunity_costs,
                 cost_mobjects,
@@ -140,7 +149,8 @@ class MODI_Static_PDF(Scene):
                 self,
                 table,
                 update_costs,
-                initial_allocation,
+                step["opportunity_costs"],
+                pivot,
                 u_vals,
                 v_vals,
                 Header,
@@ -169,8 +179,7 @@ class MODI_Static_PDF(Scene):
                 final_text = Tex("Solution is OPTIMAL!", color=GREEN).scale(1.2)
                 final_text.to_edge(DOWN, buff=1)
                 self.add(final_text)
-                self.wait()
-                self.camera.get_image().save(os.path.join(script_dir, "images", f"img{img_counter}_final_optimal.png"))
+                helpers.save_frame(self, f"img{img_counter}_final_optimal")
                 
                 if epsilon_mob:
                     self.remove(epsilon_mob)
@@ -187,8 +196,7 @@ class MODI_Static_PDF(Scene):
                 ) = helpers.animate_loop_and_signs(
                     self,
                     table,
-                    initial_allocation,
-                    entering_cell_coords,
+                    cells_from_trace(step.get("loop")),
                     Header,
                     img_counter
                 )
@@ -198,17 +206,10 @@ class MODI_Static_PDF(Scene):
                     print("ERROR: No loop found!")
                     break
                 
-                # --- 5h. Get New Allocations (Logic) ---
-                (
-                    new_allocations_logic,
-                    theta,
-                    plus_cells,
-                    minus_cells
-                ) = adjust_allocations(initial_allocation, loop_path)
-                
-                print(f"Theta = {theta}")
-                print(f"Plus cells: {plus_cells}")
-                print(f"Minus cells: {minus_cells}")
+                # --- 5h. New Allocations (from the solver trace) ---
+                print(f"Theta = {step['theta']}")
+                print(f"Plus cells: {step['plus_cells']}")
+                print(f"Minus cells: {step['minus_cells']}")
                 
                 # --- 5i. Update Table Visuals ---
                 (
@@ -221,13 +222,13 @@ class MODI_Static_PDF(Scene):
                     update_costs,
                     update_supply,
                     update_demand,
-                    new_allocations_logic,
+                    step["new_allocations"],
+                    cells_from_trace(step["new_epsilon_cells"]),
                     img_counter
                 )
                 img_counter += 1
                 
                 # --- 5j. Update State ---
-                initial_allocation = new_allocations_logic
                 alloc_mobject_map = new_alloc_map_updated
                 table = new_table
                 table_alloc = new_table_alloc
@@ -238,41 +239,12 @@ class MODI_Static_PDF(Scene):
                     self.remove(epsilon_mob)
                 self.remove(uv_mobs)
         
-        print(f"\n✓ Generated {img_counter - 1} images in 'images/' folder")
-        print("Use the PDF generation script to combine them into a PDF.")
+        print(f"\n✓ Generated {img_counter - 1} frames")
 
 def create_pdf_from_images():
     img_dir = os.path.join(os.path.dirname(__file__), "images")
     output_pdf = "MODI_Method.pdf"
-    
-    # Get all PNG files sorted by number
-    import re
-    png_files = [f for f in os.listdir(img_dir) if f.endswith('.png')]
-    png_files.sort(key=lambda x: int(re.findall(r'\d+', x)[0]))
-    
-    print(f"Found {len(png_files)} images")
-    
-    if not png_files:
-        print("No images found!")
-        return
-    
-    # Open images
-    images = []
-    for png_file in png_files:
-        img_path = os.path.join(img_dir, png_file)
-        img = Image.open(img_path).convert('RGB')
-        images.append(img)
-        print(f"  Added: {png_file}")
-    
-    # Save as PDF
-    if images:
-        images[0].save(
-            output_pdf,
-            save_all=True,
-            append_images=images[1:],
-            resolution=100.0
-        )
-        print(f"\n✓ PDF created: {output_pdf}")
+    create_pdf_from_sections(img_dir, output_pdf)
 
 if __name__ == "__main__":
     create_pdf_from_images()
\ No newline at end of file
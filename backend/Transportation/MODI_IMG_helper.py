@@ -1,7 +1,6 @@
 from manim import *
-import copy
 import os
-from MODI_solver import find_loop, adjust_allocations
+from vector_pdf import VectorPdfWriter
 
 # --- Manim Scene Configuration ---
 config.background_color = WHITE
@@ -17,7 +16,32 @@ class StaticHelpers:
     """
     Static helper functions for PDF generation.
     No animations - just add objects and save frames.
+
+    If a 'pdf_writer' is given, every frame is appended to it as a PDF
+    page instead of being saved as a PNG in the images/ folder. A
+    vector_pdf.VectorPdfWriter draws the mobjects themselves; an
+    img_to_pdf.StreamingPdfWriter takes the rasterized frame.
     """
+
+    def __init__(self, pdf_writer=None):
+        self.pdf_writer = pdf_writer
+
+    def save_frame(self, scene, name):
+        """
+        Captures the current frame (re-rendered first, so objects added
+        without an animation are included) and hands it to the PDF
+        writer, or saves it as images/<name>.png.
+        """
+        if isinstance(self.pdf_writer, VectorPdfWriter):
+            # No rasterizing needed, the page is drawn from the mobjects
+            self.pdf_writer.add_scene_frame(scene)
+            return
+        scene.renderer.update_frame(scene)
+        image = scene.camera.get_image()
+        if self.pdf_writer is not None:
+            self.pdf_writer.add_frame(image)
+        else:
+            image.save(os.path.join(IMG_DIR, f"{name}.png"))
     
     def create_table_with_allocations(self, scene, costs, supply, demand, initial_alloc, main_header, img_num):
         """
@@ -85,7 +109,7 @@ class StaticHelpers:
         
         # CRITICAL: Wait to render the frame before saving
         scene.wait(0.01)
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_table_basic.png"))
+        self.save_frame(scene, f"img{img_num}_table_basic")
         
         return table, alloc_mobject_map, table_alloc
     
@@ -121,7 +145,7 @@ class StaticHelpers:
         scene.add(row_lines, col_lines, outer_h_line, outer_v_line)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_table_extended.png"))
+        self.save_frame(scene, f"img{img_num}_table_extended")
         
         return row_lines, col_lines
     
@@ -167,17 +191,18 @@ class StaticHelpers:
         scene.add(result_grp)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_degeneracy_check.png"))
+        self.save_frame(scene, f"img{img_num}_degeneracy_check")
         
         # Cleanup for next step
         scene.remove(step1_title, counter_text, formula_sub, result_grp)
         
         return is_degenerate
     
-    def handle_degeneracy(self, scene, table, costs, initial_alloc, alloc_mobject_map, main_header, img_num):
+    def handle_degeneracy(self, scene, table, epsilon_cells, alloc_mobject_map, main_header, img_num):
         """
         Handle degeneracy - STATIC VERSION
-        Shows only the final result with epsilon placed
+        Shows only the final result with epsilon placed on the
+        cell(s) chosen by the solver
         """
         step1a_title = Tex("Step 1a: Resolving Degeneracy").scale(0.65)
         step1a_title.next_to(main_header, DOWN, buff=0.1).set_color(RED)
@@ -192,49 +217,35 @@ class StaticHelpers:
         
         scene.add(step1a_title, problem_text, fix_text)
         
-        # Find min-cost cell
-        min_cost = float('inf')
-        min_cost_cell = (-1, -1)
-        num_sources = len(costs)
-        num_destinations = len(costs[0])
-        
-        for r in range(num_sources):
-            for c in range(num_destinations):
-                if (r, c) not in alloc_mobject_map:
-                    if costs[r][c] < min_cost:
-                        min_cost = costs[r][c]
-                        min_cost_cell = (r, c)
-        
-        r, c = min_cost_cell
-        
-        # Highlight cell
-        table.add_highlighted_cell((r+2, c+2), ORANGE, fill_opacity=0.45)
+        new_alloc_map = alloc_mobject_map.copy()
+        epsilon_mobjects = VGroup()
         
-        # Create epsilon mobject
-        cell = table.get_cell((r+2, c+2))
-        pos = cell.get_corner(UP + LEFT) + DOWN * 0.12 + RIGHT * 0.14
-        epsilon_mobject = MathTex(r"\epsilon", color=BLACK).scale(0.5)
-        epsilon_mobject.move_to(pos).set_z_index(15)
-        scene.add(epsilon_mobject)
+        for (r, c) in epsilon_cells:
+            # Highlight cell
+            table.add_highlighted_cell((r+2, c+2), ORANGE, fill_opacity=0.45)
+            
+            # Create epsilon mobject
+            cell = table.get_cell((r+2, c+2))
+            pos = cell.get_corner(UP + LEFT) + DOWN * 0.12 + RIGHT * 0.14
+            epsilon_mobject = MathTex(r"\epsilon", color=BLACK).scale(0.5)
+            epsilon_mobject.move_to(pos).set_z_index(15)
+            scene.add(epsilon_mobject)
+            
+            new_alloc_map[(r, c)] = epsilon_mobject
+            epsilon_mobjects.add(epsilon_mobject)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_degeneracy_resolved.png"))
-        
-        # Update state
-        new_alloc_logic = copy.deepcopy(initial_alloc)
-        new_alloc_logic[r][c] = 0.001
-        new_alloc_map = alloc_mobject_map.copy()
-        new_alloc_map[(r, c)] = epsilon_mobject
+        self.save_frame(scene, f"img{img_num}_degeneracy_resolved")
         
         # Cleanup
         scene.remove(step1a_title, problem_text, fix_text)
         
-        return new_alloc_logic, new_alloc_map, epsilon_mobject
+        return new_alloc_map, epsilon_mobjects
     
-    def animate_uv_calculation(self, scene, table, costs, initial_alloc, alloc_mobject_map, row_lines, col_lines, main_header, img_num):
+    def animate_uv_calculation(self, scene, table, costs, u_vals, v_vals, row_lines, col_lines, main_header, img_num):
         """
         U/V calculation - STATIC VERSION
-        Shows only the final u/v values
+        Shows only the final u/v values (taken from the solver trace)
         """
         step2_title = Tex("Step 2: Calculate $u_i$ and $v_j$").scale(0.65)
         step2_title.next_to(main_header, DOWN, buff=0.1).set_color(LOGO_BLUE)
@@ -247,28 +258,8 @@ class StaticHelpers:
         num_sources = len(costs)
         num_destinations = len(costs[0])
         
-        u_vals = [None] * num_sources
-        v_vals = [None] * num_destinations
         uv_mobjects = VGroup()
         
-        allocated_cells = list(alloc_mobject_map.keys())
-        
-        # Calculate u/v (logic only, no animation)
-        u_vals[0] = 0
-        loops_done = 0
-        while (any(v is None for v in u_vals) or any(v is None for v in v_vals)) and loops_done < 20:
-            made_progress = False
-            for (r, c) in allocated_cells:
-                if u_vals[r] is not None and v_vals[c] is None:
-                    v_vals[c] = costs[r][c] - u_vals[r]
-                    made_progress = True
-                elif v_vals[c] is not None and u_vals[r] is None:
-                    u_vals[r] = costs[r][c] - v_vals[c]
-                    made_progress = True
-            if not made_progress:
-                break
-            loops_done += 1
-        
         # Create all u mobjects
         for r in range(num_sources):
             if u_vals[r] is not None:
@@ -293,17 +284,17 @@ class StaticHelpers:
                 uv_mobjects.add(v_text)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_uv_calculated.png"))
+        self.save_frame(scene, f"img{img_num}_uv_calculated")
         
         # Cleanup
         scene.remove(step2_title, formula_text)
         
-        return u_vals, v_vals, uv_mobjects
+        return uv_mobjects
     
-    def calculate_opportunity_costs(self, scene, table, costs, initial_alloc, u_vals, v_vals, title_text, img_num):
+    def calculate_opportunity_costs(self, scene, table, costs, opportunity_costs, pivot_cell, u_vals, v_vals, title_text, img_num):
         """
         Opportunity costs - STATIC VERSION
-        Shows only the final list of opportunity costs
+        Shows only the final list of opportunity costs (from the solver trace)
         """
         num_sources = len(costs)
         num_destinations = len(costs[0])
@@ -316,22 +307,22 @@ class StaticHelpers:
         formula.to_edge(RIGHT, buff=0.5).shift(UP * 2)
         scene.add(formula)
         
-        # Calculate all opportunity costs (no animation)
-        opportunity_costs = [[None] * num_destinations for _ in range(num_sources)]
+        # List all opportunity costs (no animation)
         cost_mobjects = VGroup(Tex("Opportunity Costs:", color=LOGO_BLUE).scale(0.7))
         
         most_positive_cost = 0
-        entering_cell_coords = None
+        entering_cell_coords = pivot_cell
         entering_cell_mobject = None
+        if pivot_cell is not None:
+            most_positive_cost = opportunity_costs[pivot_cell[0]][pivot_cell[1]]
         
         for r in range(num_sources):
             for c in range(num_destinations):
-                if initial_alloc[r][c] == 0:
+                if opportunity_costs[r][c] is not None:
                     row_label = chr(65 + r)
                     col_label = str(c + 1)
                     
-                    cost_val = u_vals[r] + v_vals[c] - costs[r][c]
-                    opportunity_costs[r][c] = cost_val
+                    cost_val = opportunity_costs[r][c]
                     
                     # Create cost text
                     cost_text = MathTex(f"d_{{{row_label}{col_label}}} = {cost_val}").scale(0.65)
@@ -343,9 +334,7 @@ class StaticHelpers:
                     
                     cost_mobjects.add(cost_text)
                     
-                    if cost_val > most_positive_cost:
-                        most_positive_cost = cost_val
-                        entering_cell_coords = (r, c)
+                    if (r, c) == entering_cell_coords:
                         entering_cell_mobject = cost_text
         
         # Arrange all costs
@@ -353,7 +342,7 @@ class StaticHelpers:
         scene.add(cost_mobjects)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_opportunity_costs.png"))
+        self.save_frame(scene, f"img{img_num}_opportunity_costs")
         
         # Cleanup
         scene.remove(step3_title, formula)
@@ -390,7 +379,7 @@ class StaticHelpers:
             scene.add(result_text, final_text)
             
             # SAVE IMAGE
-            scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_optimal.png"))
+            self.save_frame(scene, f"img{img_num}_optimal")
             
             scene.remove(step4_title, rule_text, result_text, final_text, cost_mobjects)
             return True
@@ -421,12 +410,12 @@ class StaticHelpers:
             scene.add(arrow)
             
             # SAVE IMAGE
-            scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_not_optimal.png"))
+            self.save_frame(scene, f"img{img_num}_not_optimal")
             
             scene.remove(step4_title, rule_text, result_text, final_text, select_text, arrow, cost_mobjects)
             return False
     
-    def animate_loop_and_signs(self, scene, table, initial_alloc, entering_cell_coord, main_header, img_num):
+    def animate_loop_and_signs(self, scene, table, loop_path, main_header, img_num):
         """
         Loop and signs - STATIC VERSION
         Shows the complete loop with signs
@@ -435,13 +424,10 @@ class StaticHelpers:
         step5_title.next_to(main_header, DOWN, buff=0.1).set_color(LOGO_BLUE)
         scene.add(step5_title)
         
-        # Find loop
-        loop_path = find_loop(initial_alloc, entering_cell_coord)
-        
         if loop_path is None:
             error_text = Tex("ERROR: No loop found!", color=RED)
             scene.add(error_text)
-            scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_loop_error.png"))
+            self.save_frame(scene, f"img{img_num}_loop_error")
             return None, VGroup(step5_title, error_text)
         
         # Draw complete loop
@@ -475,14 +461,14 @@ class StaticHelpers:
         scene.add(sign_mobjects)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_loop_with_signs.png"))
+        self.save_frame(scene, f"img{img_num}_loop_with_signs")
         
         cleanup_mobjects = VGroup(step5_title, drawn_path, sign_mobjects)
         scene.remove(step5_title)
         
         return loop_path, cleanup_mobjects
     
-    def animate_table_update(self, scene, old_table_alloc_vgroup, costs, supply, demand, new_allocations, img_num):
+    def animate_table_update(self, scene, old_table_alloc_vgroup, costs, supply, demand, new_allocations, epsilon_cells, img_num):
         """
         Table update - STATIC VERSION
         Shows the final updated table
@@ -517,8 +503,8 @@ class StaticHelpers:
         # Add highlights
         for r in range(len(new_allocations)):
             for c in range(len(new_allocations[0])):
-                if new_allocations[r][c] > 0:
-                    color = ORANGE if new_allocations[r][c] == 0.001 else GREEN
+                if new_allocations[r][c] > 0 or (r, c) in epsilon_cells:
+                    color = ORANGE if (r, c) in epsilon_cells else GREEN
                     new_table.add_highlighted_cell((r+2, c+2), color, fill_opacity=0.45)
         
         # Create allocation mobjects
@@ -528,11 +514,11 @@ class StaticHelpers:
         for r in range(len(new_allocations)):
             for c in range(len(new_allocations[0])):
                 val = new_allocations[r][c]
-                if val > 0:
+                if val > 0 or (r, c) in epsilon_cells:
                     cell = new_table.get_cell((r+2, c+2))
                     pos = cell.get_corner(UP + LEFT) + DOWN * 0.12 + RIGHT * 0.14
                     
-                    if val == 0.001:
+                    if (r, c) in epsilon_cells:
                         tex_mob = MathTex(r"\epsilon", color=BLACK).scale(0.5)
                     else:
                         tex_mob = MathTex(str(int(val)), color=PURPLE_E).scale(0.5)
@@ -549,6 +535,6 @@ class StaticHelpers:
         scene.add(new_table_alloc_vgroup)
         
         # SAVE IMAGE
-        scene.camera.get_image().save(os.path.join(IMG_DIR, f"img{img_num}_table_updated.png"))
+        self.save_frame(scene, f"img{img_num}_table_updated")
         
         return new_table, new_alloc_map, new_table_alloc_vgroup
\ No newline at end of file
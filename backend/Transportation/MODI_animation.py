@@ -1,16 +1,15 @@
 from manim import *
-from manim_narration import NarrationScene
-from manim_narration.speech import KokoroService
+from narration_prefetch import PrefetchNarrationScene
+from speech_services import kokoro_voice
 from MODI_helper_funcs import AnimationHelpers
-from VAM_solver import solve_vam
-from MODI_solver import adjust_allocations # <-- Import the logic function
+from MODI_solver import cells_from_trace
 import json
 import os
 
-class MODI_Transportation(NarrationScene):
+class MODI_Transportation(PrefetchNarrationScene):
     def construct(self):
         self.set_speech_services(
-            en=KokoroService(voice="af_jessica", lang_code="en-us")
+            en=kokoro_voice("af_jessica")
         )
         # --- 0. Setup ---
         # Load data from JSON
@@ -18,13 +17,15 @@ class MODI_Transportation(NarrationScene):
         json_path = os.path.join(script_dir, "transportation_problem.json")
         with open(json_path, "r") as f:
             data = json.load(f)
-            supply = data["supply"]
-            demand = data["demand"]
-            costs = data["costs"]
+            trace = data["trace"]
             
         # --- 1. Get Initial VAM Solution ---
-        # This is the pure logic step
-        initial_allocation, initial_cost, update_costs, costs_to_solve, update_demand, update_supply = solve_vam(supply, demand, costs)
+        # Already solved by transportation_main; we only replay it here
+        vam = trace["vam"]
+        initial_allocation = vam["allocations"]
+        costs_to_solve = vam["costs_to_solve"]
+        update_supply = vam["supply"]
+        update_demand = vam["demand"]
 
         # --- 2. Animate Scene Titles ---
         Header = Tex("Transportation Problem\\\\Modified Distribution Method (MODI)", font_size=48)
@@ -40,11 +41,8 @@ class MODI_Transportation(NarrationScene):
         # --- 3. Create Helper and Initial Table (One-Time Setup) ---
         helpers = AnimationHelpers()
 
-        (
-            table, 
-            alloc_mobject_map, 
-            table_alloc # This VGroup holds the table + allocs
-        ) = helpers.create_table_with_allocations(
+        # The table holds the allocations and is updated in place
+        table = helpers.create_table_with_allocations(
             self,
             costs_to_solve, 
             update_supply, 
@@ -61,72 +59,60 @@ class MODI_Transportation(NarrationScene):
             col_lines
         ) = helpers.extend_table(
             self,
-            table,
-            table_alloc, 
-            costs_to_solve
+            table
         )
 
         # --- 5. START MODI ITERATION LOOP ---
-        # We use a 'for' loop as a safety break (max 5 iterations)
-        # A real solver might use 'while True'
+        # One pass per iteration recorded by the solver
         
-        for i in range(5):
-            # self.next_section(f"Iteration {i+1}")
+        for step in trace["modi"]["iterations"]:
+            # self.next_section(f"Iteration {step['iteration']}")
             
             # --- 5a. Degeneracy Check ---
-            is_degenerate = helpers.animate_degeneracy_check(
+            helpers.animate_degeneracy_check(
                 self,
                 table,
-                alloc_mobject_map,
                 costs_to_solve,
                 Header
             ) 
-            epsilon_mob = None # Clear epsilon tracker each loop
+            epsilon_cells = [] # Clear epsilon tracker each loop
             
             # --- 5b. Handle Degeneracy ---
-            if is_degenerate:
-                (
-                    initial_allocation, # Overwrite logic
-                    alloc_mobject_map,  # Overwrite map
-                    epsilon_mob         # Get the epsilon mobject
-                ) = helpers.handle_degeneracy(
+            if step["is_degenerate"]:
+                epsilon_cells = helpers.handle_degeneracy(
                     self,
                     table,
-                    costs_to_solve,
-                    initial_allocation,
-                    alloc_mobject_map,
+                    cells_from_trace(step["added_epsilon_cells"]),
                     Header
                 )
-                table_alloc.add(epsilon_mob) # Add epsilon to the main VGroup
 
             # --- 5c. Calculate u_i and v_j ---
-            (
-                u_vals, 
-                v_vals,
-                uv_mobs
-            ) = helpers.animate_uv_calculation(
+            u_vals, v_vals = step["u"], step["v"]
+            uv_steps = [(kind, index, tuple(cell)) for kind, index, cell in step["uv_steps"]]
+            helpers.animate_uv_calculation(
                 self,
                 table,
                 costs_to_solve,
-                initial_allocation,
-                alloc_mobject_map,
-                row_lines,
-                col_lines,
+                u_vals,
+                v_vals,
+                uv_steps,
                 Header
             )
 
             # --- 5d. Calculate Opportunity Costs ---
+            pivot = tuple(step["pivot"]) if step["pivot"] is not None else None
             (
                 opportunity_costs, 
                 cost_mobjects, 
                 most_positive_cost, 
                 entering_cell_coords, 
                 entering_cell_mobject
-            ) = helpers.calculate_opportunity_costs( # This is your function
+            ) = helpers.calculate_opportunity_costs(
                 self,
                 table,
                 costs_to_solve,
-                initial_allocation, # This is the logic matrix
+                step["opportunity_costs"],
+                pivot,
                 u_vals,
                 v_vals,
                 Header
@@ -146,61 +132,37 @@ class MODI_Transportation(NarrationScene):
             self.wait(1)
 
             # --- 5f. Decide Next Step ---
-            if is_optimal:
-                if epsilon_mob: # Clean up any leftover epsilon
-                    self.play(FadeOut(epsilon_mob))
+            if is_optimal or step.get("new_allocations") is None:
+                if epsilon_cells: # Clean up any leftover epsilon
+                    helpers.clear_epsilon(self, table, epsilon_cells)
                 self.wait(3)
                 break # <-- EXIT THE FOR LOOP
             
             else:
-                # --- 5g. Find and Animate Loop ---
+                # --- 5g. Animate Loop ---
                 (
                     loop_path,
                     loop_cleanup_mobjects # Mobjects to fade out
                 ) = helpers.animate_loop_and_signs(
                     self,
                     table,
-                    initial_allocation,  # The logic matrix (with epsilon)
-                    entering_cell_coords, # The (r, c) tuple
+                    cells_from_trace(step["loop"]), # Entering cell first
                     Header
                 )
 
-                # --- 5h. Get New Logic (No animation) ---
-                # We need the *results* of the adjustment
-                # to feed into the table_update function.
-                (
-                    new_allocations_logic, 
-                    theta, 
-                    plus_cells, 
-                    minus_cells
-                ) = adjust_allocations(initial_allocation, loop_path)
-
-                # --- 5i. Update Table Visuals ---
-                (
-                    new_table,
-                    new_alloc_map_updated,
-                    new_table_alloc
-                ) = helpers.animate_table_update(
+                # --- 5h. Update Table Visuals ---
+                # The adjusted allocations come straight from the trace;
+                # only the cells that changed are redrawn
+                table = helpers.animate_table_update(
                     self,
-                    table_alloc, # The old VGroup
-                    update_costs,
-                    update_supply,
-                    update_demand,
-                    new_allocations_logic # The new logic
+                    table,
+                    step["new_allocations"],
+                    cells_from_trace(step["new_epsilon_cells"])
                 )
-
-                # --- 5j. Update State for Next Iteration ---
-                initial_allocation = new_allocations_logic
-                alloc_mobject_map = new_alloc_map_updated
-                table = new_table
-                table_alloc = new_table_alloc
                 
-                # --- 5k. Cleanup ---
-                self.play(
-                    FadeOut(loop_cleanup_mobjects),
-                    FadeOut(epsilon_mob), # Fade out old epsilon if it exists
-                    FadeOut(uv_mobs)
-                )
+                # --- 5i. Cleanup ---
+                # Fade out the loop/signs and the u/v values
+                self.play(FadeOut(loop_cleanup_mobjects), *table.clear_notes())
                 
                 # --- LOOP CONTINUES ---
         
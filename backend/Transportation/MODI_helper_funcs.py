@@ -1,7 +1,8 @@
 from manim import *
 import copy
 import os
-from MODI_solver import find_loop, adjust_allocations # We will need these later
+from MODI_solver import adjust_allocations
+from matrix_table import MatrixTable, play_updates
 
 # --- Manim Scene Configuration ---
 config.background_color = WHITE
@@ -15,10 +16,16 @@ class AnimationHelpers:
     """
     A class to hold all the animation helper functions for the MODI method.
     """
+    def allocation_mark(self, val, is_epsilon=False):
+        """The (tex, color) shown in the corner of an allocated cell."""
+        if is_epsilon:
+            return r"\epsilon", BLACK
+        return str(int(val)), PURPLE_E
+
     def create_table_with_allocations(self, scene, costs, supply, demand, initial_alloc, main_header):
         """
-        Step 1: Creates the main table, highlights, u/v lines,
-        and persistent allocation number mobjects.
+        Step 1: Creates the main table, highlights and the allocation
+        numbers in the cell corners.
         
         Args:
             scene (Scene): The manim scene object (e.g., 'self').
@@ -29,18 +36,16 @@ class AnimationHelpers:
             main_header (Mobject): The main scene title, for positioning.
 
         Returns:
-            - table (Table): The Manim Table mobject.
-            - alloc_mobject_map (dict): A map of (r,c) -> MathTex mobject.
-                                        This is the "state" we will pass to
-                                        other functions to update the numbers.
-            - table_alloc(VGroup): A Vgroup of the table and allocation
+            - table (MatrixTable): The table. It keeps the allocations
+                                   (table.marks) and highlights itself, and
+                                   is updated in place by the other steps.
         """
         
         # --- 1. Create the Table Structure ---
         num_sources = len(costs)
         num_destinations = len(costs[0])
         
-        # Build the data list for the Manim table
+        # Build the data list for the table
         table_data = []
         for i in range(num_sources):
             row = costs[i] + [supply[i]]
@@ -48,85 +53,60 @@ class AnimationHelpers:
         # Add the demand row at the bottom
         table_data.append(demand + [sum(supply)])
         
-        # Create row and column labels
-        source_labels = [Tex(chr(65 + i)) for i in range(num_sources)] # A, B, C...
-        source_labels.append(Tex("Demand"))
-        dest_labels = [Tex(str(i+1)) for i in range(num_destinations)] # 1, 2, 3...
-        dest_labels.append(Tex("Supply"))
+        # Row and column labels
+        source_labels = [chr(65 + i) for i in range(num_sources)] + ["Demand"] # A, B, C...
+        dest_labels = [str(i+1) for i in range(num_destinations)] + ["Supply"] # 1, 2, 3...
         
-        # Create the table mobject
-        table = IntegerTable(
+        # Demand row / supply column stay on screen when only a window
+        # of a large matrix is shown
+        table = MatrixTable(
             table_data,
             row_labels=source_labels,
             col_labels=dest_labels,
+            pinned_rows=1,
+            pinned_cols=1,
+            text_color=BLACK,
+            marks=True,
+            notes=True,
             h_buff=1.2,
             v_buff=0.8,
             line_config={"stroke_width": 2}
         ).scale(0.5).to_edge(LEFT, buff=0.1)
         
-        # Set all table text to black
-        for item in table.get_entries():
-            item.set_color(BLACK)
-        
         # --- 2. Add Highlights for Allocated Cells ---
-        # We just call the table's internal method.
-        # Manim will track these highlights for us.
         for r in range(len(initial_alloc)):
             for c in range(len(initial_alloc[0])):
                 if initial_alloc[r][c] > 0:
-                    table.add_highlighted_cell((r+2, c+2), GREEN, fill_opacity=0.45)
+                    table.set_highlight(r, c, GREEN, animate=False)
         
         # Animate the table (and its highlights) fading in
         with scene.narration(speech_service_id="en", text = "This is the initial solution we got from vogels approximation method") as narration:
             scene.play(FadeIn(table), run_time=narration.duration)
         
-        # --- 3. Create Persistent Allocation Mobjects ---
-        # These are the purple numbers in the corners.
-        # We store them in a dictionary so we can find and
-        # update them easily in later functions.
-        
-        # (r, c) -> Mobject
-        alloc_mobject_map = {} 
-        # A VGroup just to animate them all at once
-        alloc_mobjects_vgroup = VGroup() 
-        
+        # --- 3. Show the Allocation Numbers ---
+        # These are the purple numbers in the corners. The table keeps
+        # them, so later steps only update the cells that change.
+        animations = []
         for r in range(len(initial_alloc)):
             for c in range(len(initial_alloc[0])):
                 val = initial_alloc[r][c]
                 if val > 0: # If there is an allocation
-                    # Get the cell to position relative to
-                    cell = table.get_cell((r+2, c+2))
-                    # Calculate position: top-left corner
-                    pos = cell.get_corner(UP + LEFT) + DOWN *0.12 + RIGHT * 0.14
-                    
-                    if val == 0.001:
-                        tex_mob = MathTex(r"\epsilon", color=BLACK).scale(0.5)
-                    else:
-                        tex_mob = MathTex(str(int(val)), color=PURPLE_E).scale(0.5)
-                    
-                    # Set the mobject's position directly
-                    tex_mob.move_to(pos).set_z_index(15)
-                    
-                    # Store the mobject in our map and vgroup
-                    alloc_mobject_map[(r, c)] = tex_mob
-                    alloc_mobjects_vgroup.add(tex_mob)
+                    animations += table.set_mark(r, c, *self.allocation_mark(val))
         
-        # Animate all allocation numbers writing at once
-        scene.play(Write(alloc_mobjects_vgroup))
-        table_alloc = VGroup(table, alloc_mobjects_vgroup)
+        # Animate all allocation numbers appearing at once
+        play_updates(scene, animations)
         scene.wait(1)
-        # Return the essential "state" objects for the next steps
-        return table, alloc_mobject_map, table_alloc
+        # Return the table, which holds the "state" for the next steps
+        return table
     
-    def animate_degeneracy_check(self, scene, table, alloc_mobject_map, costs, main_header):
+    def animate_degeneracy_check(self, scene, table, costs, main_header):
         """
         Step 2: Animates the degeneracy check (m + n - 1) by counting
-        the allocation mobjects.
+        the allocated cells.
 
         Args:
             scene (Scene): The manim scene object ('self').
-            table (Table): The Manim Table mobject.
-            alloc_mobject_map (dict): The map of (r,c) -> Mobject.
+            table (MatrixTable): The table, holding the allocations.
             costs (list): The 2D cost matrix (to get m and n).
             main_header (Mobject): The main scene title, for positioning.
 
@@ -144,8 +124,9 @@ class AnimationHelpers:
         num_sources = len(costs)
         num_destinations = len(costs[0])
         
-        # Get count directly from the map of mobjects we passed in
-        num_allocations = len(alloc_mobject_map) 
+        # Get count directly from the allocations the table shows
+        allocated_cells = sorted(table.marks)
+        num_allocations = len(allocated_cells)
         required_allocations = num_sources + num_destinations - 1
 
         # --- 3. Animate Counting ---
@@ -156,10 +137,11 @@ class AnimationHelpers:
         scene.play(Write(counter_text))
         scene.wait(0.5)
 
-        # Iterate through the (r, c) coordinates from the map's keys
-        for i, (r, c) in enumerate(alloc_mobject_map.keys()):
+        # Iterate through the allocated (r, c) cells
+        for i, (r, c) in enumerate(allocated_cells):
             
-            # --- MODIFIED ---
+            # Bring the cell on screen (large tables only show a window)
+            play_updates(scene, table.focus(rows=[r], cols=[c]), run_time=0.5)
             # Get the cell corresponding to the (r, c) coordinate
             cell_to_indicate = table.get_cell((r+2, c+2)) # +2 for headers
             
@@ -217,23 +199,19 @@ class AnimationHelpers:
         return is_degenerate
 
     
-    def handle_degeneracy(self, scene, table, costs, initial_alloc, alloc_mobject_map, main_header):
+    def handle_degeneracy(self, scene, table, epsilon_cells, main_header):
         """
-        Step 2a: Handles degeneracy by adding an epsilon allocation to the
-        lowest-cost unallocated cell.
+        Step 2a: Handles degeneracy by showing the epsilon allocation(s) the
+        solver placed on the lowest-cost unallocated cell(s).
 
         Args:
             scene (Scene): The manim scene object ('self').
-            table (Table): The Manim Table mobject.
-            costs (list): The 2D cost matrix.
-            initial_alloc (list): The 2D allocation logic matrix.
-            alloc_mobject_map (dict): The map of (r,c) -> Mobject.
+            table (MatrixTable): The table, holding the allocations.
+            epsilon_cells (list): (r, c) cells that received epsilon (from the solver trace).
             main_header (Mobject): The main scene title, for positioning.
 
         Returns:
-            - new_alloc_logic (list): The updated 2D allocation matrix with 0.001 added.
-            - new_alloc_map (dict): The updated map including the new epsilon mobject.
-            - epsilon_mobject (Tex):
+            - epsilon_cells (list): The cells that now show an epsilon.
         """
         
         # --- 1. Create Titles and Explanation ---
@@ -254,69 +232,45 @@ class AnimationHelpers:
             scene.play(Write(fix_text), run_time=narration.duration)
         scene.wait(1.5)
 
-        # --- 2. Find the min-cost unallocated cell ---
-        min_cost = float('inf')
-        min_cost_cell = (-1, -1) # (r, c)
-        
-        num_sources = len(costs)
-        num_destinations = len(costs[0])
-
-        for r in range(num_sources):
-            for c in range(num_destinations):
-                # Check if cell is UNALLOCATED (i.e., not in our map)
-                if (r, c) not in alloc_mobject_map:
-                    # Check if this cost is the new minimum
-                    if costs[r][c] < min_cost:
-                        min_cost = costs[r][c]
-                        min_cost_cell = (r, c)
-        
-        r, c = min_cost_cell
-        cell_to_animate = table.get_cell((r+2, c+2)) # +2 for headers
+        for (r, c) in epsilon_cells:
+            play_updates(scene, table.focus(rows=[r], cols=[c]), run_time=0.5)
+            cell_to_animate = table.get_cell((r+2, c+2)) # +2 for headers
 
-        # --- 3. Animate Finding and Allocating ---
-        scene.play(Flash(cell_to_animate, color=RED, scale_factor=1.2))
-        scene.wait(1)
-        
-        # Add a new ORANGE highlight for this cell
-        table.add_highlighted_cell((r+2, c+2), ORANGE, fill_opacity=0.45)
-
-        # --- 4. Create the new epsilon mobject ---
-        # Get position from user's specified function
-        cell = table.get_cell((r+2, c+2))
-        pos = cell.get_corner(UP + LEFT) + DOWN * 0.12 + RIGHT * 0.14
-        
-        epsilon_mobject = MathTex(r"\epsilon", color=BLACK).scale(0.5)
-        epsilon_mobject.move_to(pos).set_z_index(15)
-        
-        scene.play(Write(epsilon_mobject))
-        scene.wait(1.5)
-
-        # --- 5. Update State for Next Steps ---
-        # Create a new logic matrix with the 0.001 value
-        new_alloc_logic = copy.deepcopy(initial_alloc)
-        new_alloc_logic[r][c] = 0.001 # Symbolic epsilon for logic
-        
-        # Create a new map that includes the new mobject
-        new_alloc_map = alloc_mobject_map.copy()
-        new_alloc_map[(r, c)] = epsilon_mobject
+            # --- 2. Animate Finding and Allocating ---
+            scene.play(Flash(cell_to_animate, color=RED, scale_factor=1.2))
+            scene.wait(1)
+            
+            # --- 3. Add an ORANGE highlight and the epsilon ---
+            scene.play(
+                *table.set_highlight(r, c, ORANGE),
+                *table.set_mark(r, c, *self.allocation_mark(None, is_epsilon=True))
+            )
+            scene.wait(1.5)
 
-        # --- 6. Cleanup and Return ---
+        # --- 4. Cleanup and Return ---
         text_to_fade = VGroup(step1a_title, problem_text, fix_text)
         scene.play(FadeOut(text_to_fade))
         
+        return list(epsilon_cells)
 
-        # Return the updated state
-        return new_alloc_logic, new_alloc_map, epsilon_mobject
+    def clear_epsilon(self, scene, table, epsilon_cells):
+        """Takes the epsilon allocation(s) added by handle_degeneracy back off the table."""
+        animations = []
+        for (r, c) in epsilon_cells:
+            animations += table.set_highlight(r, c, None)
+            animations += table.set_mark(r, c, None)
+        play_updates(scene, animations)
 
-    def extend_table(self, scene, table, table_alloc, costs):
+    def extend_table(self, scene, table):
 
         # --- Add u/v Extension Lines ---
         # This title is temporary and will be faded out
         # Shift table down slightly to make room
-        scene.play(table_alloc.animate.shift(DOWN*0.25))
+        scene.play(table.animate.shift(DOWN*0.25))
         
-        num_data_rows = len(costs)
-        num_data_cols = len(costs[0])
+        # Only the rows/columns of the table's window have lines
+        num_data_rows = len(table.visible_rows)
+        num_data_cols = len(table.visible_cols)
         
         # Create the horizontal lines for u_i
         row_lines = VGroup(*[
@@ -343,23 +297,22 @@ class AnimationHelpers:
 
         return row_lines, col_lines
     
-    def animate_uv_calculation(self, scene, table, costs, initial_alloc, alloc_mobject_map, row_lines, col_lines, main_header):
+    def animate_uv_calculation(self, scene, table, costs, u_vals, v_vals, uv_steps, main_header):
         """
         Step 3: Animates the calculation of u_i and v_j values.
+        The values and the order they were found in come from the solver trace.
 
         Args:
             scene (Scene): The manim scene object ('self').
-            table (Table): The Manim Table mobject.
+            table (MatrixTable): The table; u_i / v_j are shown as its row/column notes.
             costs (list): The 2D cost matrix.
-            initial_alloc (list): The 2D allocation logic matrix (with epsilon).
-            alloc_mobject_map (dict): The map of (r,c) -> Mobject (for finding allocs).
-            row_lines (VGroup): Mobjects for u_i placement.
-            col_lines (VGroup): Mobjects for v_j placement.
+            u_vals (list): The u_i values from the solver.
+            v_vals (list): The v_j values from the solver.
+            uv_steps (list): ('u' or 'v', index, (r, c)) in the order they were found.
             main_header (Mobject): The main scene title, for positioning.
 
         Returns:
-            - u_vals (list): The calculated u_i values.
-            - v_vals (list): The calculated v_j values.
+            - None. Clear the values again with table.clear_notes().
         """
         
         # --- 1. Title and Setup ---
@@ -367,9 +320,6 @@ class AnimationHelpers:
         step2_title.next_to(main_header, DOWN, buff=0.1).set_color(LOGO_BLUE)
         with scene.narration(speech_service_id="en", text = "Step two, calculate u and v") as narration:
             scene.play(Write(step2_title))
-        
-        num_sources = len(costs)
-        num_destinations = len(costs[0])
 
         # --- 2. Explain the Formula ---
         formula_text = Tex(r"Use $C_{ij} = u_i + v_j$ for all allocated cells.", color=PURPLE).scale(0.6)
@@ -382,128 +332,82 @@ class AnimationHelpers:
         with scene.narration(speech_service_id="en", text = "Start by setting first u as zero") as narration:
             scene.play(Write(start_rule), run_time=narration.duration)
 
-        # --- 3. Initialize Calculation Variables ---
-        u_vals = [None] * num_sources
-        v_vals = [None] * num_destinations
-        
-        # This VGroup will hold the u/v mobjects we create
-        uv_mobjects = VGroup() 
-        
-        # Get the list of (r, c) tuples of allocated cells
-        allocated_cells = list(alloc_mobject_map.keys())
-
-        # --- 4. Start Calculation: Set u_A = 0 ---
-        u_vals[0] = 0
+        # --- 3. Start Calculation: Set u_A = 0 ---
+        # The table keeps u/v next to their row/column, also when it scrolls
         u_text = MathTex("u_A = 0").scale(0.6)
-        # Position it next to the first row line
-        u_text.move_to(row_lines[0].get_center() + LEFT * 0.08 + DOWN * 0.25)
-        
-        scene.play(Write(u_text))
-        uv_mobjects.add(u_text)
+        play_updates(scene, table.focus(rows=[0]), run_time=0.5)
+        scene.play(*table.set_row_note(0, u_text))
         scene.wait(1)
         
         # This mobject will show the live calculation on the right
         live_calc_text = VGroup().to_edge(RIGHT, buff=0.45) # Placeholder
 
-        # --- 5. Iterative Calculation Loop ---
-        loops_done = 0
-        while any(v is None for v in u_vals) or any(v is None for v in v_vals):
-            made_progress = False
+        # --- 4. Replay the solver's steps ---
+        for kind, index, (r, c) in uv_steps:
+            row_label = chr(65 + r) # 'A', 'B', etc.
+            col_label = str(c + 1)  # '1', '2', etc.
+
+            # Animate this finding
+            play_updates(scene, table.focus(rows=[r], cols=[c]), run_time=0.5)
+            cell_to_flash = table.get_cell((r+2, c+2))
+            scene.play(Flash(cell_to_flash, color=YELLOW, time_width=0.5))
             
-            for (r, c) in allocated_cells:
-                row_label = chr(65 + r) # 'A', 'B', etc.
-                col_label = str(c + 1)  # '1', '2', etc.
+            # Show formula
+            f1 = MathTex(f"C_{{{row_label}{col_label}}} = u_{row_label} + v_{col_label}").scale(0.7)
+            f1.to_edge(RIGHT, buff=0.45)
+            scene.play(ReplacementTransform(live_calc_text, f1))
+
+            if kind == 'v':
+                # Substitute known values
+                f2 = MathTex(f"{costs[r][c]} = {u_vals[r]} + v_{col_label}").scale(0.7)
+                f2.move_to(f1)
+                scene.play(ReplacementTransform(f1, f2))
                 
-                # Case 1: u_i is known, v_j is unknown
-                if u_vals[r] is not None and v_vals[c] is None:
-                    v_vals[c] = costs[r][c] - u_vals[r]
-                    made_progress = True
-                    
-                    # Animate this finding
-                    cell_to_flash = table.get_cell((r+2, c+2))
-                    scene.play(Flash(cell_to_flash, color=YELLOW, time_width=0.5))
-                    
-                    # Show formula
-                    f1 = MathTex(f"C_{{{row_label}{col_label}}} = u_{row_label} + v_{col_label}").scale(0.7)
-                    f1.to_edge(RIGHT, buff=0.45)
-                    scene.play(ReplacementTransform(live_calc_text, f1))
-                    
-                    # Substitute known values
-                    f2 = MathTex(f"{costs[r][c]} = {u_vals[r]} + v_{col_label}").scale(0.7)
-                    f2.move_to(f1)
-                    scene.play(ReplacementTransform(f1, f2))
-                    
-                    # Show result
-                    f3 = MathTex(f"v_{col_label} = {costs[r][c]} - {u_vals[r]} = {v_vals[c]}").scale(0.7)
-                    f3.move_to(f1)
-                    scene.play(ReplacementTransform(f2, f3))
-                    
-                    # Create the final text mobject
-                    v_text = VGroup(MathTex(f"v_{col_label}"), MathTex("="), MathTex(f"{v_vals[c]}")).arrange(DOWN).scale(0.6)
-                    v_text[1].rotate(PI/2)
-                    v_text.move_to(col_lines[c].get_center() + RIGHT * 0.27 + UP * 0.08)
-                    
-                    # Move result to its place
-                    scene.play(ReplacementTransform(f3, v_text))
-                    live_calc_text = VGroup() # Reset placeholder
-                    uv_mobjects.add(v_text)
-                    
-                # Case 2: v_j is known, u_i is unknown
-                elif v_vals[c] is not None and u_vals[r] is None:
-                    u_vals[r] = costs[r][c] - v_vals[c]
-                    made_progress = True
-                    
-                    # Animate this finding
-                    cell_to_flash = table.get_cell((r+2, c+2))
-                    scene.play(Flash(cell_to_flash, color=YELLOW, time_width=0.5))
-                    
-                    # Show formula
-                    f1 = MathTex(f"C_{{{row_label}{col_label}}} = u_{row_label} + v_{col_label}").scale(0.7)
-                    f1.to_edge(RIGHT, buff=0.45)
-                    scene.play(ReplacementTransform(live_calc_text, f1))
-                    
-                    # Substitute known values
-                    f2 = MathTex(f"{costs[r][c]} = u_{row_label} + {v_vals[c]}").scale(0.7)
-                    f2.move_to(f1)
-                    scene.play(ReplacementTransform(f1, f2))
-                    
-                    # Show result
-                    f3 = MathTex(f"u_{row_label} = {costs[r][c]} - {v_vals[c]} = {u_vals[r]}").scale(0.7)
-                    f3.move_to(f1)
-                    scene.play(ReplacementTransform(f2, f3))
-                    
-                    # Create the final text mobject
-                    u_text = MathTex(f"u_{row_label} = {u_vals[r]}").scale(0.6)
-                    u_text.move_to(row_lines[r].get_center() + DOWN * 0.25)
-                    
-                    # Move result to its place
-                    scene.play(ReplacementTransform(f3, u_text))
-                    live_calc_text = VGroup() # Reset placeholder
-                    uv_mobjects.add(u_text)
+                # Show result
+                f3 = MathTex(f"v_{col_label} = {costs[r][c]} - {u_vals[r]} = {v_vals[c]}").scale(0.7)
+                f3.move_to(f1)
+                scene.play(ReplacementTransform(f2, f3))
+                
+                # Create the final text mobject
+                result_text = VGroup(MathTex(f"v_{col_label}"), MathTex("="), MathTex(f"{v_vals[c]}")).arrange(DOWN).scale(0.6)
+                result_text[1].rotate(PI/2)
+                note_animations = table.set_col_note(c, result_text)
+            else:
+                # Substitute known values
+                f2 = MathTex(f"{costs[r][c]} = u_{row_label} + {v_vals[c]}").scale(0.7)
+                f2.move_to(f1)
+                scene.play(ReplacementTransform(f1, f2))
+                
+                # Show result
+                f3 = MathTex(f"u_{row_label} = {costs[r][c]} - {v_vals[c]} = {u_vals[r]}").scale(0.7)
+                f3.move_to(f1)
+                scene.play(ReplacementTransform(f2, f3))
+                
+                # Create the final text mobject
+                result_text = MathTex(f"u_{row_label} = {u_vals[r]}").scale(0.6)
+                note_animations = table.set_row_note(r, result_text)
 
-            loops_done += 1
-            if not made_progress or loops_done > (num_sources + num_destinations):
-                # Safeguard to prevent infinite loop
-                break
+            # Move result to its place
+            scene.play(FadeOut(f3), *note_animations)
+            live_calc_text = VGroup() # Reset placeholder
 
         # Cleanup the explanation text
         scene.play(FadeOut(formula_text), FadeOut(start_rule))
         
-        # --- 6. Cleanup and Return ---
+        # --- 5. Cleanup and Return ---
         scene.wait(2)
         scene.play(
             FadeOut(step2_title),
             FadeOut(live_calc_text) # Fade out any remaining calculation
         )
-        
-        return u_vals, v_vals, uv_mobjects
     
-    def calculate_opportunity_costs(self, scene, table, costs, initial_alloc, u_vals, v_vals, title_text):
+    def calculate_opportunity_costs(self, scene, table, costs, opportunity_costs, pivot_cell, u_vals, v_vals, title_text):
         """
-        Calculates and animates the opportunity costs (d_ij) for all
-        unallocated cells using the formula d_ij = u_i + v_j - C_ij.
+        Animates the opportunity costs (d_ij) for all unallocated cells
+        using the formula d_ij = u_i + v_j - C_ij.
         Displays the costs in a list on the right.
-        Returns the cell with the MOST POSITIVE cost (entering cell).
+        The values and the entering cell (MOST POSITIVE cost) come from
+        the solver trace; allocated cells are None in 'opportunity_costs'.
         """
         
         num_sources = len(costs)
@@ -531,14 +435,15 @@ class AnimationHelpers:
         scene.wait(2)
 
         # Tracking variables
-        opportunity_costs = [[None] * num_destinations for _ in range(num_sources)]
         cost_mobjects = VGroup(Tex("Opportunity Costs for unallocated cells.")).scale(0.7).to_edge(RIGHT, buff=0.45)
         scene.play(Write(cost_mobjects[0]))
         
-        # We look for the MOST POSITIVE cost, as this breaks optimality (d_ij <= 0)
-        most_positive_cost = 0 # We are looking for a value > 0
-        entering_cell_coords = None     # Will store (r, c)
+        # The MOST POSITIVE cost breaks optimality (d_ij <= 0)
+        most_positive_cost = 0
+        entering_cell_coords = pivot_cell # (r, c) or None if optimal
         entering_cell_mobject = None # Will store the MathTex object
+        if pivot_cell is not None:
+            most_positive_cost = opportunity_costs[pivot_cell[0]][pivot_cell[1]]
         
         calc_animation = VGroup().to_edge(RIGHT, buff=0.5) 
 
@@ -546,9 +451,10 @@ class AnimationHelpers:
         for r in range(num_sources):
             for c in range(num_destinations):
                 
-                if initial_alloc[r][c] == 0:
+                if opportunity_costs[r][c] is not None:
                     
                     # --- A. Animate the calculation ---
+                    play_updates(scene, table.focus(rows=[r], cols=[c]), run_time=0.5)
                     cell_to_indicate = table.get_cell((r+2, c+2))
                     row_label = chr(65 + r)
                     col_label = str(c + 1)
@@ -561,9 +467,8 @@ class AnimationHelpers:
                     f2 = MathTex(f"d_{{{row_label}{col_label}}} = ({u_vals[r]}) + ({v_vals[c]}) - ({costs[r][c]})").to_edge(RIGHT, buff=0.5).shift(DOWN*1.3).scale(0.65)
                     scene.play(ReplacementTransform(f1, f2))
 
-                    # --- B. Calculate the value ---
-                    cost_val = u_vals[r] + v_vals[c] - costs[r][c]
-                    opportunity_costs[r][c] = cost_val
+                    # --- B. Show the value ---
+                    cost_val = opportunity_costs[r][c]
 
                     f3 = MathTex(f"d_{{{row_label}{col_label}}} = {cost_val}").to_edge(RIGHT, buff=0.5).shift(DOWN*1.3).scale(0.65)
                     scene.play(ReplacementTransform(f2, f3))
@@ -586,10 +491,8 @@ class AnimationHelpers:
                     )
                     calc_animation = VGroup()
 
-                    # --- D. Check if this is the new "most positive" ---
-                    if cost_val > most_positive_cost:
-                        most_positive_cost = cost_val
-                        entering_cell_coords = (r, c)
+                    # --- D. Keep the entering cell's mobject ---
+                    if (r, c) == entering_cell_coords:
                         entering_cell_mobject = final_cost_text # Store the mobject
                         
         # --- 3. Clean up and return ---
@@ -685,6 +588,7 @@ class AnimationHelpers:
             
             # Get the (r,c) coordinates
             r, c = entering_cell_coords
+            play_updates(scene, table.focus(rows=[r], cols=[c]), run_time=0.5)
             # Get the table cell mobject
             cell_to_highlight = table.get_cell((r+2, c+2))
             
@@ -715,16 +619,15 @@ class AnimationHelpers:
             )
             return False # Return False (is_optimal)
         
-    def animate_loop_and_signs(self, scene, table, initial_alloc, entering_cell_coord, main_header):
+    def animate_loop_and_signs(self, scene, table, loop_path, main_header):
         """
-        Step 6: Animates finding the closed loop and assigning +/- signs.
-        Uses the imported 'find_loop' logic.
+        Step 6: Animates the closed loop and assigning +/- signs.
+        The loop itself comes from the solver trace.
         
         Args:
             scene (Scene): The manim scene object ('self').
             table (Table): The Manim Table mobject.
-            initial_alloc (list): The 2D allocation logic matrix (with epsilon).
-            entering_cell_coord (tuple): (r, c) of the entering cell.
+            loop_path (list): The (r, c) loop from the solver, entering cell first.
             main_header (Mobject): The main scene title, for positioning.
 
         Returns:
@@ -752,10 +655,7 @@ class AnimationHelpers:
         scene.play(rules_group.animate.to_edge(RIGHT, buff=0.25))
         scene.wait(2) # Give time to read rules
 
-        # --- 2. Find Loop (Using Imported Logic) ---
-        # This is the logic call. It happens instantly.
-        loop_path = find_loop(initial_alloc, entering_cell_coord)
-
+        # --- 2. Check the Loop ---
         if loop_path is None:
             print("--- FATAL ERROR: No loop was found! ---")
             error_text = Tex("ERROR: No loop found!").set_color(RED)
@@ -763,17 +663,25 @@ class AnimationHelpers:
             return None, VGroup(step5_title, rules_group, error_text)
 
         # --- 3. Animate Drawing the Loop ---
+        # Bring the loop's rows and columns on screen. On a large table a
+        # long loop may not fit the window; only its visible part is drawn.
+        play_updates(scene, table.focus(rows=[r for r, _ in loop_path], cols=[c for _, c in loop_path]))
+        visible = [table.is_visible(r, c) for (r, c) in loop_path]
+
         # Get the center-points of all cells in the loop
         points = []
-        for (r, c) in loop_path:
-            cell = table.get_cell((r+2, c+2)) # +2 for headers
-            points.append(cell.get_center())
+        for (r, c), is_visible in zip(loop_path, visible):
+            # +2 for headers
+            points.append(table.get_cell((r+2, c+2)).get_center() if is_visible else None)
         # Add the first point to the end to close the loop
         points.append(points[0])
+        visible.append(visible[0])
 
         # Animate drawing the lines one by one
         drawn_path = VGroup()
         for i in range(len(loop_path)):
+            if not (visible[i] and visible[i+1]):
+                continue
             line = Line(
                 points[i], 
                 points[i+1], 
@@ -797,6 +705,8 @@ class AnimationHelpers:
         sign_mobjects = VGroup()
         for i in range(len(loop_path)):
             (r, c) = loop_path[i]
+            if not visible[i]:
+                continue
             cell_to_sign = table.get_cell((r+2, c+2))
             pos = cell_to_sign.get_corner(UP + LEFT) + DR * 0.1 + RIGHT * 0.15
             
@@ -870,7 +780,7 @@ class AnimationHelpers:
         theta_text_1 = Tex(r"Find min '$-$' allocation ($\theta$):", color=RED).scale(0.6)
         
         # Format theta value (check for epsilon)
-        if theta == 0.001: 
+        if theta == 0: # Only an epsilon cell can limit theta to 0
             theta_str = r"\epsilon"
         else: 
             theta_str = str(int(theta))
@@ -948,99 +858,37 @@ class AnimationHelpers:
         # --- 7. Return New State ---
         return new_allocations, new_alloc_map
     
-    def animate_table_update(self, scene, old_table_alloc_vgroup,
-                             costs, supply, demand, new_allocations):
+    def animate_table_update(self, scene, table, new_allocations, epsilon_cells=()):
         """
         Step 8: "Refreshes" the table.
-        Creates a new table with updated highlights and allocations
-        off-screen, then transforms the old table into the new one.
+        Updates the highlights and allocation numbers in place; only the
+        cells whose allocation changed are animated.
 
         Args:
             scene (Scene): The manim scene object ('self').
-            old_table_alloc_vgroup (VGroup): The VGroup holding the old table + allocs.
-            costs (list): The 2D cost matrix.
-            supply (list): The supply values.
-            demand (list): The demand values.
+            table (MatrixTable): The table, holding the old allocations.
             new_allocations (list): The new 2D allocation logic matrix.
+            epsilon_cells (list): (r, c) cells holding an epsilon allocation.
 
         Returns:
-            - new_table (Table): The new Manim Table mobject.
-            - new_alloc_map (dict): The new map of (r,c) -> Mobject.
-            - new_table_alloc_vgroup (VGroup): The new VGroup holding the table + allocs.
+            - table (MatrixTable): The same table, now showing the new allocations.
         """
 
-        # --- 1. Silently Create New Table ---
-        # We re-run the logic from 'create_table_with_allocations'
-        # but without any 'scene.play()' calls.
-        
-        num_sources = len(costs)
-        num_destinations = len(costs[0])
-        
-        table_data = []
-        for i in range(num_sources):
-            row = costs[i] + [supply[i]]
-            table_data.append(row)
-        table_data.append(demand + [sum(supply)])
-        
-        source_labels = [Tex(chr(65 + i)) for i in range(num_sources)]
-        source_labels.append(Tex("Demand"))
-        dest_labels = [Tex(str(i+1)) for i in range(num_destinations)]
-        dest_labels.append(Tex("Supply"))
-        
-        # Create the new table mobject
-        new_table = IntegerTable(
-            table_data,
-            row_labels=source_labels,
-            col_labels=dest_labels,
-            h_buff=1.2,
-            v_buff=0.8,
-            line_config={"stroke_width": 2}
-        ).scale(0.5)
-        
-        for item in new_table.get_entries():
-            item.set_color(BLACK)
-        
-        # Add new highlights based on the new allocation logic
-        for r in range(len(new_allocations)):
-            for c in range(len(new_allocations[0])):
-                if new_allocations[r][c] > 0:
-                    color = ORANGE if new_allocations[r][c] == 0.001 else GREEN
-                    new_table.add_highlighted_cell((r+2, c+2), color, fill_opacity=0.45)
-        
-        # --- 2. Silently Create New Allocation Mobjects ---
-        new_alloc_map = {} 
-        new_alloc_vgroup = VGroup() 
-        
+        epsilon_cells = epsilon_cells or ()
+        animations = []
         for r in range(len(new_allocations)):
             for c in range(len(new_allocations[0])):
                 val = new_allocations[r][c]
-                if val > 0:
-                    cell = new_table.get_cell((r+2, c+2))
-                    pos = cell.get_corner(UP + LEFT) + DOWN * 0.12 + RIGHT * 0.14
-                    
-                    if val == 0.001:
-                        tex_mob = MathTex(r"\epsilon", color=BLACK).scale(0.5)
-                    else:
-                        tex_mob = MathTex(str(int(val)), color=PURPLE_E).scale(0.5)
-                    
-                    tex_mob.move_to(pos).set_z_index(15)
-                    new_alloc_map[(r, c)] = tex_mob
-                    new_alloc_vgroup.add(tex_mob)
-        
-        # --- 3. Group and Position the New Table ---
-        # Create the new VGroup
-        new_table_alloc_vgroup = VGroup(new_table, new_alloc_vgroup)
-        
-        # Move the new, invisible group to the *exact* position
-        # of the old, visible group for a smooth transform.
-        new_table_alloc_vgroup.move_to(old_table_alloc_vgroup)
-        # Also move the u/v lines to match (if they exist)
-        
-        # --- 4. Animate the Transform ---
-        scene.play(
-            ReplacementTransform(old_table_alloc_vgroup, new_table_alloc_vgroup)
-        )
+                is_epsilon = (r, c) in epsilon_cells
+                if val > 0 or is_epsilon:
+                    animations += table.set_highlight(r, c, ORANGE if is_epsilon else GREEN)
+                    animations += table.set_mark(r, c, *self.allocation_mark(val, is_epsilon))
+                else:
+                    animations += table.set_highlight(r, c, None)
+                    animations += table.set_mark(r, c, None)
+        
+        # --- Animate the changed cells ---
+        play_updates(scene, animations)
         scene.wait(1)
 
-        # --- 5. Return the New State ---
-        return new_table, new_alloc_map, new_table_alloc_vgroup
\ No newline at end of file
+        return table
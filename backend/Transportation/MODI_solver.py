@@ -2,8 +2,29 @@ from VAM_solver import solve_vam
 import argparse
 import sys
 import json
+import time
 import numpy as np
 
+from pivot_rules import make_pivot_rule
+
+# Degeneracy is resolved with a symbolic epsilon: an epsilon cell is part of
+# the basis (the set of allocated cells MODI works with) but its allocation
+# stays exactly 0, so no small float ends up in the allocations or the cost.
+# After this many zero-theta pivots in a row, Bland's rule (first improving
+# cell, first leaving cell) is used until a pivot moves something again,
+# which rules out cycling.
+STALL_LIMIT = 10
+
+def _is_nonbasic(r, c, basis, allocations):
+    """
+    True if (r, c) is outside the basis. With a basis set, epsilon cells
+    are basic even though their allocation is 0; without one, every cell
+    with an allocation > 0 is basic.
+    """
+    if basis is not None:
+        return (r, c) not in basis
+    return allocations[r][c] == 0
+
 def check_degeneracy(initial_allocations, costs):
     """Check if Solution is degenerate or not m+n-1 = no. of allocation
     Returns:
@@ -18,7 +39,7 @@ def check_degeneracy(initial_allocations, costs):
     for r in range(len(initial_allocations)):
         for c in range(len(initial_allocations[0])):
             # A cell is "allocated" if its value is > 0
-            # This will include our small EPSILON value later
+            # (epsilon cells are tracked in the basis, see solve_MODI)
             if initial_allocations[r][c] > 0:
                 allocated_cells.append((r,c))
 
@@ -33,7 +54,7 @@ def check_degeneracy(initial_allocations, costs):
         return True, None # Solution is non-degenerate
 
 
-def find_min_cost_unallocated(costs, allocations, diff):
+def find_min_cost_unallocated(costs, allocations, diff, basis=None):
     """
     Finds a specified number of unallocated cells with the minimum costs.
 
@@ -45,6 +66,12 @@ def find_min_cost_unallocated(costs, allocations, diff):
         allocations (list[list[int]]): 2D list of allocations.
                                        0 indicates an unallocated cell.
         diff (int): The number of minimum-cost cells to find.
+        basis (set): Optional. The allocated cells, including epsilon
+                     cells. Defaults to the cells with a value > 0.
+
+    Cells that would close a loop with the allocated cells are skipped,
+    so the allocated cells plus the returned ones always form a tree
+    (otherwise the u and v values can't all be found).
 
     Returns:
         list[tuple]: A list of tuples, where each tuple is
@@ -63,7 +90,7 @@ def find_min_cost_unallocated(costs, allocations, diff):
     for r in range(num_rows):
         for c in range(num_cols):
             # Check if the cell is unallocated
-            if allocations[r][c] == 0:
+            if _is_nonbasic(r, c, basis, allocations):
                 # Store its position (row, col) and its cost
                 cost = costs[r][c]
                 unallocated_cells.append((r, c, cost))
@@ -71,35 +98,216 @@ def find_min_cost_unallocated(costs, allocations, diff):
     # Sort the list of unallocated cells based on their cost (the 3rd item)
     # The key=lambda x: x[2] tells sort() to use the cost for comparison
     unallocated_cells.sort(key=lambda x: x[2])
-    
-    # Return the first 'diff' elements from the sorted list
-    # This gives you the 'diff' cells with the minimum cost
-    return unallocated_cells[:diff]
 
-def add_epsilon_allocations(allocations, epsilon_cells):
+    # Track which rows/columns the allocated cells already connect
+    # (node r is row r, node num_rows + c is column c)
+    group = list(range(num_rows + num_cols))
+    def find_group(node):
+        while group[node] != node:
+            group[node] = group[group[node]]
+            node = group[node]
+        return node
+
+    allocated_cells = basis if basis is not None else _basic_cells(allocations)
+    for (r, c) in allocated_cells:
+        group[find_group(r)] = find_group(num_rows + c)
+
+    # Take the cheapest cells that join two separate groups
+    chosen = []
+    for (r, c, cost) in unallocated_cells:
+        if len(chosen) == diff:
+            break
+        row_group, col_group = find_group(r), find_group(num_rows + c)
+        if row_group != col_group:
+            group[row_group] = col_group
+            chosen.append((r, c, cost))
+    return chosen
+
+def add_epsilon_allocations(basis, epsilon_cells):
     """
-    Updates the allocation matrix by adding epsilon allocations
-    to resolve degeneracy. This function modifies the matrix in-place.
+    Adds epsilon allocations to the basis to resolve degeneracy.
+    Epsilon is symbolic: the cells join the basis (modified in-place)
+    but their allocation stays 0.
 
     Args:
-        allocations (list[list[int/float]]): The allocation matrix.
+        basis (set): The (r, c) cells of the basis.
         epsilon_cells (list[tuple]): List of (r, c, cost) tuples
                                      where epsilon should be added.
     
     Returns:
-        list[list[int/float]]: The modified allocation matrix.
+        set: The modified basis.
     """
-    # Epsilon is a very small positive quantity
-    # It's treated as an allocation, but has a value of 0
-    EPSILON = 0.0001
-    
-    # Unpack the tuple (row, col, cost) for each cell
     for (r, c, cost) in epsilon_cells:
-        # We check if it's 0, just to be safe
-        if allocations[r][c] == 0:
-            allocations[r][c] = EPSILON
+        basis.add((r, c))
+
+    return basis
+
+class BasisTree:
+    """
+    The allocated (basic) cells of a solution kept as a spanning tree.
+
+    Node r is row r and node num_rows + c is column c, and every basic
+    cell (r, c) is the edge between them. Row A (node 0) is the root, so
+    u_A = 0 and every other u/v follows from its parent along one edge:
+    C[r][c] = u[r] + v[c]. After a pivot only the part of the tree that
+    was moved gets new u/v values, and the loop for a pivot cell is the
+    tree path between its row and its column.
+    """
+
+    def __init__(self, costs, cells):
+        """
+        Args:
+            costs (list[list[int]]): The 2D cost matrix.
+            cells (list[tuple]): The basic (r, c) cells.
+        """
+        self.costs = costs
+        self.num_rows = len(costs)
+        self.num_cols = len(costs[0])
+        num_nodes = self.num_rows + self.num_cols
+
+        self.parent = [None] * num_nodes
+        self.depth = [0] * num_nodes
+        self.children = [[] for _ in range(num_nodes)]
+        self.potential = [0] * num_nodes # u values, then v values
+
+        neighbours = [[] for _ in range(num_nodes)]
+        for (r, c) in cells:
+            neighbours[r].append(self.num_rows + c)
+            neighbours[self.num_rows + c].append(r)
+
+        # One BFS per connected part (a single one if the basis is a tree)
+        seen = [False] * num_nodes
+        for root in range(num_nodes):
+            if seen[root]:
+                continue
+            seen[root] = True
+            queue = [root]
+            for node in queue:
+                for other in neighbours[node]:
+                    if not seen[other]:
+                        seen[other] = True
+                        self._attach(other, node)
+                        queue.append(other)
+
+    def _cell(self, node_a, node_b):
+        """The (r, c) cell joining a row node and a column node."""
+        r, c = min(node_a, node_b), max(node_a, node_b) - self.num_rows
+        return (r, c)
+
+    def _attach(self, node, parent):
+        """Hangs 'node' under 'parent' and sets its depth and u/v value."""
+        r, c = self._cell(node, parent)
+        self.parent[node] = parent
+        self.depth[node] = self.depth[parent] + 1
+        self.potential[node] = self.costs[r][c] - self.potential[parent]
+        self.children[parent].append(node)
+
+    @property
+    def u(self):
+        return self.potential[:self.num_rows]
+
+    @property
+    def v(self):
+        return self.potential[self.num_rows:]
+
+    def steps(self):
+        """
+        The order the u/v values can be found in, starting from u_A = 0.
+
+        Returns:
+            list[tuple]: ('u' or 'v', index, (row, col) of the cell used).
+        """
+        steps = []
+        queue = [0]
+        for node in queue:
+            for child in self.children[node]:
+                if child < self.num_rows:
+                    steps.append(('u', child, self._cell(child, node)))
+                else:
+                    steps.append(('v', child - self.num_rows, self._cell(child, node)))
+                queue.append(child)
+        return steps
+
+    def find_loop(self, pivot_cell):
+        """
+        The loop for 'pivot_cell': the pivot followed by the tree path from
+        its row to its column, so loop[1] is in the pivot's row and the last
+        cell is in the pivot's column.
+
+        Returns:
+            list[tuple]: The loop, or None if the row and column are not
+                         connected.
+        """
+        row_node, col_node = pivot_cell[0], self.num_rows + pivot_cell[1]
+        row_side, col_side = [], []
+        while row_node != col_node:
+            if self.depth[row_node] >= self.depth[col_node]:
+                if self.parent[row_node] is None:
+                    return None
+                row_side.append(self._cell(row_node, self.parent[row_node]))
+                row_node = self.parent[row_node]
+            else:
+                if self.parent[col_node] is None:
+                    return None
+                col_side.append(self._cell(col_node, self.parent[col_node]))
+                col_node = self.parent[col_node]
+        return [pivot_cell] + row_side + col_side[::-1]
+
+    def pivot(self, entering_cell, leaving_cell):
+        """
+        Swaps 'leaving_cell' out of the basis and 'entering_cell' in.
+
+        Taking the leaving edge out cuts off one subtree. That subtree is
+        hung back on through the entering cell, and only its nodes get new
+        depths and u/v values (all shifted by the same amount).
+        """
+        leaving_a, leaving_b = leaving_cell[0], self.num_rows + leaving_cell[1]
+        cut = leaving_a if self.parent[leaving_a] == leaving_b else leaving_b
+
+        # The entering cell's end inside the cut-off subtree
+        inner, outer = entering_cell[0], self.num_rows + entering_cell[1]
+        if not self._in_subtree(inner, cut):
+            inner, outer = outer, inner
+
+        # Reverse the parent links on the path inner -> cut
+        old_potential = self.potential[inner]
+        node, new_parent = inner, outer
+        while True:
+            old_parent = self.parent[node]
+            self.children[old_parent].remove(node)
+            self.parent[node] = new_parent
+            self.children[new_parent].append(node)
+            if node == cut:
+                break
+            node, new_parent = old_parent, node
+
+        # Shift the subtree's u/v so the entering cell has u + v = C
+        r, c = entering_cell
+        shift = self.costs[r][c] - self.potential[outer] - old_potential
+        inner_is_row = inner < self.num_rows
+        queue = [inner]
+        for node in queue:
+            self.depth[node] = self.depth[self.parent[node]] + 1
+            if (node < self.num_rows) == inner_is_row:
+                self.potential[node] += shift
+            else:
+                self.potential[node] -= shift
+            queue.extend(self.children[node])
+
+    def _in_subtree(self, node, root):
+        """True if 'node' is 'root' or one of its descendants."""
+        while node is not None and self.depth[node] >= self.depth[root]:
+            if node == root:
+                return True
+            node = self.parent[node]
+        return False
 
-    return allocations
+def _basic_cells(allocations):
+    """The (r, c) cells with an allocation (> 0, so epsilon counts)."""
+    return [(r, c)
+            for r in range(len(allocations))
+            for c in range(len(allocations[0]))
+            if allocations[r][c] > 0]
 
 def u_v_calculation(costs, allocations):
     """
@@ -117,67 +325,10 @@ def u_v_calculation(costs, allocations):
     Returns:
         tuple: A tuple containing two lists: (u_values, v_values)
     """
-    num_rows = len(costs)
-    num_cols = len(costs[0])
-    
-    # 1. Find all allocated cells (row, col)
-    # A cell is "allocated" if its value is > 0 (this includes epsilon)
-    allocated_cells = []
-    for r in range(num_rows):
-        for c in range(num_cols):
-            if allocations[r][c] > 0:
-                allocated_cells.append((r, c))
-                
-    # 2. Initialize u and v lists with 'None'
-    # 'None' means the value is not yet calculated
-    u = [None] * num_rows
-    v = [None] * num_cols
-    
-    # 3. Set the first u value to 0, as per the MODI rule
-    u[0] = 0
-    
-    # 4. Loop until all u and v values are calculated
-    # We use 'calculated_count' to track progress
-    calculated_count = 1  # We start with 1 (u[0])
-    total_to_calculate = num_rows + num_cols
-    
-    # This loop will run until all u's and v's are found
-    # We add a safeguard to prevent infinite loops if something is wrong
-    loop_count = 0
-    max_loops = (num_rows + num_cols) * 2
-    
-    while calculated_count < total_to_calculate:
-        
-        # This flag tracks if we found any new value in this iteration
-        made_progress = False
-        
-        for (r, c) in allocated_cells:
-            cost = costs[r][c]
-            
-            # Case 1: u[r] is known, v[c] is unknown
-            # We can calculate v[c] = cost - u[r]
-            if u[r] is not None and v[c] is None:
-                v[c] = cost - u[r]
-                calculated_count += 1
-                made_progress = True
-            
-            # Case 2: v[c] is known, u[r] is unknown
-            # We can calculate u[r] = cost - v[c]
-            elif u[r] is None and v[c] is not None:
-                u[r] = cost - v[c]
-                calculated_count += 1
-                made_progress = True
-        
-        # Safeguard: If we went through all cells and made no progress,
-        # it means the allocations are not connected (which resolving
-        # degeneracy should prevent, but it's good to have)
-        loop_count += 1
-        if not made_progress and loop_count > max_loops:
-            break
-            
-    return u, v
+    tree = BasisTree(costs, _basic_cells(allocations))
+    return tree.u, tree.v
 
-def calculate_opportunity_costs(costs, allocations, u, v):
+def calculate_opportunity_costs(costs, allocations, u, v, basis=None):
     """
     Calculates the opportunity cost (improvement index) for all
     UNALLOCATED cells.
@@ -189,6 +340,8 @@ def calculate_opportunity_costs(costs, allocations, u, v):
         allocations (list[list[float/int]]): The 2D allocation matrix.
         u (list[int/float]): The calculated 'u' (row) values.
         v (list[int/float]): The calculated 'v' (column) values.
+        basis (set): Optional. The allocated cells, including epsilon
+                     cells. Defaults to the cells with a value > 0.
 
     Returns:
         list[list[float/None]]: A 2D matrix where unallocated cells
@@ -209,8 +362,8 @@ def calculate_opportunity_costs(costs, allocations, u, v):
             if v[c] == None:
                 v[c] = 0
             # We only calculate this for UNALLOCATED cells
-            # (Allocated cells have a value > 0, including epsilon)
-            if allocations[r][c] == 0:
+            # (Allocated cells are the basis, including epsilon)
+            if _is_nonbasic(r, c, basis, allocations):
                 
                 # Apply the formula: u[i] + v[j] - C[i][j]
                 cost = u[r] + v[c] - costs[r][c]
@@ -218,7 +371,7 @@ def calculate_opportunity_costs(costs, allocations, u, v):
                 
     return opp_costs
 
-def check_optimality(opp_costs):
+def check_optimality(opp_costs, first_positive=False):
     """
     Checks if the current solution is optimal by examining opportunity costs.
     
@@ -228,6 +381,8 @@ def check_optimality(opp_costs):
     Args:
         opp_costs (list[list[float/None]]): The 2D matrix of opportunity costs.
                                             (None for allocated cells).
+        first_positive (bool): Bland's rule: take the first positive cell
+                               (row by row) instead of the most positive.
 
     Returns:
         tuple: 
@@ -255,6 +410,8 @@ def check_optimality(opp_costs):
                     # one we've found so far.
                     max_positive_cost = cost
                     pivot_cell = (r, c) # Save the location (row, col)
+                    if first_positive:
+                        return False, pivot_cell
     
     # After checking all cells:
     if max_positive_cost > 0:
@@ -276,6 +433,9 @@ def find_loop(allocations, pivot_cell):
     3. Only "turns" (e.g., from row to col) at allocated cells.
     4. The loop must have at least 4 cells.
 
+    The allocated cells form a tree (see BasisTree), so the loop is the
+    one tree path from the pivot's row to the pivot's column.
+
     Args:
         allocations (list[list[float/int]]): The 2D allocation matrix.
         pivot_cell (tuple): The (row, col) of the starting unallocated cell.
@@ -284,108 +444,9 @@ def find_loop(allocations, pivot_cell):
         list[tuple]: A list of (row, col) tuples representing the loop.
                      Returns None if no loop is found.
     """
-    num_rows = len(allocations)
-    num_cols = len(allocations[0])
-    pivot_r, pivot_c = pivot_cell
-
-    # Get all allocated cells as a set for quick lookup
-    allocated_cells = set()
-    for r in range(num_rows):
-        for c in range(num_cols):
-            if allocations[r][c] > 0:
-                allocated_cells.add((r, c))
-
-    # We will try to find a path from an allocated cell in the
-    # pivot's row to an allocated cell in the pivot's column.
-    
-    # 1. Get all potential "start" cells (allocated, in pivot's row)
-    row_starters = [(pivot_r, c) for c in range(num_cols) if (pivot_r, c) in allocated_cells]
-    
-    # 2. Get all potential "end" cells (allocated, in pivot's column)
-    col_enders = [(r, pivot_c) for r in range(num_rows) if (r, pivot_c) in allocated_cells]
-
-    # --- Define the recursive search function (DFS) ---
-    # This search finds a path between 'start' and 'end' by
-    # alternating row/column searches.
-    def find_path_dfs(r, c, search_direction, end_cell, visited, path_stack):
-        """
-        Recursive helper to find the path.
-        'search_direction' is the direction we MUST search next.
-        """
-        visited.add((r, c))
-        path_stack.append((r, c))
-
-        if (r, c) == end_cell:
-            return True # Found the end!
-
-        if search_direction == 'col':
-            # We just moved horizontally, so now we search vertically
-            for next_r in range(num_rows):
-                if next_r == r: continue
-                next_cell = (next_r, c)
-                
-                if next_cell == end_cell:
-                    path_stack.append(end_cell)
-                    return True
-                
-                if next_cell in allocated_cells and next_cell not in visited:
-                    if find_path_dfs(next_r, c, 'row', end_cell, visited, path_stack):
-                        return True
-                        
-        elif search_direction == 'row':
-            # We just moved vertically, so now we search horizontally
-            for next_c in range(num_cols):
-                if next_c == c: continue
-                next_cell = (r, next_c)
-                
-                if next_cell == end_cell:
-                    path_stack.append(end_cell)
-                    return True
-                
-                if next_cell in allocated_cells and next_cell not in visited:
-                    if find_path_dfs(r, next_c, 'col', end_cell, visited, path_stack):
-                        return True
-
-        # No path found from here, backtrack
-        path_stack.pop()
-        return False
-    # --- End of DFS definition ---
-
-    # Now, try to find a path for every start/end combination
-    for start_cell in row_starters:
-        for end_cell in col_enders:
-            if start_cell == end_cell: continue
-            
-            path_stack = []
-            visited = set()
-            
-            # Start from 'start_cell', and we "got here" by row,
-            # so our first search MUST be by column.
-            if find_path_dfs(start_cell[0], start_cell[1], 'col', end_cell, visited, path_stack):
-                # Success! Construct the full loop
-                # pivot -> start_cell -> ...path... -> end_cell -> pivot
-                return [pivot_cell] + path_stack
-            
-
-    # If we found no loops, we must also try searching
-    # from col_starters to row_enders (the other direction)
-    col_starters = [(r, pivot_c) for r in range(num_rows) if (r, pivot_c) in allocated_cells]
-    row_enders = [(pivot_r, c) for c in range(num_cols) if (pivot_r, c) in allocated_cells]
-    
-    for start_cell in col_starters:
-        for end_cell in row_enders:
-            if start_cell == end_cell: continue
-            
-            path_stack = []
-            visited = set()
-            
-            # Start from 'start_cell', we "got here" by col,
-            # so our first search MUST be by row.
-            if find_path_dfs(start_cell[0], start_cell[1], 'row', end_cell, visited, path_stack):
-                return [pivot_cell] + path_stack
-
-    # If after all that, nothing is found
-    return None
+    # Only the tree shape matters here, not the costs
+    shape = [[0] * len(allocations[0]) for _ in allocations]
+    return BasisTree(shape, _basic_cells(allocations)).find_loop(pivot_cell)
 
 def adjust_allocations(allocations, loop):
     """
@@ -419,18 +480,9 @@ def adjust_allocations(allocations, loop):
     
 
     # 2. Find the minimum allocation in the 'minus' cells
-    # This is the amount 'theta' we can shift
-    min_allocation = float('inf')
-    for (r, c) in minus_cells:
-        # We ignore the pivot, which has 0, by checking > 0
-        if allocations[r][c] > 0 and allocations[r][c] < min_allocation:
-            min_allocation = allocations[r][c]
-            
-    # Handle the rare case where an epsilon was the min value
-    if min_allocation == float('inf'):
-         # This can happen if all 'minus' cells were 0 or epsilon
-         # We'll just find the smallest value, even if it's epsilon
-         min_allocation = min(allocations[r][c] for (r,c) in minus_cells)
+    # This is the amount 'theta' we can shift. An epsilon cell holds 0,
+    # so theta is 0 (= epsilon) when one of them is a 'minus' cell.
+    min_allocation = min(allocations[r][c] for (r, c) in minus_cells)
 
     # Create a new allocation matrix (deep copy) to modify
     new_allocations = [row[:] for row in allocations]
@@ -462,61 +514,194 @@ def calculate_final_cost(costs, allocations):
             total_cost += costs[i][j] * allocations[i][j]
     return total_cost
 
-def solve_MODI(costs_for_modi, original_costs, initial_allocation):
+def _epsilon_cells(allocations, basis):
+    """Returns the basis cells currently holding an epsilon (0) allocation."""
+    return sorted((r, c) for (r, c) in basis if allocations[r][c] == 0)
+
+def cells_from_trace(cells):
     """
-    Solve transportation problem using the Modified Distribution (MODI) method.
-    ...
+    JSON turns the (r, c) tuples of a trace into lists. This turns them
+    back into tuples so they can be compared and used as dict keys.
+    """
+    if cells is None:
+        return None
+    return [tuple(cell) for cell in cells]
+
+def iter_MODI(costs_for_modi, original_costs, initial_allocation, trace=None, basis=None,
+              max_iterations=None, time_budget=None, pivot_rule="dantzig"):
+    """
+    Runs the MODI method as a stream: yields one small event per pivot,
+    so a caller can forward progress live or stop whenever it likes.
+
     Parameters:
-    costs_for_modi: 2D list of costs for MODI logic (minimization matrix).
-    original_costs: 2D list of the original problem costs (for final sum).
-    initial_allocation: 2D list of allocated quantities from VAM.
-    ...
+    costs_for_modi, original_costs, initial_allocation, trace, basis,
+    pivot_rule:
+        As in solve_MODI.
+    max_iterations: Optional. Stop after this many pivots.
+    time_budget: Optional. Stop once this many seconds have passed.
+
+    Yields:
+    dict: A pivot event:
+          {'status': 'pivot', 'iteration', 'entering_cell',
+           'leaving_cell', 'loop', 'theta', 'changed_cells', 'objective'}
+          where 'changed_cells' holds (r, c, new_allocation) for the loop
+          cells that moved and 'objective' is the cost after the pivot
+          (original costs). The last event is
+          {'status', 'iteration', 'pivots', 'objective'} with status
+          'optimal', 'iteration_limit', 'time_limit' or 'no_loop', and
+          'pivots' the number of pivots made.
+    Every event is O(m + n): applying 'changed_cells' to the starting
+    allocation replays the solve.
     """
-    
+    started = time.perf_counter()
     current_allocation = [row[:] for row in initial_allocation]
+    num_rows, num_cols = len(costs_for_modi), len(costs_for_modi[0])
+    if basis is None:
+        basis = set()
+    if not basis:
+        basis.update(_basic_cells(current_allocation))
+    in_basis = np.zeros((num_rows, num_cols), dtype=bool)
+    for cell in basis:
+        in_basis[cell] = True
+    rule = make_pivot_rule(pivot_rule, costs_for_modi)
+    objective = calculate_final_cost(original_costs, current_allocation)
+    tree = None # Rebuilt whenever epsilon cells are added
+    stalled_pivots = 0 # Zero-theta pivots in a row
+    iteration = 0
     
     while True:
-        # 1. Handle Degeneracy (uses minimization matrix)
-        is_non_degenerate, diff = check_degeneracy(current_allocation, costs_for_modi)
-        print("done degeneracy")
+        iteration += 1
+        step = {'iteration': iteration}
 
-        if not is_non_degenerate:
-            epsilon_cells = find_min_cost_unallocated(costs_for_modi, current_allocation, diff)
-            current_allocation = add_epsilon_allocations(current_allocation, epsilon_cells)
-            print("adjusted degeneracy")
+        # 1. Handle Degeneracy (uses minimization matrix)
+        diff = (num_rows + num_cols - 1) - len(basis)
+        step['is_degenerate'] = diff > 0
+        step['added_epsilon_cells'] = []
+
+        if diff > 0:
+            epsilon_cells = find_min_cost_unallocated(costs_for_modi, current_allocation, diff, basis)
+            add_epsilon_allocations(basis, epsilon_cells)
+            for (r, c, _) in epsilon_cells:
+                in_basis[r, c] = True
+            step['added_epsilon_cells'] = [(r, c) for (r, c, _) in epsilon_cells]
+            tree = None
 
         # 2. Calculate u, v (uses minimization matrix)
-        u, v = u_v_calculation(costs_for_modi, current_allocation)
-        print("done u & v calculation")
-
-        # 3. Calculate Opportunity Costs (uses minimization matrix)
-        opportunity_cost = calculate_opportunity_costs(costs_for_modi, current_allocation, u, v)
-        print("done opportunity cost")
-
-        # 4. Check for Optimality
-        is_optimal, pivot_cell = check_optimality(opportunity_cost)
-        print("done optimality check")
+        if tree is None:
+            tree = BasisTree(costs_for_modi, sorted(basis))
+        u, v = tree.u, tree.v
+
+        # 3-4. Price the Opportunity Costs and pick the entering cell with
+        # the pivot rule (Bland's rule while stalled); None means optimal
+        if stalled_pivots >= STALL_LIMIT:
+            pivot_cell = rule.bland_cell(tree, in_basis)
+        else:
+            pivot_cell = rule.entering_cell(tree, in_basis)
+        is_optimal = pivot_cell is None
+
+        if trace is not None:
+            # The full per-iteration tables, only kept for the animations
+            step['allocations'] = [row[:] for row in current_allocation]
+            step['epsilon_cells'] = _epsilon_cells(current_allocation, basis)
+            step['u'], step['v'], step['uv_steps'] = list(u), list(v), tree.steps()
+            step['opportunity_costs'] = calculate_opportunity_costs(costs_for_modi, current_allocation,
+                                                                    u, v, basis)
+            step['is_optimal'] = is_optimal
+            step['pivot'] = pivot_cell
+            trace.append(step)
 
         if is_optimal:
-            print("Solution is optimal. Breaking loop.")
-            break
-        else:
-            # 5a. Find Loop
-            loop = find_loop(current_allocation, pivot_cell)
-            print("found loop")
-            
-            if loop is None:
-                print("Error: Could not find a loop. Returning current solution.", file=sys.stderr)
-                break 
+            yield {'status': 'optimal', 'iteration': iteration, 'pivots': iteration - 1, 'objective': objective}
+            return
+
+        # 5a. Find Loop
+        loop = tree.find_loop(pivot_cell)
+        step['loop'] = loop
+        
+        if loop is None:
+            print("Error: Could not find a loop. Returning current solution.", file=sys.stderr)
+            yield {'status': 'no_loop', 'iteration': iteration, 'pivots': iteration - 1, 'objective': objective}
+            return
+
+        # 5b. Adjust Allocations in place ('+' from the pivot, then alternating)
+        plus_cells, minus_cells = loop[0::2], loop[1::2]
+        theta = min(current_allocation[r][c] for (r, c) in minus_cells)
+        changed_cells = []
+        if theta:
+            for sign, cells in ((1, plus_cells), (-1, minus_cells)):
+                for (r, c) in cells:
+                    current_allocation[r][c] += sign * theta
+                    objective += sign * theta * original_costs[r][c]
+                    changed_cells.append((r, c, current_allocation[r][c]))
+        stalled_pivots = stalled_pivots + 1 if theta == 0 else 0
+
+        # Exactly one '-' cell that dropped to 0 leaves the basis (the
+        # first one, row by row); any others stay in as epsilon cells.
+        leaving_cell = min((r, c) for (r, c) in minus_cells if current_allocation[r][c] == 0)
+        basis.remove(leaving_cell)
+        basis.add(pivot_cell)
+        in_basis[leaving_cell] = False
+        in_basis[pivot_cell] = True
+        tree.pivot(pivot_cell, leaving_cell)
+
+        if trace is not None:
+            step['theta'] = theta
+            step['plus_cells'] = plus_cells
+            step['minus_cells'] = minus_cells
+            step['leaving_cell'] = leaving_cell
+            step['new_allocations'] = [row[:] for row in current_allocation]
+            step['new_epsilon_cells'] = _epsilon_cells(current_allocation, basis)
+
+        yield {
+            'status': 'pivot',
+            'iteration': iteration,
+            'entering_cell': pivot_cell,
+            'leaving_cell': leaving_cell,
+            'loop': loop,
+            'theta': theta,
+            'changed_cells': changed_cells,
+            'objective': objective
+        }
+
+        # 6. Early stop
+        if max_iterations is not None and iteration >= max_iterations:
+            yield {'status': 'iteration_limit', 'iteration': iteration, 'pivots': iteration, 'objective': objective}
+            return
+        if time_budget is not None and time.perf_counter() - started >= time_budget:
+            yield {'status': 'time_limit', 'iteration': iteration, 'pivots': iteration, 'objective': objective}
+            return
+
+def solve_MODI(costs_for_modi, original_costs, initial_allocation, trace=None, basis=None,
+               pivot_rule="dantzig"):
+    """
+    Solve transportation problem using the Modified Distribution (MODI) method.
+    ...
+    Parameters:
+    costs_for_modi: 2D list of costs for MODI logic (minimization matrix).
+    original_costs: 2D list of the original problem costs (for final sum).
+    initial_allocation: 2D list of allocated quantities from VAM.
+    trace: Optional list. When given, one dict per iteration is appended
+           to it (allocations, epsilon cells, u, v, opportunity costs,
+           pivot, loop, theta and the resulting allocations), so the
+           animations can replay the solve instead of re-computing it.
+    basis: Optional set of (r, c) basic cells to start from (a warm start,
+           see warm_start.py). It must hold every allocated cell and no
+           loop; an empty set is filled from initial_allocation. It's
+           updated in place, so it holds the final basis afterwards.
+    pivot_rule: How the entering cell is picked, a key of
+                pivot_rules.PIVOT_RULES. 'dantzig' (the most positive
+                opportunity cost) is the classic rule; 'block_search' and
+                'candidate_list' only price part of the table per pivot.
+    ...
+    The pivots themselves run in iter_MODI(); this replays its events.
+    """
+    current_allocation = [row[:] for row in initial_allocation]
+    for event in iter_MODI(costs_for_modi, original_costs, initial_allocation, trace=trace, basis=basis,
+                           pivot_rule=pivot_rule):
+        for (r, c, value) in event.get('changed_cells', []):
+            current_allocation[r][c] = value
 
-            # 5b. Adjust Allocations
-            new_allocation_matrix, _, _, _ = adjust_allocations(current_allocation, loop)
-            print("adjusted allocation")
-            
-            current_allocation = new_allocation_matrix
-            print("--- RESTARTING LOOP ---")
-            
     # 6. After loop breaks, calculate final cost using ORIGINAL costs
     total_cost = calculate_final_cost(original_costs, current_allocation)
     
-    return current_allocation, total_cost
\ No newline at end of file
+    return current_allocation, total_cost
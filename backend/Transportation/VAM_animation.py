@@ -1,16 +1,17 @@
 from manim import *
 from VAM_helper_funcs import AnimationHelpers
-from manim_narration import NarrationScene
+from narration_prefetch import PrefetchNarrationScene
 from manim_narration import config as narration_config
-from manim_narration.speech import KokoroService
+from speech_services import kokoro_voice
+from MODI_solver import cells_from_trace
 import json
 import copy
 import os
 
-class VAMTransportation(NarrationScene):
+class VAMTransportation(PrefetchNarrationScene):
     def construct(self):
         self.set_speech_services(
-            en=KokoroService(voice="af_jessica", lang_code="en-us")
+            en=kokoro_voice("af_jessica")
         )
         # Build a reliable path to the JSON file
         script_dir = os.path.dirname(__file__)
@@ -19,7 +20,14 @@ class VAMTransportation(NarrationScene):
             data = json.load(f)
             supply = data["supply"]
             demand = data["demand"]
-            costs = data["costs"]
+            trace = data["trace"]
+
+        # --- Replay the solver's VAM run (transportation_main) ---
+        # Penalties, picks and allocations come from its trace, on the same
+        # cost matrix it used (the regret matrix for a max problem), so this
+        # ends on exactly the allocation the MODI scene starts from.
+        vam = trace["vam"]
+        costs = [row[:len(demand)] for row in vam["costs_to_solve"][:len(supply)]]
         # costs = [
         #                 [19, 30, 50, 10],
         #                 [70, 30, 40, 60],
@@ -32,6 +40,12 @@ class VAMTransportation(NarrationScene):
             self.play(Write(Header), run_time=narration.duration)
         self.wait(0.75)
         self.play(Header.animate.scale(0.75))
+        if data.get("problemType") == "max":
+            regret_text = Tex("Maximisation: each cost below is (largest profit $-$ profit)", color=YELLOW).scale(0.6).next_to(Header, DOWN)
+            with self.narration(speech_service_id="en", text = "This is a maximisation problem, so every profit is subtracted from the largest profit first") as narration:
+                self.play(Write(regret_text), run_time=narration.duration)
+            self.wait(0.5)
+            self.play(FadeOut(regret_text))
         full_table = AnimationHelpers.create_transportation_table(
             self, costs, supply, demand
         )
@@ -57,20 +71,20 @@ class VAMTransportation(NarrationScene):
         satisfied_cols = set() # Use set for efficiency
         allocations = {}  # Dictionary to store {(row, col): quantity}
         allocation_mobs = VGroup() # Group to hold allocation mobjects
-        iteration = 0
         
-        while sum(current_demand) > 0 and sum(current_supply) > 0:
-            iteration += 1
+        for iteration, step in enumerate(vam["steps"], start=1):
             iteration_text = Tex(f"Iteration {iteration}", color=BLUE).scale(0.8).to_corner(UR, buff=0.2)
             self.play(Write(iteration_text))
             
             # Step 1: Calculate row penalties
             row_penalties, row_penalty_texts = AnimationHelpers.calculate_row_penalties(
-                self, balanced_table, balanced_costs, row_penalty_lines, Header, satisfied_rows, satisfied_cols, iteration
+                self, balanced_table, balanced_costs, row_penalty_lines, Header, satisfied_rows, satisfied_cols, iteration,
+                penalties=step["row_penalties"]
             )
             # Step 2: Calculate column penalties
             col_penalties, col_penalty_texts = AnimationHelpers.calculate_column_penalties(
-                self, balanced_table, balanced_costs, col_penalty_lines, Header, satisfied_rows, satisfied_cols, iteration
+                self, balanced_table, balanced_costs, col_penalty_lines, Header, satisfied_rows, satisfied_cols, iteration,
+                penalties=step["col_penalties"]
             )
             
             # Combine penalties
@@ -79,7 +93,8 @@ class VAMTransportation(NarrationScene):
             # Step 3: Perform allocation based on penalties
             alloc_i, alloc_j, quantity, new_alloc_mob = AnimationHelpers.animate_allocation_step(
                 self, balanced_table, all_penalties, row_penalty_texts, col_penalty_texts,
-                current_supply, current_demand, satisfied_rows,  satisfied_cols, balanced_costs
+                current_supply, current_demand, satisfied_rows,  satisfied_cols, balanced_costs,
+                chosen_cell=cells_from_trace([step["cell"]])[0]
             )
             
             # Store the result
@@ -91,8 +106,9 @@ class VAMTransportation(NarrationScene):
         
         AnimationHelpers.animate_removing_extend_for_penalties(self, row_penalty_lines, col_penalty_lines)
         # --- FINAL STEP ---
-        # Step 4: Calculate the total cost from allocations
+        # Step 4: Calculate the total cost from allocations (the real
+        # costs/profits, not the regrets)
         AnimationHelpers.animate_total_cost_calculation(
-            self, table, balanced_costs, allocations
+            self, table, vam["original_costs"], allocations
         )
         self.wait(2)
\ No newline at end of file
@@ -174,9 +174,11 @@ class AnimationHelpers:
         
         return row_lines, col_lines
     
-    def calculate_row_penalties(self, table, costs, row_penalty_positions, step_header, satisfied_rows, satisfied_cols, iteration):
+    def calculate_row_penalties(self, table, costs, row_penalty_positions, step_header, satisfied_rows, satisfied_cols, iteration, penalties=None):
         """
         For each row, finds the two smallest costs and calculates the difference.
+        'penalties' (optional) are the solver's row penalties for this step,
+        shown instead of the recomputed ones.
         """
         explanation = Tex(
             "Row Penalty = Difference between\\\\two smallest costs in the row",
@@ -206,7 +208,7 @@ class AnimationHelpers:
             
             if len(valid_costs) < 2:
                 # Only one valid cost use it as it is penalty
-                penalty = valid_costs[0]
+                penalty = valid_costs[0] if penalties is None else penalties[i]
                 penalty_text = Integer(penalty, color=YELLOW).scale(0.75)
                 penalty_text.next_to(row_penalty_positions[i], DOWN, buff=0.2)
                 self.play(Write(penalty_text), run_time=0.2)
@@ -222,7 +224,7 @@ class AnimationHelpers:
             # Find two smallest values
             sorted_costs = sorted(valid_costs)
             min1, min2 = sorted_costs[0], sorted_costs[1]
-            penalty = min2 - min1
+            penalty = min2 - min1 if penalties is None else penalties[i]
             
             # Highlight the two smallest cells
             for j, cost in enumerate(row_costs):
@@ -269,9 +271,10 @@ class AnimationHelpers:
             self.wait(0.5)
         return penalty_values, penalty_texts
     
-    def calculate_column_penalties(self, table, costs, col_penalty_positions, step_header, satisfied_rows, satisfied_cols, iteration):
+    def calculate_column_penalties(self, table, costs, col_penalty_positions, step_header, satisfied_rows, satisfied_cols, iteration, penalties=None):
         """
         For each column, finds the two smallest costs and calculates the difference.
+        'penalties' (optional) are the solver's column penalties for this step.
         """
         if iteration == 1:
             explanation = Tex(
@@ -301,7 +304,7 @@ class AnimationHelpers:
             
             if len(col_costs) < 2:
                 # Only one valid cost - use it as penalty
-                penalty = col_costs[0]
+                penalty = col_costs[0] if penalties is None else penalties[j]
                 penalty_text = Integer(penalty, color=YELLOW).scale(0.75)
                 penalty_text.next_to(col_penalty_positions[j], RIGHT, buff=0.25).shift(UP*0.2)
                 self.play(Write(penalty_text), run_time=0.2)
@@ -317,7 +320,7 @@ class AnimationHelpers:
             # Find two smallest values
             sorted_costs = sorted(col_costs)
             min1, min2 = sorted_costs[0], sorted_costs[1]
-            penalty = min2 - min1
+            penalty = min2 - min1 if penalties is None else penalties[j]
             
             # Highlight the two smallest cells
             for i in range(len(costs)):
@@ -365,10 +368,13 @@ class AnimationHelpers:
             self.wait(0.5)
         return penalty_values, penalty_texts
     
-    def animate_allocation_step(self, table, all_penalties, row_penalty_texts, col_penalty_texts, supply_left, demand_left, satisfied_rows, satisfied_cols, costs):
+    def animate_allocation_step(self, table, all_penalties, row_penalty_texts, col_penalty_texts, supply_left, demand_left, satisfied_rows, satisfied_cols, costs, chosen_cell=None):
         """
         Finds the max penalty, handles ties by checking max allocation and min cost,
         allocates to the best cell, and updates supply/demand.
+        'chosen_cell' (optional) is the (row, col) the solver allocated to at
+        this step; it overrides the scene's own pick so the video always ends
+        on the solver's allocation.
         """
         # 1. Find the highest penalty value
         max_penalty_val = -1
@@ -394,6 +400,7 @@ class AnimationHelpers:
         self.wait(1)
 
         # --- START: TIE-BREAKING LOGIC ---
+        alloc_i = alloc_j = None
         
         # 3. If there's a tie, evaluate candidates. Otherwise, just pick the only one.
         if len(tied_penalties) > 1:
@@ -456,10 +463,13 @@ class AnimationHelpers:
             # Sort candidates: 1. by largest allocation (desc), 2. by smallest cost (asc)
             sorted_candidates = sorted(candidates, key=lambda c: (-c['possible_alloc'], c['min_cost']))
             winner = sorted_candidates[0]
+            if chosen_cell is not None:
+                winner = next((c for c in sorted_candidates if c['cell_indices'] == chosen_cell), winner)
+            runner_up = next(c for c in sorted_candidates if c is not winner)
             
             # Announce the reason for the choice
             reason_text = None
-            if sorted_candidates[0]['possible_alloc'] > sorted_candidates[1]['possible_alloc']:
+            if winner['possible_alloc'] > runner_up['possible_alloc']:
                 reason_text = Tex("Choosing the one with the largest possible allocation.", color=BLUE).scale(0.7)
                 reason_text_str = "Choosing the one with the largest possible allocation."
 
@@ -492,6 +502,13 @@ class AnimationHelpers:
                         min_cost = row[index]
                         alloc_i, alloc_j = row_idx, index
         
+        if chosen_cell is not None and (alloc_i, alloc_j) != chosen_cell:
+            # Same cost elsewhere in the line: follow the solver
+            alloc_i, alloc_j = chosen_cell
+            min_cost = costs[alloc_i][alloc_j]
+            best_penalty = next((p for p in tied_penalties
+                                 if p[1] == (alloc_i if p[2] == 'row' else alloc_j)), best_penalty)
+
         # --- END: TIE-BREAKING LOGIC ---
 
         # 4. Announce selected row/column and find the minimum cost cell
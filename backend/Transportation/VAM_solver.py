@@ -1,4 +1,4 @@
-import sys # Used for float('inf')
+import numpy as np
 
 def max_to_min(costs):
     """
@@ -58,179 +58,76 @@ def balance_problem(supply, demand, costs):
     return supply, demand, costs, is_dummy_added
 
 
-def _calculate_penalties(costs, available_rows, available_cols):
+def _two_smallest(block):
+    """
+    For every row of 'block', returns the column of its smallest value
+    (first one on ties), the smallest value and the second smallest.
+    Crossed-out cells are +inf, so they never count.
+    """
+    rows = np.arange(block.shape[0])
+    argmin = np.argmin(block, axis=1)
+    min1 = block[rows, argmin]
+    if block.shape[1] >= 2:
+        min2 = np.partition(block, 1, axis=1)[:, 1]
+    else:
+        min2 = np.full(block.shape[0], np.inf)
+    return argmin, min1, min2
+
+def _line_penalties(min1, min2):
     """
-    Calculates the penalties for all available rows and columns.
     Penalty = difference between the two smallest costs in a line.
+    A line with one cell left gets that cell's cost, and a line with
+    nothing left (or already crossed out) gets -1.
     """
-    num_rows = len(costs)
-    num_cols = len(costs[0])
-    
-    # Initialize penalties with -1 (or any value < 0)
-    # This marks them as "not calculated" or "not available"
-    row_penalties = [-1] * num_rows
-    col_penalties = [-1] * num_cols
-
-    # --- Calculate Row Penalties ---
-    for r in range(num_rows):
-        # Only calculate for available rows
-        if available_rows[r]:
-            # Find all costs in this row from available columns
-            row_costs = []
-            for c in range(num_cols):
-                if available_cols[c]:
-                    row_costs.append(costs[r][c])
-            
-            if len(row_costs) > 0:
-                row_costs.sort() # Sort costs from smallest to largest
-                
-            if len(row_costs) >= 2:
-                row_penalties[r] = row_costs[1] - row_costs[0]
-            elif len(row_costs) == 1:
-                row_penalties[r] = row_costs[0] # Only one cell left
-            else:
-                row_penalties[r] = -1 # No cells available in this row
-
-    # --- Calculate Column Penalties ---
-    for c in range(num_cols):
-        # Only calculate for available columns
-        if available_cols[c]:
-            # Find all costs in this col from available rows
-            col_costs = []
-            for r in range(num_rows):
-                if available_rows[r]:
-                    col_costs.append(costs[r][c])
-
-            if len(col_costs) > 0:
-                col_costs.sort() # Sort costs
-            
-            if len(col_costs) >= 2:
-                col_penalties[c] = col_costs[1] - col_costs[0]
-            elif len(col_costs) == 1:
-                col_penalties[c] = col_costs[0] # Only one cell left
-            else:
-                col_penalties[c] = -1 # No cells available in this col
-                
-    return row_penalties, col_penalties
-
-def _find_best_allocation_candidate(costs, supply, demand, 
-                                    row_penalties, col_penalties, 
-                                    available_rows, available_cols):
+    with np.errstate(invalid="ignore"): # inf - inf on crossed-out lines
+        spread = min2 - min1
+    return np.where(np.isfinite(min2), spread,
+                    np.where(np.isfinite(min1), min1, -1.0))
+
+def _find_best_allocation_candidate(work, supply_left, demand_left,
+                                    row_penalties, col_penalties,
+                                    row_argmin, col_argmin):
     """
     Finds the best cell to allocate to based on VAM's advanced
     tie-breaking rules.
-    
-    1. Finds all rows/cols with the maximum penalty.
-    2. For each, finds the potential allocation (Rule 1: max allocation).
-    3. If tied, finds the one with the minimum cost (Rule 2: min cost).
-    
+
+    1. Takes every row/col with the maximum penalty and its min cost cell.
+    2. Picks the cell with the largest possible allocation (Rule 1).
+    3. If tied, the one with the minimum cost (Rule 2), then the first
+       one found (rows before columns).
+
     Returns:
-        A tuple: ( (r, c), allocation_amount )
-        Returns (None, 0) if no candidate is found.
+        tuple: (r, c), or None if no candidate is found.
     """
-    
-    # Find the absolute highest penalty value
-    max_row_pen = max(row_penalties)
-    max_col_pen = max(col_penalties)
-    max_penalty_value = max(max_row_pen, max_col_pen)
-    
-    # This can happen at the end
+    max_penalty_value = max(row_penalties.max(), col_penalties.max())
     if max_penalty_value < 0:
-        return None, 0
+        return None
 
-    candidates = []
-    
-    # --- 1. Gather all candidate cells from qualifying ROWS ---
-    for r, pen in enumerate(row_penalties):
-        if pen == max_penalty_value:
-            # This row has the max penalty. Find its min cost cell.
-            (cell_r, cell_c) = _find_min_cost_cell(costs, 'row', r, 
-                                                   available_rows, available_cols)
-            
-            # This can happen if a row is available but has no
-            # available columns left
-            if (cell_r, cell_c) == (-1, -1):
-                continue 
-            
-            cost = costs[cell_r][cell_c]
-            # Rule 1: Find potential max allocation
-            potential_alloc = min(supply[cell_r], demand[cell_c])
-            
-            # Store: (potential_alloc, cost, (row, col))
-            candidates.append((potential_alloc, cost, (cell_r, cell_c)))
-
-    # --- 2. Gather all candidate cells from qualifying COLS ---
-    for c, pen in enumerate(col_penalties):
-        if pen == max_penalty_value:
-            # This col has the max penalty. Find its min cost cell.
-            (cell_r, cell_c) = _find_min_cost_cell(costs, 'col', c, 
-                                                   available_rows, available_cols)
-
-            if (cell_r, cell_c) == (-1, -1):
-                continue 
-            
-            cost = costs[cell_r][cell_c]
-            potential_alloc = min(supply[cell_r], demand[cell_c])
-            
-            # We must check if this cell was already added by a 
-            # row. This avoids duplicates if (0,1) is the min
-            # for both Row 0 and Col 1.
-            if (potential_alloc, cost, (cell_r, cell_c)) not in candidates:
-                candidates.append((potential_alloc, cost, (cell_r, cell_c)))
-    
-    if not candidates:
-        return None, 0
-
-    # --- 3. Find the best candidate ---
-    # We sort by:
-    #   1. potential_alloc (item[0]), descending (hence the 'reverse=True')
-    #   2. cost (item[1]), ascending (which is the default)
-    #
-    # We can also use a key with a trick: (item[0], -item[1])
-    # sorting by -item[1] (negative cost) in descending order
-    # is the same as sorting by cost ascending.
-    
-    candidates.sort(key=lambda item: (item[0], -item[1]), reverse=True)
-    
-    # The best candidate is now the first one in the list
-    best = candidates[0]
-    best_cell = best[2]       # (r, c)
-    best_alloc_amt = best[0]  # The potential allocation
-    
-    return best_cell, best_alloc_amt
+    cand_rows = np.flatnonzero(row_penalties == max_penalty_value)
+    cand_cols = np.flatnonzero(col_penalties == max_penalty_value)
+    cell_rows = np.concatenate([cand_rows, col_argmin[cand_cols]])
+    cell_cols = np.concatenate([row_argmin[cand_rows], cand_cols])
 
-def _find_min_cost_cell(costs, line_type, index, available_rows, available_cols):
-    """
-    Finds the cell (r, c) with the minimum cost within the specified
-    row or column.
-    """
-    min_cost = float('inf')
-    best_cell = (-1, -1) # (row, col)
-
-    if line_type == 'row':
-        r = index
-        # Search all available columns in this row
-        for c in range(len(costs[0])):
-            if available_cols[c] and costs[r][c] < min_cost:
-                min_cost = costs[r][c]
-                best_cell = (r, c)
-                
-    elif line_type == 'col':
-        c = index
-        # Search all available rows in this column
-        for r in range(len(costs)):
-            if available_rows[r] and costs[r][c] < min_cost:
-                min_cost = costs[r][c]
-                best_cell = (r, c)
-                
-    return best_cell
-
-def solve_vam(supply, demand, costs, problem_type="min"):
+    cell_costs = work[cell_rows, cell_cols]
+    usable = np.isfinite(cell_costs)
+    if not usable.any():
+        return None
+    cell_rows, cell_cols, cell_costs = cell_rows[usable], cell_cols[usable], cell_costs[usable]
+
+    potential_alloc = np.minimum(supply_left[cell_rows], demand_left[cell_cols])
+    # np.lexsort sorts by its last key first
+    best = np.lexsort((np.arange(len(cell_rows)), cell_costs, -potential_alloc))[0]
+    return int(cell_rows[best]), int(cell_cols[best])
+
+def solve_vam(supply, demand, costs, problem_type="min", trace=None):
     """
     Solves the Transportation Problem using Vogel's Approximation Method (VAM)
     with advanced tie-breaking.
     
     Handles both 'min' and 'max' problem types.
+
+    If 'trace' is a list, one dict per allocation step is appended to it
+    (row/col penalties, chosen cell and quantity).
     """
     
     # We MUST store the original costs to calculate the final
@@ -277,9 +174,22 @@ def solve_vam(supply, demand, costs, problem_type="min"):
 
     # 2. Set up tracking variables
     allocations = [[0] * num_cols for _ in range(num_rows)]
-    available_rows = [True] * num_rows
-    available_cols = [True] * num_cols
-    
+
+    # The VAM logic runs on arrays. Crossed-out cells are set to +inf in
+    # 'work', and each line keeps its two smallest costs, so after an
+    # allocation only the lines that lost one of those are recomputed
+    # instead of re-sorting every line on every step.
+    cost_array = np.array(costs_to_solve)
+    integer_costs = np.issubdtype(cost_array.dtype, np.integer)
+    work = cost_array.astype(float)
+    supply_left = np.array(current_supply, dtype=float)
+    demand_left = np.array(current_demand, dtype=float)
+    available_rows = np.ones(num_rows, dtype=bool)
+    available_cols = np.ones(num_cols, dtype=bool)
+
+    row_argmin, row_min1, row_min2 = _two_smallest(work)
+    col_argmin, col_min1, col_min2 = _two_smallest(work.T)
+
     total_cost = 0 # This will store the final cost/profit
     total_supply_left = sum(current_supply)
 
@@ -287,26 +197,24 @@ def solve_vam(supply, demand, costs, problem_type="min"):
     print("\nStarting VAM iterations...")
     step = 1
     while total_supply_left > 0:
-        
-        # 3a. Calculate penalties (using balanced converted costs)
-        row_pen, col_pen = _calculate_penalties(costs_to_solve, available_rows, available_cols)
-        print("done penalty")
-        
+
+        # 3a. Penalties (using balanced converted costs)
+        row_pen = _line_penalties(row_min1, row_min2)
+        col_pen = _line_penalties(col_min1, col_min2)
+
         # 3b. Find best cell (using balanced converted costs)
-        (r, c), allocation_amount = _find_best_allocation_candidate(
-            costs_to_solve, current_supply, current_demand, 
-            row_pen, col_pen, 
-            available_rows, available_cols
+        cell = _find_best_allocation_candidate(
+            work, supply_left, demand_left,
+            row_pen, col_pen,
+            row_argmin, col_argmin
         )
-        print("done allocation")
-        
-        # 3c. Check if we're done
-        if (r, c) == None:
-            try:
-                r = available_rows.index(True)
-                c = available_cols.index(True)
-            except ValueError:
-                break 
+
+        # 3c. Nothing to choose from: take the first open cell
+        if cell is None:
+            if not available_rows.any() or not available_cols.any():
+                break
+            cell = (int(np.argmax(available_rows)), int(np.argmax(available_cols)))
+        r, c = cell
 
         # 3d. Make allocation
         allocation_amount = min(current_supply[r], current_demand[c])
@@ -315,21 +223,52 @@ def solve_vam(supply, demand, costs, problem_type="min"):
         allocations[r][c] = allocation_amount
         current_supply[r] -= allocation_amount
         current_demand[c] -= allocation_amount
+        supply_left[r] = current_supply[r]
+        demand_left[c] = current_demand[c]
         total_supply_left -= allocation_amount
-        
+
         # --- CRITICAL CHANGE ---
         # We calculate the final sum using the ORIGINAL costs
         # (This calculates cost for minimisation, profit for maximisation)
         total_cost += allocation_amount * original_costs[r][c]
 
-        # 3f. Cross out rows/cols
+        # 3f. Cross out rows/cols. A line only needs new minimums if the
+        # removed cell was one of its two smallest.
+        stale_rows = np.zeros(num_rows, dtype=bool)
+        stale_cols = np.zeros(num_cols, dtype=bool)
         if current_supply[r] == 0:
+            stale_cols |= available_cols & (work[r] <= col_min2)
+            work[r, :] = np.inf
             available_rows[r] = False
+            row_min1[r] = row_min2[r] = np.inf
         if current_demand[c] == 0:
+            stale_rows |= available_rows & (work[:, c] <= row_min2)
+            work[:, c] = np.inf
             available_cols[c] = False
-            
+            col_min1[c] = col_min2[c] = np.inf
+        stale_rows &= available_rows
+        stale_cols &= available_cols
+
+        if stale_rows.any():
+            rows = np.flatnonzero(stale_rows)
+            row_argmin[rows], row_min1[rows], row_min2[rows] = _two_smallest(work[rows])
+        if stale_cols.any():
+            cols = np.flatnonzero(stale_cols)
+            col_argmin[cols], col_min1[cols], col_min2[cols] = _two_smallest(work[:, cols].T)
+
+        if trace is not None:
+            if integer_costs:
+                row_pen, col_pen = row_pen.astype(int), col_pen.astype(int)
+            trace.append({
+                'step': step,
+                'row_penalties': row_pen.tolist(),
+                'col_penalties': col_pen.tolist(),
+                'cell': (r, c),
+                'quantity': allocation_amount
+            })
+
         step += 1
-        
+
     # --- CHANGE THIS RETURN STATEMENT ---
     return allocations, total_cost, original_costs, costs_to_solve, updated_demand, updated_supply
 
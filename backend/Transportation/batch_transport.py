@@ -0,0 +1,294 @@
+import sys
+import time
+import numpy as np
+
+from MODI_solver import STALL_LIMIT
+
+# --- Batch Solver ---
+# Grading runs solve thousands of small problems of the same shape, where
+# solve_vam / solve_MODI spend nearly all their time in Python overhead.
+# Here the problems are stacked into (batch, m, n) arrays and every VAM and
+# MODI step runs on all of them at once:
+#
+# * VAM: penalties, candidate cells and allocations for the whole batch per
+#   step. When a cell uses up its row and its column together only the row
+#   is crossed out (the column stays with 0 demand), so every problem ends
+#   with exactly m + n - 1 basic cells forming a tree - the 0 allocations
+#   are the epsilon cells, no separate degeneracy pass is needed.
+# * MODI: u/v are spread through the tree (u[0] = 0) one level per step, the
+#   loop of the entering cell is what's left of tree + cell after cutting
+#   leaves, and its +/- signs alternate along rows and columns.
+# * Problems that are done (VAM) or optimal (MODI) leave the active set, so
+#   each step only works on the ones still going.
+
+def _balance_batch(supplies, demands, costs, original_costs):
+    """
+    Adds a 0-cost dummy row and column to every problem if any of them is
+    unbalanced (the dummy that isn't needed gets 0 supply/demand). Both
+    cost batches get the same padding.
+    """
+    total_supply, total_demand = supplies.sum(axis=1), demands.sum(axis=1)
+    if np.array_equal(total_supply, total_demand):
+        return supplies, demands, costs, original_costs
+
+    supplies = np.concatenate([supplies, np.maximum(total_demand - total_supply, 0)[:, None]], axis=1)
+    demands = np.concatenate([demands, np.maximum(total_supply - total_demand, 0)[:, None]], axis=1)
+    padding = ((0, 0), (0, 1), (0, 1))
+    return supplies, demands, np.pad(costs, padding), np.pad(original_costs, padding)
+
+def _two_smallest_batch(work):
+    """The two smallest values along the last axis (+inf if missing)."""
+    if work.shape[-1] < 2:
+        return work[..., 0], np.full(work.shape[:-1], np.inf)
+    smallest = np.partition(work, 1, axis=-1)
+    return smallest[..., 0], smallest[..., 1]
+
+def _line_penalties_batch(min1, min2):
+    """Same as VAM_solver._line_penalties, for any shape."""
+    with np.errstate(invalid="ignore"): # inf - inf on crossed-out lines
+        spread = min2 - min1
+    return np.where(np.isfinite(min2), spread,
+                    np.where(np.isfinite(min1), min1, -1.0))
+
+def vam_batch(supplies, demands, costs):
+    """
+    Vogel's Approximation Method on a batch of balanced problems.
+
+    Args:
+        supplies (np.ndarray): (batch, m) supplies.
+        demands (np.ndarray): (batch, n) demands (same totals).
+        costs (np.ndarray): (batch, m, n) minimisation costs.
+
+    Returns:
+        tuple: (allocations, basis) - (batch, m, n) allocations and the
+               boolean mask of the m + n - 1 basic cells of each problem.
+    """
+    batch, num_rows, num_cols = costs.shape
+    allocations = np.zeros(costs.shape, dtype=np.result_type(supplies, demands))
+    basis = np.zeros(costs.shape, dtype=bool)
+    supply_left, demand_left = supplies.copy(), demands.copy()
+    open_rows = np.ones((batch, num_rows), dtype=bool)
+    open_cols = np.ones((batch, num_cols), dtype=bool)
+    cost_values = costs.astype(float)
+
+    active = np.arange(batch)
+    while active.size:
+        k = np.arange(active.size)
+        rows_open, cols_open = open_rows[active], open_cols[active]
+        work = np.where(rows_open[:, :, None] & cols_open[:, None, :], cost_values[active], np.inf)
+
+        # 1. Penalties, and each line's cheapest open cell
+        row_pen = _line_penalties_batch(*_two_smallest_batch(work))
+        col_pen = _line_penalties_batch(*_two_smallest_batch(work.transpose(0, 2, 1)))
+        row_argmin, col_argmin = work.argmin(axis=2), work.argmin(axis=1)
+
+        # 2. Candidates: the max-penalty lines' cheapest cells (rows first),
+        # then solve_vam's tie-breaks: largest allocation, lowest cost, first
+        penalties = np.concatenate([row_pen, col_pen], axis=1)
+        cand_rows = np.concatenate([np.broadcast_to(np.arange(num_rows), row_pen.shape), col_argmin], axis=1)
+        cand_cols = np.concatenate([row_argmin, np.broadcast_to(np.arange(num_cols), col_pen.shape)], axis=1)
+        cand_costs = work[k[:, None], cand_rows, cand_cols]
+        cand_amounts = np.minimum(supply_left[active[:, None], cand_rows], demand_left[active[:, None], cand_cols])
+
+        usable = (penalties == penalties.max(axis=1, keepdims=True)) & np.isfinite(cand_costs)
+        best_amount = np.where(usable, cand_amounts, -1).max(axis=1, keepdims=True)
+        usable &= cand_amounts == best_amount
+        best_cost = np.where(usable, cand_costs, np.inf).min(axis=1, keepdims=True)
+        usable &= cand_costs == best_cost
+        choice = usable.argmax(axis=1)
+        r, c = cand_rows[k, choice], cand_cols[k, choice]
+
+        # 3. Allocate
+        amount = np.minimum(supply_left[active, r], demand_left[active, c])
+        allocations[active, r, c] = amount
+        basis[active, r, c] = True
+        supply_left[active, r] -= amount
+        demand_left[active, c] -= amount
+
+        # 4. Cross out one line (the row when both run out, unless it's
+        # the last open row), which keeps the basis a tree
+        row_done = supply_left[active, r] == 0
+        col_done = demand_left[active, c] == 0
+        close_row = row_done & (~col_done | (rows_open.sum(axis=1) > 1))
+        close_col = col_done & ~close_row
+        open_rows[active[close_row], r[close_row]] = False
+        open_cols[active[close_col], c[close_col]] = False
+
+        still_open = open_rows[active].any(axis=1) & open_cols[active].any(axis=1)
+        active = active[still_open]
+
+    return allocations, basis
+
+def _basis_system(basis):
+    """
+    The (batch, m + n, m + n) matrix of the equations u[i] + v[j] = cost,
+    one row per basic cell (m + n - 1 of them, row by row), and u[0] = 0
+    as the last row. Columns are u[0..m-1] then v[0..n-1]. The basis is a
+    tree, so the matrix is invertible.
+    """
+    batch, num_rows, num_cols = basis.shape
+    size = num_rows + num_cols
+    problem, rows, cols = np.nonzero(basis) # Ordered by problem
+    equation = np.arange(problem.size) % (size - 1)
+
+    system = np.zeros((batch, size, size))
+    system[problem, equation, rows] = 1
+    system[problem, equation, num_rows + cols] = 1
+    system[:, -1, 0] = 1
+    return system, (problem, rows, cols)
+
+def _potentials(costs, system, cells):
+    """u and v of every problem (u[0] = 0), from its basis equations."""
+    batch, num_rows, num_cols = costs.shape
+    rhs = np.zeros((batch, num_rows + num_cols, 1))
+    rhs[:, :-1, 0] = costs[cells].reshape(batch, -1)
+    potentials = np.linalg.solve(system, rhs)[:, :, 0]
+    return potentials[:, :num_rows], potentials[:, num_rows:]
+
+def _loop_signs(system, cells, entering, shape):
+    """
+    +1 / -1 for the cells of each problem's loop through its entering
+    cell ('+' at the entering cell), 0 elsewhere.
+
+    The entering cell's column (a 1 at its row and at its column) is a
+    sum of basic cell columns with weights +1 / -1 along the loop and 0
+    off it; the basic cells that 'make up' the entering cell are exactly
+    the ones that lose when it gains.
+    """
+    batch, num_rows, num_cols = shape
+    k = np.arange(batch)
+    entering_column = np.zeros((batch, num_rows + num_cols, 1))
+    entering_column[k, entering[:, 0], 0] = 1
+    entering_column[k, num_rows + entering[:, 1], 0] = 1
+    weights = np.linalg.solve(system.transpose(0, 2, 1), entering_column)[:, :-1, 0]
+
+    signs = np.zeros(shape, dtype=np.int64)
+    problem, rows, cols = cells
+    signs[problem, rows, cols] = -np.rint(weights).astype(np.int64).ravel()
+    signs[k, entering[:, 0], entering[:, 1]] = 1
+    return signs
+
+def modi_batch(costs, allocations, basis, max_iterations=None):
+    """
+    MODI on a batch of problems, starting from vam_batch's output.
+
+    Args:
+        costs (np.ndarray): (batch, m, n) minimisation costs.
+        allocations (np.ndarray): (batch, m, n) starting allocations.
+        basis (np.ndarray): Boolean (batch, m, n), m + n - 1 tree cells each.
+        max_iterations (int): Optional cap on pivots per problem.
+
+    Returns:
+        tuple: (allocations, basis, iterations) - the optimal allocations,
+               final basis masks and the number of pivots per problem.
+    """
+    allocations, basis = allocations.copy(), basis.copy()
+    batch, num_rows, num_cols = costs.shape
+    cost_values = costs.astype(float)
+    tolerance = 0 if np.issubdtype(costs.dtype, np.integer) else 1e-9
+    iterations = np.zeros(batch, dtype=np.int64)
+    stalled = np.zeros(batch, dtype=np.int64)
+
+    active = np.arange(batch)
+    while active.size:
+        sub_costs, sub_basis = cost_values[active], basis[active]
+
+        # 1. u, v and opportunity costs (u + v - cost) of non-basic cells
+        system, cells = _basis_system(sub_basis)
+        u, v = _potentials(sub_costs, system, cells)
+        if not tolerance:
+            u, v = np.rint(u), np.rint(v) # Exact for integer costs
+        opportunity = np.where(sub_basis, -np.inf, u[:, :, None] + v[:, None, :] - sub_costs)
+        flat = opportunity.reshape(active.size, -1)
+
+        # 2. Optimal problems drop out. The rest take the most positive
+        # cell, or the first positive one (Bland) while stalled.
+        improving = flat > tolerance
+        not_optimal = improving.any(axis=1)
+        if max_iterations is not None:
+            not_optimal &= iterations[active] < max_iterations
+        active, flat, improving = active[not_optimal], flat[not_optimal], improving[not_optimal]
+        if not active.size:
+            break
+        system, cells = _basis_system(basis[active])
+        use_bland = stalled[active] >= STALL_LIMIT
+        entering_flat = np.where(use_bland, improving.argmax(axis=1), flat.argmax(axis=1))
+        entering = np.stack(np.divmod(entering_flat, num_cols), axis=1)
+
+        # 3. Loop, theta and the leaving cell (first zeroed '-' cell)
+        signs = _loop_signs(system, cells, entering, (active.size, num_rows, num_cols))
+        sub_alloc = allocations[active]
+        no_limit = np.iinfo(sub_alloc.dtype).max if sub_alloc.dtype.kind in 'iu' else np.inf
+        minus_values = np.where(signs < 0, sub_alloc, no_limit)
+        theta = minus_values.reshape(active.size, -1).min(axis=1)
+        leaving_flat = (minus_values.reshape(active.size, -1) == theta[:, None]).argmax(axis=1)
+        leaving = np.stack(np.divmod(leaving_flat, num_cols), axis=1)
+
+        allocations[active] = sub_alloc + signs * theta[:, None, None]
+        basis[active, leaving[:, 0], leaving[:, 1]] = False
+        basis[active, entering[:, 0], entering[:, 1]] = True
+        iterations[active] += 1
+        stalled[active] = np.where(theta == 0, stalled[active] + 1, 0)
+
+    return allocations, basis, iterations
+
+def solve_batch(supplies, demands, costs, problem_type="min", max_iterations=None):
+    """
+    Solves many same-shaped Transportation Problems at once (VAM + MODI).
+
+    Args:
+        supplies (array-like): (batch, m) supplies.
+        demands (array-like): (batch, n) demands.
+        costs (array-like): (batch, m, n) costs (profits for 'max').
+        problem_type (str): 'min' or 'max' (for the whole batch).
+        max_iterations (int): Optional cap on MODI pivots per problem.
+
+    Returns:
+        tuple: (allocations, total_costs, iterations). If any problem is
+               unbalanced, every allocation gets a dummy last row and
+               column (the unused one stays 0).
+    """
+    supplies, demands, costs = np.asarray(supplies), np.asarray(demands), np.asarray(costs)
+    if costs.ndim != 3 or supplies.shape != costs.shape[:2] or demands.shape != (costs.shape[0], costs.shape[2]):
+        raise ValueError("Batch shapes must be supplies (batch, m), demands (batch, n) and costs (batch, m, n).")
+
+    original_costs = costs
+    if problem_type == "max":
+        # Same conversion as max_to_min, per problem
+        costs = costs.max(axis=(1, 2), keepdims=True) - costs
+    supplies, demands, costs, original_costs = _balance_batch(supplies, demands, costs, original_costs)
+
+    allocations, basis = vam_batch(supplies, demands, costs)
+    allocations, basis, iterations = modi_batch(costs, allocations, basis, max_iterations)
+    total_costs = (original_costs * allocations).sum(axis=(1, 2))
+    return allocations, total_costs, iterations
+
+if __name__ == "__main__":
+    # python batch_transport.py [batch size] - compares against solve_vam + solve_MODI
+    import io
+    import contextlib
+    from VAM_solver import solve_vam
+    from MODI_solver import solve_MODI
+
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    for num_rows, num_cols in [(3, 4), (4, 5), (6, 8)]:
+        costs = rng.integers(1, 100, size=(batch, num_rows, num_cols))
+        supplies = rng.integers(5, 50, size=(batch, num_rows))
+        demands = rng.integers(5, 50, size=(batch, num_cols))
+
+        started = time.perf_counter()
+        _, batch_costs, _ = solve_batch(supplies, demands, costs)
+        batch_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(batch):
+                (allocation, _, original, to_solve, _, _) = solve_vam(
+                    supplies[i].tolist(), demands[i].tolist(), costs[i].tolist())
+                _, single_cost = solve_MODI(to_solve, original, allocation)
+                assert single_cost == batch_costs[i], f"Problem {i}: {single_cost} != {batch_costs[i]}"
+        single_time = time.perf_counter() - started
+
+        print(f"{num_rows}x{num_cols} x {batch}: batch {batch_time:.3f}s, "
+              f"one at a time {single_time:.3f}s ({single_time / batch_time:.0f}x)")
@@ -0,0 +1,16 @@
+"""
+Benchmarks for the transportation solvers.
+
+    python -m benchmarks                      # quick suite, compared to baseline.json
+    python -m benchmarks --full               # up to 1000 x 1000
+    python -m benchmarks --save               # (re)write the baseline
+    python -m benchmarks.compare_pivot_rules  # MODI pivots and time per pivot rule
+
+Run from backend/Transportation. See generators.py for the instance
+families and suite.py for what is timed.
+"""
+import os
+import sys
+
+# The solvers import each other by module name (see transportation_main.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
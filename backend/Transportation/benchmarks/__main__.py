@@ -0,0 +1,46 @@
+import os
+import sys
+import argparse
+
+from .generators import GENERATORS
+from .suite import (QUICK_SIZES, FULL_SIZES, DEFAULT_THRESHOLD, build_cases, run_suite,
+                    save_baseline, compare_to_baseline)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def main():
+    parser = argparse.ArgumentParser(description='Transportation solver benchmarks')
+    parser.add_argument('--full', action='store_true', help='Include 300x300 and 1000x1000 instances')
+    parser.add_argument('--kinds', nargs='+', choices=list(GENERATORS), help='Instance kinds (default: all)')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (best time is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown factor that counts as a regression')
+    args = parser.parse_args()
+
+    cases = build_cases(FULL_SIZES if args.full else QUICK_SIZES, args.kinds, args.seed)
+    cases = [(name, function) for name, function in cases if args.filter in name]
+    results = run_suite(cases, args.repeat)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} (run with --save to create one)")
+        return
+
+    regressions = compare_to_baseline(results, args.baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) (threshold x{args.threshold}):")
+        for name, before, after, ratio in regressions:
+            print(f"  {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms (x{ratio:.2f})")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline} (threshold x{args.threshold})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import time
+import argparse
+
+from MODI_solver import iter_MODI
+from initial_methods import INITIAL_METHODS, solve_initial
+from pivot_rules import PIVOT_RULES
+
+from .generators import GENERATORS
+from .suite import _quiet
+
+# --- Pivot Rule Comparison ---
+# MODI pivots and wall time for every pivot rule, from the same starting
+# solution, on each instance size. Averaged over a few seeds, since the
+# number of pivots varies a lot from one instance to the next.
+
+SIZES = [(10, 10), (30, 30), (60, 60), (100, 100), (200, 200)]
+KINDS = ['balanced', 'degenerate', 'max_type']
+
+def compare_pivot_rules(num_rows, num_cols, kind="balanced", start="least_cost", seeds=(0, 1, 2), rules=None):
+    """
+    Solves the same instances with every pivot rule.
+
+    Returns:
+        dict: {rule: (average pivots, average MODI seconds)}. Raises
+              ValueError if two rules end at different costs.
+    """
+    totals = {rule: [0, 0.0] for rule in rules or PIVOT_RULES}
+    for seed in seeds:
+        instance = GENERATORS[kind](num_rows, num_cols, seed)
+        (allocations, _, original_costs, costs_to_solve, _, _) = _quiet(
+            solve_initial, instance['supply'], instance['demand'], instance['costMatrix'],
+            instance['problemType'], start)
+
+        objectives = set()
+        for rule, total in totals.items():
+            started = time.perf_counter()
+            for event in iter_MODI(costs_to_solve, original_costs, allocations, pivot_rule=rule):
+                pass
+            total[0] += event['pivots']
+            total[1] += time.perf_counter() - started
+            objectives.add(event['objective'])
+        if len(objectives) != 1:
+            raise ValueError(f"Pivot rules disagree on {kind} {num_rows}x{num_cols} seed {seed}: {objectives}")
+
+    return {rule: (pivots / len(seeds), seconds / len(seeds)) for rule, (pivots, seconds) in totals.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='MODI pivot rule comparison')
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS)
+    parser.add_argument('--start', choices=list(INITIAL_METHODS), default='least_cost',
+                        help='Initial solution MODI starts from')
+    parser.add_argument('--seeds', type=int, default=3, help='Instances per size')
+    parser.add_argument('--max-size', type=int, default=200, help='Largest square size to run')
+    args = parser.parse_args()
+
+    print(f"{'instance':>20} {'rule':>16} {'pivots':>8} {'time (s)':>10}")
+    for kind in args.kinds:
+        for num_rows, num_cols in SIZES:
+            if max(num_rows, num_cols) > args.max_size:
+                continue
+            results = compare_pivot_rules(num_rows, num_cols, kind, args.start, range(args.seeds))
+            fastest = min(results, key=lambda rule: results[rule][1])
+            for rule, (pivots, seconds) in results.items():
+                marker = " *" if rule == fastest else ""
+                print(f"{kind + ' ' + str(num_rows) + 'x' + str(num_cols):>20} {rule:>16} "
+                      f"{pivots:>8.1f} {seconds:>10.4f}{marker}")
+    print("\n* fastest rule for the instance")
+
+if __name__ == '__main__':
+    main()
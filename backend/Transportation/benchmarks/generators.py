@@ -0,0 +1,98 @@
+import numpy as np
+
+# --- Instance Generators ---
+# Every generator is seeded and returns a plain dict in the same shape as a
+# transportation request ('costMatrix' or 'routes', 'supply', 'demand',
+# 'problemType'), so any instance can also be sent through the API as is.
+
+def _random_amounts(rng, count, total):
+    """'count' positive integers adding up to 'total'."""
+    cuts = np.sort(rng.choice(np.arange(1, total), size=count - 1, replace=False))
+    return np.diff(np.concatenate([[0], cuts, [total]])).tolist()
+
+def _costs(rng, num_rows, num_cols):
+    return rng.integers(1, 1000, size=(num_rows, num_cols)).tolist()
+
+def balanced(num_rows, num_cols, seed=0):
+    """Random costs, total supply == total demand."""
+    rng = np.random.default_rng(seed)
+    total = 50 * max(num_rows, num_cols)
+    return {
+        'costMatrix': _costs(rng, num_rows, num_cols),
+        'supply': _random_amounts(rng, num_rows, total),
+        'demand': _random_amounts(rng, num_cols, total),
+        'problemType': 'min'
+    }
+
+def unbalanced(num_rows, num_cols, seed=0):
+    """Supply exceeds demand by about 20%, so a dummy column is added."""
+    rng = np.random.default_rng(seed)
+    total = 50 * max(num_rows, num_cols)
+    return {
+        'costMatrix': _costs(rng, num_rows, num_cols),
+        'supply': _random_amounts(rng, num_rows, total + total // 5),
+        'demand': _random_amounts(rng, num_cols, total),
+        'problemType': 'min'
+    }
+
+def degenerate(num_rows, num_cols, seed=0):
+    """
+    Every supply and demand is 10, 20 or 30, so allocations keep using up
+    a row and a column at the same time and starting solutions get many
+    epsilon cells.
+    """
+    rng = np.random.default_rng(seed)
+    supply = (10 * rng.integers(1, 4, size=num_rows)).tolist()
+    demand = (10 * rng.integers(1, 4, size=num_cols)).tolist()
+    # Balance by adding 10s to random lines of the smaller side
+    short, gap = (supply, sum(demand) - sum(supply)) if sum(supply) < sum(demand) else (demand, sum(supply) - sum(demand))
+    for index in rng.integers(0, len(short), size=gap // 10):
+        short[index] += 10
+    return {
+        'costMatrix': _costs(rng, num_rows, num_cols),
+        'supply': supply,
+        'demand': demand,
+        'problemType': 'min'
+    }
+
+def max_type(num_rows, num_cols, seed=0):
+    """A balanced profit-maximisation instance."""
+    instance = balanced(num_rows, num_cols, seed)
+    instance['problemType'] = 'max'
+    return instance
+
+def sparse(num_rows, num_cols, seed=0, density=0.05):
+    """
+    A balanced instance where only some routes exist: a North-West Corner
+    staircase (so it's always feasible) plus random routes up to 'density'.
+    """
+    instance = balanced(num_rows, num_cols, seed)
+    rng = np.random.default_rng(seed + 1)
+    costs = instance.pop('costMatrix')
+
+    cells = set()
+    supply_left, demand_left = list(instance['supply']), list(instance['demand'])
+    r = c = 0
+    while r < num_rows and c < num_cols:
+        cells.add((r, c))
+        amount = min(supply_left[r], demand_left[c])
+        supply_left[r] -= amount
+        demand_left[c] -= amount
+        if supply_left[r] == 0:
+            r += 1
+        else:
+            c += 1
+    extra = int(density * num_rows * num_cols)
+    for flat_index in rng.choice(num_rows * num_cols, size=extra, replace=False):
+        cells.add(divmod(int(flat_index), num_cols))
+
+    instance['routes'] = [[r, c, costs[r][c]] for r, c in sorted(cells)]
+    return instance
+
+GENERATORS = {
+    'balanced': balanced,
+    'unbalanced': unbalanced,
+    'degenerate': degenerate,
+    'max': max_type,
+    'sparse': sparse,
+}
@@ -0,0 +1,188 @@
+import io
+import json
+import time
+import platform
+import contextlib
+
+from VAM_solver import solve_vam
+from initial_methods import solve_initial
+from pivot_rules import PIVOT_RULES
+from MODI_solver import (solve_MODI, check_degeneracy, u_v_calculation, calculate_opportunity_costs,
+                         check_optimality, find_loop, adjust_allocations)
+from network_simplex import solve_network_simplex
+from sparse_transport import solve_sparse_transportation
+from lp_engine import solve_linprog_transportation
+
+from .generators import GENERATORS
+
+# --- Suite Settings ---
+QUICK_SIZES = [(3, 3), (10, 10), (30, 30), (100, 100)]
+FULL_SIZES = QUICK_SIZES + [(300, 300), (1000, 1000)]
+
+# Largest table (rows * cols) each benchmark runs on. The MODI phase
+# functions do a Python pass over every cell, so the full solves (which
+# price with NumPy) stop at 100x100 mostly because of the VAM start.
+MAX_CELLS = {
+    'vam': None,
+    'modi_phase': 300 * 300,
+    'vam+modi': 100 * 100,
+    'pivot_rules': 100 * 100,
+    'network': None,
+    'linprog': 300 * 300, # HiGHS takes ~30s on 1000x1000
+    'sparse': None,
+}
+
+DEFAULT_THRESHOLD = 1.3 # Slower than baseline * threshold = regression
+NOISE_FLOOR = 0.002 # Seconds; smaller differences are never a regression
+
+def _quiet(function, *args):
+    """Calls function(*args) without the solvers' progress prints."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+def time_call(function, repeat):
+    """Best wall time (seconds) of 'repeat' runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _quiet(function)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def _fits(benchmark, num_rows, num_cols):
+    limit = MAX_CELLS[benchmark]
+    return limit is None or num_rows * num_cols <= limit
+
+# --- Benchmark Cases ---
+
+def _dense_cases(kind, instance, num_rows, num_cols):
+    """(name, callable) pairs for a costMatrix instance."""
+    size = f"{num_rows}x{num_cols}"
+    supply, demand = instance['supply'], instance['demand']
+    costs, problem_type = instance['costMatrix'], instance['problemType']
+    cases = []
+
+    if _fits('vam', num_rows, num_cols):
+        cases.append((f"vam/{kind}/{size}",
+                      lambda: solve_vam(supply, demand, costs, problem_type)))
+
+    if _fits('modi_phase', num_rows, num_cols):
+        # One MODI iteration's phases, on the VAM starting solution
+        (allocations, _, _, costs_to_solve, _, _) = _quiet(solve_vam, supply, demand, costs, problem_type)
+        u, v = u_v_calculation(costs_to_solve, allocations)
+        opportunity = calculate_opportunity_costs(costs_to_solve, allocations, u, v)
+        _, pivot_cell = check_optimality(opportunity)
+        loop = find_loop(allocations, pivot_cell) if pivot_cell else None
+
+        cases += [
+            (f"modi.check_degeneracy/{kind}/{size}",
+             lambda: check_degeneracy(allocations, costs_to_solve)),
+            (f"modi.u_v_calculation/{kind}/{size}",
+             lambda: u_v_calculation(costs_to_solve, allocations)),
+            (f"modi.calculate_opportunity_costs/{kind}/{size}",
+             lambda: calculate_opportunity_costs(costs_to_solve, allocations, list(u), list(v))),
+        ]
+        if loop:
+            cases += [
+                (f"modi.find_loop/{kind}/{size}",
+                 lambda: find_loop(allocations, pivot_cell)),
+                (f"modi.adjust_allocations/{kind}/{size}",
+                 lambda: adjust_allocations(allocations, loop)),
+            ]
+
+    if _fits('vam+modi', num_rows, num_cols):
+        def vam_and_modi():
+            (allocations, _, original_costs, costs_to_solve, _, _) = solve_vam(supply, demand, costs, problem_type)
+            return solve_MODI(costs_to_solve, original_costs, allocations)
+        cases.append((f"solve.vam+modi/{kind}/{size}", vam_and_modi))
+
+    if _fits('pivot_rules', num_rows, num_cols):
+        # MODI alone with each pivot rule, from the same Least Cost start
+        (start, _, original_costs, costs_to_solve, _, _) = _quiet(
+            solve_initial, supply, demand, costs, problem_type, 'least_cost')
+        for rule in PIVOT_RULES:
+            cases.append((f"solve.modi[{rule}]/{kind}/{size}",
+                          lambda rule=rule: solve_MODI(costs_to_solve, original_costs, start, pivot_rule=rule)))
+
+    if _fits('network', num_rows, num_cols):
+        cases.append((f"solve.network/{kind}/{size}",
+                      lambda: solve_network_simplex(supply, demand, costs, problem_type)))
+
+    if _fits('linprog', num_rows, num_cols):
+        cases.append((f"solve.linprog/{kind}/{size}",
+                      lambda: solve_linprog_transportation(supply, demand, costs, problem_type)))
+    return cases
+
+def _sparse_cases(kind, instance, num_rows, num_cols):
+    """(name, callable) pairs for a routes instance."""
+    size = f"{num_rows}x{num_cols}"
+    args = (instance['supply'], instance['demand'], num_rows, num_cols,
+            instance['routes'], instance['problemType'])
+    if not _fits('sparse', num_rows, num_cols):
+        return []
+    return [
+        (f"solve.sparse/{kind}/{size}", lambda: solve_sparse_transportation(*args, "both")),
+        (f"solve.sparse_network/{kind}/{size}", lambda: solve_sparse_transportation(*args, "network")),
+    ]
+
+def build_cases(sizes, kinds=None, seed=0):
+    """Every (name, callable) benchmark for the given sizes and instance kinds."""
+    cases = []
+    for kind in kinds or GENERATORS:
+        for num_rows, num_cols in sizes:
+            instance = GENERATORS[kind](num_rows, num_cols, seed)
+            if 'routes' in instance:
+                cases += _sparse_cases(kind, instance, num_rows, num_cols)
+            else:
+                cases += _dense_cases(kind, instance, num_rows, num_cols)
+    return cases
+
+# --- Running and Baselines ---
+
+def run_suite(cases, repeat=3, budget=2.0):
+    """
+    Times every case. Cases taking over 'budget' seconds run only once.
+
+    Returns:
+        dict: {name: best seconds}
+    """
+    results = {}
+    for name, function in cases:
+        seconds = time_call(function, 1)
+        if seconds < budget and repeat > 1:
+            seconds = min(seconds, time_call(function, repeat - 1))
+        results[name] = seconds
+        print(f"{name:<58} {seconds * 1000:>11.3f} ms")
+    return results
+
+def save_baseline(results, path):
+    """Writes the results (plus where they were measured) as a JSON baseline."""
+    baseline = {
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'results': results
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def compare_to_baseline(results, path, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares results with a saved baseline. Only benchmarks in both count.
+
+    Returns:
+        list[tuple]: (name, baseline seconds, new seconds, ratio) for every
+                     regression - slower than baseline * threshold and by
+                     more than NOISE_FLOOR.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        if seconds > before * threshold and seconds - before > NOISE_FLOOR:
+            regressions.append((name, before, seconds, seconds / before))
+    return regressions
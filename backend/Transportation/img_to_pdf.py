@@ -1,31 +1,109 @@
 from PIL import Image
 import os
+import re
+import queue
+import threading
+
+class StreamingPdfWriter:
+    """
+    Appends frames to a PDF one page at a time on a background thread,
+    so the scene can keep building the next frame while the previous
+    one is being encoded.
+
+    At most 'max_pending' frames are held in memory; add_frame() blocks
+    when the writer falls behind. Pages go to '<output_pdf>.part' and the
+    file is only moved to 'output_pdf' once every page is written, so a
+    failed render never leaves a half-written PDF behind.
+    """
+
+    def __init__(self, output_pdf, max_pending=4, resolution=100.0):
+        self.output_pdf = output_pdf
+        self.part_path = output_pdf + ".part"
+        self.resolution = resolution
+        self.page_count = 0
+        self._frames = queue.Queue(maxsize=max_pending)
+        self._error = None
+
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+        self._thread = threading.Thread(target=self._write_pages, daemon=True)
+        self._thread.start()
+
+    def add_frame(self, image):
+        """Queues a PIL image as the next page."""
+        if self._error is not None:
+            raise self._error
+        self._frames.put(image)
+
+    def _write_pages(self):
+        while True:
+            image = self._frames.get()
+            if image is None: # Sentinel from close()
+                break
+            if self._error is not None:
+                continue # Keep draining so add_frame() never blocks forever
+            try:
+                image.convert('RGB').save(
+                    self.part_path,
+                    "PDF",
+                    append=self.page_count > 0,
+                    resolution=self.resolution
+                )
+                self.page_count += 1
+            except Exception as e:
+                self._error = e
+
+    def close(self):
+        """Flushes the remaining pages and moves the PDF into place."""
+        self._frames.put(None)
+        self._thread.join()
+
+        if self._error is not None:
+            self.discard()
+            raise self._error
+        if self.page_count == 0:
+            self.discard()
+            raise Exception("No pages were written to the PDF.")
+
+        os.replace(self.part_path, self.output_pdf)
+        print(f"PDF created: {self.output_pdf} ({self.page_count} pages)")
+
+    def discard(self):
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Stop the writer thread, then drop the partial file
+            self._frames.put(None)
+            self._thread.join()
+            self.discard()
+        return False
 
 def create_pdf_from_sections(sections_folder, output_pdf):
-    # Get all PNG files
-    png_files = sorted([f for f in os.listdir(sections_folder) if f.endswith('.png')])
-    
+    # Get all PNG files, in frame order (img2 before img10)
+    png_files = [f for f in os.listdir(sections_folder) if f.endswith('.png')]
+    png_files.sort(key=lambda x: int(re.findall(r'\d+', x)[0]))
+
     if not png_files:
         print("No PNG files found!")
         return
-    
-    # Open images
-    images = []
-    for png_file in png_files:
-        img_path = os.path.join(sections_folder, png_file)
-        img = Image.open(img_path).convert('RGB')
-        images.append(img)
-    
-    # Save as PDF
-    if images:
-        images[0].save(
-            output_pdf,
-            save_all=True,
-            append_images=images[1:],
-            resolution=100.0
-        )
-        print(f"PDF created: {output_pdf}")
-
-sections_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
-output_pdf = "MODI_Steps.pdf"
-create_pdf_from_sections(sections_folder, output_pdf)
\ No newline at end of file
+
+    # Stream the images into the PDF, one page at a time
+    with StreamingPdfWriter(output_pdf) as pdf:
+        for png_file in png_files:
+            img_path = os.path.join(sections_folder, png_file)
+            img = Image.open(img_path)
+            img.load() # Reads the pixels and releases the file handle
+            pdf.add_frame(img)
+
+if __name__ == "__main__":
+    sections_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+    output_pdf = "MODI_Steps.pdf"
+    create_pdf_from_sections(sections_folder, output_pdf)
@@ -0,0 +1,169 @@
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+
+from VAM_solver import max_to_min, balance_problem
+from MODI_solver import (BasisTree, calculate_opportunity_costs, check_optimality,
+                         calculate_final_cost, _epsilon_cells)
+
+# --- LP Engine (HiGHS) ---
+# For very large problems the LP goes to HiGHS through scipy's linprog
+# (dual simplex, so the answer is a vertex). HiGHS gives back the flows and
+# the row/column duals but not its basis, so the MODI view is rebuilt:
+#
+# * The basis is the used cells plus zero cells whose reduced cost
+#   (cost - dual_row - dual_col) is 0, added cheapest first while they
+#   don't close a loop, up to m + n - 1 cells (the zero ones are epsilons).
+#   If those don't reach every row/column, the duals of the unconnected
+#   part are shifted (staying dual feasible) until a joining cell is tight.
+# * u/v then come from that basis tree with u_A = 0, exactly as in
+#   solve_MODI (the HiGHS duals are the same up to a constant shift).
+
+LP_METHOD = "highs-ds" # Dual simplex: always a basic (vertex) solution
+REDUCED_COST_TOLERANCE = 1e-7
+FLOW_TOLERANCE = 1e-9 # Smaller LP flows are solver noise, i.e. 0
+
+def _transport_constraints(num_rows, num_cols):
+    """Sparse A_eq: one row per supply, one per demand, over the m*n cells."""
+    cells = np.arange(num_rows * num_cols)
+    rows = np.concatenate([cells // num_cols, num_rows + cells % num_cols])
+    return csr_matrix((np.ones(2 * cells.size), (rows, np.concatenate([cells, cells]))),
+                      shape=(num_rows + num_cols, num_rows * num_cols))
+
+def _recover_basis(costs, flows, row_duals, col_duals):
+    """
+    Rebuilds a spanning-tree basis (m + n - 1 cells) for an optimal vertex.
+
+    Returns:
+        set: The (r, c) basic cells.
+    """
+    num_rows, num_cols = costs.shape
+    reduced = costs - row_duals[:, None] - col_duals[None, :]
+    tolerance = REDUCED_COST_TOLERANCE * max(1.0, float(np.abs(costs).max()))
+
+    # Used cells first, then tight zero cells (cheapest first)
+    used = flows.ravel() > FLOW_TOLERANCE
+    tight = np.flatnonzero((np.abs(reduced.ravel()) <= tolerance) & ~used)
+    used = np.flatnonzero(used)
+    tight = tight[np.argsort(costs.ravel()[tight], kind='stable')]
+
+    group = list(range(num_rows + num_cols))
+    def find_group(node):
+        while group[node] != node:
+            group[node] = group[group[node]]
+            node = group[node]
+        return node
+
+    basis = set()
+    for flat_index in np.concatenate([used, tight]):
+        r, c = divmod(int(flat_index), num_cols)
+        row_group, col_group = find_group(r), find_group(num_rows + c)
+        if row_group != col_group:
+            group[row_group] = col_group
+            basis.add((r, c))
+            if len(basis) == num_rows + num_cols - 1:
+                break
+
+    # Parts still not joined (e.g. a row with 0 supply, whose dual HiGHS
+    # leaves slack): shift the duals of row A's part until a cell to the
+    # rest becomes tight. Its own cells stay tight, the rest stay >= 0.
+    while len(basis) < num_rows + num_cols - 1:
+        root = find_group(0)
+        in_part = np.array([find_group(node) == root for node in range(num_rows + num_cols)])
+        rows_in, cols_in = in_part[:num_rows], in_part[num_rows:]
+        outward = np.where(rows_in[:, None] & ~cols_in[None, :], reduced, np.inf)
+        inward = np.where(~rows_in[:, None] & cols_in[None, :], reduced, np.inf)
+        if outward.min() <= inward.min():
+            r, c = np.unravel_index(int(np.argmin(outward)), reduced.shape)
+            shift = outward[r, c]
+        else:
+            r, c = np.unravel_index(int(np.argmin(inward)), reduced.shape)
+            shift = -inward[r, c]
+        reduced[rows_in, :] -= shift
+        reduced[:, cols_in] += shift
+
+        r, c = int(r), int(c)
+        group[find_group(r)] = find_group(num_rows + c)
+        basis.add((r, c))
+    return basis
+
+def solve_MODI_linprog(costs_for_modi, original_costs, supply, demand, trace=None, basis=None):
+    """
+    Solves a balanced problem with HiGHS and returns it the way solve_MODI
+    does, so the result can be shown as a final MODI table.
+
+    Args:
+        costs_for_modi (list[list]): Balanced minimization matrix.
+        original_costs (list[list]): Balanced original costs (final sum).
+        supply, demand (list): Balanced supplies and demands.
+        trace (list): Optional. Gets one solve_MODI-style entry for the
+                      optimal table (allocations, epsilon cells, u, v,
+                      u/v steps and opportunity costs).
+        basis (set): Optional. Filled in place with the m + n - 1 basic cells.
+
+    Returns:
+        tuple: (allocations, total_cost)
+    """
+    cost_array = np.asarray(costs_for_modi, dtype=float)
+    num_rows, num_cols = cost_array.shape
+    result = linprog(cost_array.ravel(),
+                     A_eq=_transport_constraints(num_rows, num_cols),
+                     b_eq=np.concatenate([supply, demand]).astype(float),
+                     bounds=(0, None), method=LP_METHOD)
+    if result.status != 0:
+        raise ValueError(f"Linear program failed: {result.message}")
+
+    flows = result.x.reshape(num_rows, num_cols)
+    duals = result.eqlin.marginals
+    found_basis = _recover_basis(cost_array, flows, duals[:num_rows], duals[num_rows:])
+    if basis is not None:
+        basis.clear()
+        basis.update(found_basis)
+
+    # Integer data has an integer optimal vertex; drop the float noise
+    integral = all(float(x).is_integer() for x in list(supply) + list(demand))
+    if integral:
+        flows = np.rint(flows).astype(int)
+    allocations = [[flows[r, c].item() if (r, c) in found_basis else 0 for c in range(num_cols)]
+                   for r in range(num_rows)]
+
+    if trace is not None:
+        tree = BasisTree(costs_for_modi, sorted(found_basis))
+        u, v = tree.u, tree.v
+        opportunity_costs = calculate_opportunity_costs(costs_for_modi, allocations, u, v, found_basis)
+        is_optimal, pivot_cell = check_optimality(opportunity_costs)
+        trace.append({
+            'iteration': 1,
+            'is_degenerate': False,
+            'added_epsilon_cells': [],
+            'allocations': [row[:] for row in allocations],
+            'epsilon_cells': _epsilon_cells(allocations, found_basis),
+            'u': list(u),
+            'v': list(v),
+            'uv_steps': tree.steps(),
+            'opportunity_costs': opportunity_costs,
+            'is_optimal': is_optimal,
+            'pivot': pivot_cell
+        })
+
+    return allocations, calculate_final_cost(original_costs, allocations)
+
+def solve_linprog_transportation(supply, demand, costs, problem_type="min", trace=None, basis=None):
+    """
+    Solves the Transportation Problem with HiGHS. Takes the same input as
+    solve_vam and gives the same (allocation, total_cost) as solve_MODI,
+    including any dummy row/col. 'trace' and 'basis' are as in
+    solve_MODI_linprog.
+
+    Returns:
+        tuple: (allocations, total_cost)
+    """
+    original_costs = [list(row) for row in costs]
+    converted_costs = max_to_min(original_costs) if problem_type == "max" else original_costs
+
+    balanced_supply, balanced_demand, costs_to_solve, _ = balance_problem(supply, demand, converted_costs)
+    # Same dummy row/col on the original costs, for the final sum
+    _, _, original_costs, _ = balance_problem(supply, demand, original_costs)
+
+    return solve_MODI_linprog(costs_to_solve, original_costs, balanced_supply, balanced_demand,
+                              trace=trace, basis=basis)
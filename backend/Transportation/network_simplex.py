@@ -0,0 +1,253 @@
+import math
+import numpy as np
+
+from VAM_solver import max_to_min, balance_problem
+
+# --- Network Simplex Engine ---
+# solve_MODI rebuilds the whole opportunity-cost matrix in Python on every
+# iteration, which is fine for classroom problems but slow for 300x300
+# supply chains. This solves the same (balanced) problem as a min-cost flow:
+#
+# * Nodes 0..m-1 are the sources, m..m+n-1 the destinations, and one extra
+#   root node holds the starting tree together through artificial arcs
+#   (cost big-M), so no VAM start or epsilon cells are needed.
+# * Arc data (source, target, cost, flow) lives in flat arrays, and reduced
+#   costs are priced one block of arcs at a time with NumPy (block search).
+# * The leaving arc is the last blocking arc on the cycle, which keeps the
+#   tree "strongly feasible" so degenerate pivots can't cycle.
+
+BLOCK_SIZE_FACTOR = 1.0 # Block size = factor * sqrt(number of arcs)
+MIN_BLOCK_SIZE = 10
+
+class NetworkSimplex:
+    """
+    Network simplex for a balanced transportation problem.
+
+    Tree arrays (one entry per node): parent, pred (the tree arc to the
+    parent), pred_up (True if that arc points from the node to its parent),
+    depth, children, and the node potentials 'pi'. An arc's reduced cost
+    is cost + pi[source] - pi[target], which is 0 for every tree arc.
+    """
+
+    def __init__(self, num_rows, num_cols, arc_rows, arc_cols, arc_costs, supply, demand):
+        """
+        Args:
+            num_rows (int): Number of sources (m).
+            num_cols (int): Number of destinations (n).
+            arc_rows, arc_cols, arc_costs (array-like): One entry per
+                allowed route (row, col, cost). See from_dense().
+            supply (list[int]): Supply of each row.
+            demand (list[int]): Demand of each column (same total).
+        """
+        arc_costs = np.asarray(arc_costs)
+        self.num_rows, self.num_cols = num_rows, num_cols
+        m, n = num_rows, num_cols
+        self.root = m + n
+        num_nodes = m + n + 1
+
+        # Exact integer arithmetic when the data is integral
+        integral = all(np.issubdtype(np.asarray(x).dtype, np.integer)
+                       for x in (arc_costs, supply, demand))
+        dtype = np.int64 if integral else float
+        self.tolerance = 0 if integral else 1e-9
+
+        # --- Arcs: the real ones, then one artificial per node ---
+        self.num_real_arcs = len(arc_costs)
+        big_m = (int(np.abs(arc_costs).max()) + 1) * num_nodes if len(arc_costs) else 1
+        art_source = np.empty(m + n, dtype=np.int64)
+        art_target = np.empty(m + n, dtype=np.int64)
+
+        self.parent = [self.root] * num_nodes
+        self.parent[self.root] = None
+        self.pred = [None] * num_nodes
+        self.pred_up = [False] * num_nodes
+        self.depth = [1] * num_nodes
+        self.depth[self.root] = 0
+        self.children = [[] for _ in range(num_nodes)]
+        self.children[self.root] = list(range(m + n))
+        self.pi = np.zeros(num_nodes, dtype=dtype)
+        art_flow = []
+
+        for node in range(m + n):
+            arc = self.num_real_arcs + node
+            self.pred[node] = arc
+            amount = supply[node] if node < m else demand[node - m]
+            if node < m and amount > 0:
+                # Source -> root carries the source's supply
+                art_source[node], art_target[node] = node, self.root
+                self.pred_up[node] = True
+                self.pi[node] = -big_m
+            else:
+                # Root -> destination carries its demand. Zero-supply
+                # sources also hang below the root so zero-flow tree arcs
+                # always point away from it (strong feasibility).
+                art_source[node], art_target[node] = self.root, node
+                self.pi[node] = big_m
+            art_flow.append(amount)
+
+        self.source = np.concatenate([np.asarray(arc_rows, dtype=np.int64), art_source])
+        self.target = np.concatenate([m + np.asarray(arc_cols, dtype=np.int64), art_target])
+        self.cost = np.concatenate([arc_costs.astype(dtype), np.full(m + n, big_m, dtype=dtype)])
+        self.flow = [0] * self.num_real_arcs + art_flow
+
+        self.block_size = max(int(BLOCK_SIZE_FACTOR * math.sqrt(self.num_real_arcs)), MIN_BLOCK_SIZE)
+        self.next_arc = 0
+        self.pivots = 0
+
+    @classmethod
+    def from_dense(cls, costs, supply, demand):
+        """Every cell of the m x n cost matrix is a route (row-major arcs)."""
+        cost_matrix = np.asarray(costs)
+        m, n = cost_matrix.shape
+        return cls(m, n, np.repeat(np.arange(m), n), np.tile(np.arange(n), m),
+                   cost_matrix.ravel(), supply, demand)
+
+    # --- Pricing ---
+
+    def find_entering_arc(self):
+        """
+        Block search: prices the real arcs one block at a time, starting
+        where the last search stopped, and returns the most negative
+        reduced cost arc of the first block that has one (None = optimal).
+        """
+        num_arcs = self.num_real_arcs
+        start, scanned = self.next_arc, 0
+        while scanned < num_arcs:
+            stop = min(start + self.block_size, num_arcs)
+            reduced = (self.cost[start:stop]
+                       + self.pi[self.source[start:stop]]
+                       - self.pi[self.target[start:stop]])
+            best = int(np.argmin(reduced))
+            scanned += stop - start
+            if reduced[best] < -self.tolerance:
+                self.next_arc = stop % num_arcs
+                return start + best
+            start = stop % num_arcs
+        return None
+
+    # --- Pivoting ---
+
+    def _join(self, node_a, node_b):
+        """The deepest common ancestor of two nodes."""
+        while node_a != node_b:
+            if self.depth[node_a] >= self.depth[node_b]:
+                node_a = self.parent[node_a]
+            else:
+                node_b = self.parent[node_b]
+        return node_a
+
+    def pivot(self, in_arc):
+        """Sends flow around the cycle of 'in_arc' and updates the tree."""
+        first, second = int(self.source[in_arc]), int(self.target[in_arc])
+        join = self._join(first, second)
+
+        # Leaving arc: the last blocking arc going around the cycle from
+        # the join (strict < on the first side, <= on the second).
+        # Uncapacitated, so only arcs whose flow goes down can block.
+        delta, u_out, out_side = math.inf, None, None
+        node = first
+        while node != join:
+            if self.pred_up[node] and self.flow[self.pred[node]] < delta:
+                delta, u_out, out_side = self.flow[self.pred[node]], node, 1
+            node = self.parent[node]
+        node = second
+        while node != join:
+            if not self.pred_up[node] and self.flow[self.pred[node]] <= delta:
+                delta, u_out, out_side = self.flow[self.pred[node]], node, 2
+            node = self.parent[node]
+
+        # Send 'delta' around the cycle
+        if delta:
+            self.flow[in_arc] += delta
+            node = first
+            while node != join:
+                self.flow[self.pred[node]] += -delta if self.pred_up[node] else delta
+                node = self.parent[node]
+            node = second
+            while node != join:
+                self.flow[self.pred[node]] += delta if self.pred_up[node] else -delta
+                node = self.parent[node]
+
+        # The end of 'in_arc' below the leaving arc is re-hung on the other end
+        u_in, v_in = (first, second) if out_side == 1 else (second, first)
+        self._update_tree(in_arc, u_in, v_in, u_out)
+        self.pivots += 1
+
+    def _update_tree(self, in_arc, u_in, v_in, u_out):
+        """
+        Cuts the subtree below u_out's parent arc and hangs it from v_in
+        through 'in_arc' (the parent links on u_in -> u_out are reversed).
+        Only that subtree gets new depths and potentials.
+        """
+        node, new_parent, new_arc = u_in, v_in, in_arc
+        while True:
+            old_parent, old_arc = self.parent[node], self.pred[node]
+            self.children[old_parent].remove(node)
+            self.parent[node], self.pred[node] = new_parent, new_arc
+            self.pred_up[node] = int(self.source[new_arc]) == node
+            self.children[new_parent].append(node)
+            if node == u_out:
+                break
+            node, new_parent, new_arc = old_parent, node, old_arc
+
+        # in_arc's reduced cost must become 0: shift the whole subtree
+        reduced = self.cost[in_arc] + self.pi[self.source[in_arc]] - self.pi[self.target[in_arc]]
+        shift = -reduced if u_in == int(self.source[in_arc]) else reduced
+        subtree = [u_in]
+        for node in subtree:
+            self.depth[node] = self.depth[self.parent[node]] + 1
+            subtree.extend(self.children[node])
+        self.pi[subtree] += shift
+
+    def run(self):
+        """Pivots until no arc has a negative reduced cost."""
+        while True:
+            in_arc = self.find_entering_arc()
+            if in_arc is None:
+                break
+            self.pivot(in_arc)
+
+        if any(self.flow[self.num_real_arcs:]):
+            raise ValueError("Transportation problem is infeasible: the allowed routes can't carry all the supply.")
+
+    def arc_flows(self):
+        """The flow on each real arc, in the order they were given."""
+        return self.flow[:self.num_real_arcs]
+
+    def allocations(self):
+        """The real arcs' flows as an m x n matrix (Python numbers)."""
+        allocations = [[0] * self.num_cols for _ in range(self.num_rows)]
+        for arc, amount in enumerate(self.arc_flows()):
+            allocations[int(self.source[arc])][int(self.target[arc]) - self.num_rows] = amount
+        return allocations
+
+def solve_network_simplex(supply, demand, costs, problem_type="min"):
+    """
+    Solves the Transportation Problem with the network simplex engine.
+    Takes the same input as solve_vam and gives the same
+    (allocation, total_cost) as solve_MODI, including any dummy row/col.
+
+    Args:
+        supply (list): Supply of each source.
+        demand (list): Demand of each destination.
+        costs (list[list]): Cost (or profit, for 'max') matrix.
+        problem_type (str): 'min' or 'max'.
+
+    Returns:
+        tuple: (allocations, total_cost)
+    """
+    original_costs = [list(row) for row in costs]
+    converted_costs = max_to_min(original_costs) if problem_type == "max" else original_costs
+
+    balanced_supply, balanced_demand, costs_to_solve, _ = balance_problem(supply, demand, converted_costs)
+    # Same dummy row/col on the original costs, for the final sum
+    _, _, original_costs, _ = balance_problem(supply, demand, original_costs)
+
+    engine = NetworkSimplex.from_dense(costs_to_solve, balanced_supply, balanced_demand)
+    engine.run()
+
+    allocations = engine.allocations()
+    total_cost = sum(original_costs[r][c] * allocations[r][c]
+                     for r in range(len(allocations))
+                     for c in range(len(allocations[0])))
+    return allocations, total_cost
@@ -0,0 +1,232 @@
+import math
+import numpy as np
+
+# --- Pivot Rules for MODI ---
+# A pivot rule picks the entering cell from the reduced costs
+# u[r] + v[c] - C[r][c] of the non-basic cells (the opportunity costs).
+# MODI is optimal once no cell has a positive one, so every rule has to look
+# at the whole table before it can say so, but in between they differ in how
+# much they price per pivot and how good a cell they find:
+#
+# * dantzig:         Prices every cell, takes the most positive (the
+#                    textbook rule and the default; O(mn) per pivot).
+# * first_improving: Walks the cells from where the last search stopped and
+#                    takes the first positive one.
+# * block_search:    Walks the cells in blocks of ~sqrt(mn) from where the
+#                    last search stopped and takes the most positive cell of
+#                    the first block that has one (as in network_simplex.py).
+# * candidate_list:  A major search collects up to CANDIDATE_LIST_SIZE
+#                    positive cells (again from a rotating start); the next
+#                    few pivots only re-price that list.
+# * steepest_edge:   Prices every cell and takes the most positive one per
+#                    unit of change: opportunity cost / sqrt(loop length),
+#                    the loop being every cell the pivot would move.
+#
+# Cells are numbered row by row (flat index r * num_cols + c), and the u/v
+# values are BasisTree.potential, so a rule only needs the tree and a
+# boolean mask of the basic cells. Ties always go to the first cell in scan
+# order, so 'dantzig' picks exactly the cell check_optimality() would.
+#
+# With NumPy pricing a full pass is cheap next to the Python work of a pivot
+# (loop, tree update), so fewer pivots wins. In benchmarks/
+# compare_pivot_rules.py (Least Cost start, random costs) Dantzig is fastest
+# up to about 100x100; steepest edge needs the fewest pivots (about 70% of
+# Dantzig's at 100x100) and ties or wins from about 200x200. The partial
+# rules need 1.5-5x Dantzig's pivots, which costs more than they save on
+# pricing at these sizes.
+
+BLOCK_SIZE_FACTOR = 1.0 # Block size = factor * sqrt(number of cells)
+MIN_BLOCK_SIZE = 10
+CANDIDATE_LIST_SIZE = 50 # Most cells a major search collects
+CANDIDATE_MINOR_LIMIT = 10 # Pivots from one list before a new major search
+
+class PivotRule:
+    """
+    Base class: holds the costs as flat arrays and prices any subset of
+    cells. Subclasses implement entering_cell().
+    """
+
+    def __init__(self, costs):
+        """
+        Args:
+            costs (list[list]): The minimization cost matrix MODI works on.
+        """
+        self.costs = np.asarray(costs)
+        self.num_rows, self.num_cols = self.costs.shape
+        self.num_cells = self.num_rows * self.num_cols
+        self.flat_costs = self.costs.ravel()
+        self.block_size = max(int(BLOCK_SIZE_FACTOR * math.sqrt(self.num_cells)), MIN_BLOCK_SIZE)
+        self.position = 0 # Where the next rotating search starts
+
+    def _cell(self, flat_index):
+        r, c = divmod(int(flat_index), self.num_cols)
+        return (r, c)
+
+    def _reduced_costs(self, tree, in_basis, cells=None):
+        """
+        u + v - C for the given flat cell indices (all cells if None),
+        with -inf for basic cells so they are never picked.
+        """
+        potential = np.asarray(tree.potential)
+        u, v = potential[:self.num_rows], potential[self.num_rows:]
+        if cells is None:
+            reduced = (u[:, None] + v[None, :] - self.costs).ravel()
+            return np.where(in_basis.ravel(), -np.inf, reduced)
+        rows, cols = np.divmod(cells, self.num_cols)
+        reduced = u[rows] + v[cols] - self.flat_costs[cells]
+        return np.where(in_basis.ravel()[cells], -np.inf, reduced)
+
+    def _rotating_blocks(self):
+        """Flat index arrays of block_size cells covering the table once, from self.position."""
+        for start in range(0, self.num_cells, self.block_size):
+            yield (self.position + np.arange(start, min(start + self.block_size, self.num_cells))) % self.num_cells
+
+    def bland_cell(self, tree, in_basis):
+        """Bland's rule (the anti-cycling fallback): the first positive cell, row by row."""
+        positive = np.flatnonzero(self._reduced_costs(tree, in_basis) > 0)
+        return self._cell(positive[0]) if positive.size else None
+
+    def entering_cell(self, tree, in_basis):
+        """
+        Args:
+            tree (BasisTree): The current basis, with its u/v values.
+            in_basis (np.ndarray): m x n boolean mask of the basic cells.
+
+        Returns:
+            tuple: The (r, c) entering cell, or None if no cell has a
+                   positive opportunity cost (the solution is optimal).
+        """
+        raise NotImplementedError
+
+class DantzigRule(PivotRule):
+    """Most positive opportunity cost over the whole table."""
+
+    def entering_cell(self, tree, in_basis):
+        reduced = self._reduced_costs(tree, in_basis)
+        best = int(np.argmax(reduced))
+        return self._cell(best) if reduced[best] > 0 else None
+
+class FirstImprovingRule(PivotRule):
+    """First positive opportunity cost after the previous entering cell."""
+
+    def entering_cell(self, tree, in_basis):
+        for cells in self._rotating_blocks():
+            positive = np.flatnonzero(self._reduced_costs(tree, in_basis, cells) > 0)
+            if positive.size:
+                chosen = int(cells[positive[0]])
+                self.position = (chosen + 1) % self.num_cells
+                return self._cell(chosen)
+        return None
+
+class BlockSearchRule(PivotRule):
+    """Most positive opportunity cost of the first block that has one."""
+
+    def entering_cell(self, tree, in_basis):
+        for cells in self._rotating_blocks():
+            reduced = self._reduced_costs(tree, in_basis, cells)
+            best = int(np.argmax(reduced))
+            if reduced[best] > 0:
+                self.position = (int(cells[-1]) + 1) % self.num_cells
+                return self._cell(cells[best])
+        return None
+
+class CandidateListRule(PivotRule):
+    """
+    Multiple pricing: a major search fills a candidate list, the minor
+    iterations after it pick the best cell still positive in the list.
+    """
+
+    def __init__(self, costs):
+        super().__init__(costs)
+        self.candidates = np.empty(0, dtype=int)
+        self.minor_iterations = 0
+
+    def _major_search(self, tree, in_basis):
+        """Collects up to CANDIDATE_LIST_SIZE positive cells, block by block."""
+        found = []
+        count = 0
+        for cells in self._rotating_blocks():
+            positive = cells[self._reduced_costs(tree, in_basis, cells) > 0]
+            found.append(positive)
+            count += positive.size
+            if count >= CANDIDATE_LIST_SIZE:
+                self.position = (int(cells[-1]) + 1) % self.num_cells
+                break
+        self.candidates = np.concatenate(found)[:CANDIDATE_LIST_SIZE] if found else np.empty(0, dtype=int)
+        self.minor_iterations = 0
+
+    def entering_cell(self, tree, in_basis):
+        if self.minor_iterations < CANDIDATE_MINOR_LIMIT and self.candidates.size:
+            reduced = self._reduced_costs(tree, in_basis, self.candidates)
+            keep = reduced > 0
+            self.candidates, reduced = self.candidates[keep], reduced[keep]
+            if self.candidates.size:
+                self.minor_iterations += 1
+                return self._cell(self.candidates[int(np.argmax(reduced))])
+
+        self._major_search(tree, in_basis)
+        if not self.candidates.size:
+            return None # A full pass found nothing positive
+        reduced = self._reduced_costs(tree, in_basis, self.candidates)
+        self.minor_iterations = 1
+        return self._cell(self.candidates[int(np.argmax(reduced))])
+
+class SteepestEdgeRule(PivotRule):
+    """
+    Most positive opportunity cost / sqrt(loop length). A pivot moves every
+    loop cell by theta, so that's the cost change per unit of movement.
+    """
+
+    def _loop_lengths(self, tree, cells):
+        """Loop length (pivot + tree path row -> column) for each flat cell index."""
+        depth = np.asarray(tree.depth)
+        parent = np.array([node if p is None else p for node, p in enumerate(tree.parent)])
+
+        # Binary lifting: ancestors[k][node] is node's 2^k-th ancestor
+        ancestors = [parent]
+        for _ in range(max(int(depth.max()), 1).bit_length()):
+            ancestors.append(ancestors[-1][ancestors[-1]])
+
+        rows, cols = np.divmod(cells, self.num_cols)
+        deep, shallow = rows, cols + self.num_rows
+        swap = depth[deep] < depth[shallow]
+        deep, shallow = np.where(swap, shallow, deep), np.where(swap, deep, shallow)
+        start_depth = depth[deep] + depth[shallow]
+
+        # Lift the deeper end to the other's depth, then both to just below
+        # their lowest common ancestor
+        gap = depth[deep] - depth[shallow]
+        for k, ancestor in enumerate(ancestors):
+            deep = np.where((gap >> k) & 1, ancestor[deep], deep)
+        for ancestor in reversed(ancestors):
+            differ = ancestor[deep] != ancestor[shallow]
+            deep, shallow = np.where(differ, ancestor[deep], deep), np.where(differ, ancestor[shallow], shallow)
+        common = np.where(deep == shallow, deep, parent[deep])
+        return start_depth - 2 * depth[common] + 1
+
+    def entering_cell(self, tree, in_basis):
+        reduced = self._reduced_costs(tree, in_basis)
+        positive = np.flatnonzero(reduced > 0)
+        if not positive.size:
+            return None
+        scores = reduced[positive] / np.sqrt(self._loop_lengths(tree, positive))
+        return self._cell(positive[int(np.argmax(scores))])
+
+PIVOT_RULES = {
+    'dantzig': DantzigRule,
+    'first_improving': FirstImprovingRule,
+    'block_search': BlockSearchRule,
+    'candidate_list': CandidateListRule,
+    'steepest_edge': SteepestEdgeRule,
+}
+
+def make_pivot_rule(name, costs):
+    """
+    Creates the PIVOT_RULES entry 'name' for a cost matrix.
+
+    Returns:
+        PivotRule: A fresh rule (rules keep state between pivots).
+    """
+    if name not in PIVOT_RULES:
+        raise ValueError(f"Unknown pivot rule '{name}'. Choose one of: {', '.join(PIVOT_RULES)}")
+    return PIVOT_RULES[name](costs)
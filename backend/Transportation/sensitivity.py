@@ -0,0 +1,194 @@
+import numpy as np
+
+from VAM_solver import max_to_min, balance_problem
+from MODI_solver import BasisTree
+
+# --- Post-Optimal Sensitivity Analysis ---
+# Everything here is read off the final basis tree and its u/v values, so
+# "what if" questions about one cost or one pair of supply/demand amounts
+# need no re-solve. With d[i][j] = C[i][j] - u[i] - v[j] (>= 0 at the
+# optimum, 0 on the basis):
+#
+# * Non-basic cell: its cost can rise freely and drop by d[i][j] before the
+#   cell is worth using.
+# * Basic cell (r, c): taking it out of the tree splits it in two parts, A
+#   holding row r and B holding column c. Changing C[r][c] by delta shifts
+#   every u/v in B, which lowers d by delta on (A row, B column) cells and
+#   raises it on (B row, A column) cells. So delta can go up to the smallest
+#   d of the first kind and down to minus the smallest d of the second.
+# * Supply i and demand j raised together by delta ship delta more along the
+#   tree path from row i to column j: +delta on the path's row->column
+#   cells, -delta on its column->row cells. The basis stays feasible while
+#   no cell goes negative, and the cost changes by (u[i] + v[j]) * delta.
+#   With a dummy column (supply > demand), the pairs with it are the ranges
+#   of supply i alone; with a dummy row, of demand j alone.
+#
+# All ranges keep the current basis optimal. On a degenerate basis (epsilon
+# cells) the allocation may stay optimal a bit beyond them.
+
+REDUCED_COST_TOLERANCE = 1e-9
+
+def _subtree_intervals(tree):
+    """
+    Pre-order positions: node x is in node s's subtree exactly when
+    start[s] <= start[x] < end[s].
+    """
+    num_nodes = len(tree.parent)
+    start, end = [0] * num_nodes, [0] * num_nodes
+    position = 0
+    for root in range(num_nodes):
+        if tree.parent[root] is not None:
+            continue
+        stack = [(root, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                end[node] = position
+                continue
+            start[node] = position
+            position += 1
+            stack.append((node, True))
+            stack.extend((child, False) for child in tree.children[node])
+    return np.array(start), np.array(end)
+
+def cost_ranges(costs, basis):
+    """
+    How far each cell's cost can move (all else fixed) with the basis
+    staying optimal.
+
+    Args:
+        costs (list[list]): Balanced minimization cost matrix.
+        basis (set): The m + n - 1 basic (r, c) cells of an optimal solution.
+
+    Returns:
+        tuple: (decrease, increase) m x n arrays, both >= 0 (np.inf if
+               unbounded). Raises ValueError if the basis isn't optimal.
+    """
+    cost_array = np.asarray(costs, dtype=float)
+    num_rows, num_cols = cost_array.shape
+    tree = BasisTree(costs, sorted(basis))
+    potential = np.asarray(tree.potential, dtype=float)
+    reduced = cost_array - potential[:num_rows, None] - potential[None, num_rows:]
+
+    scale = max(1.0, float(np.abs(cost_array).max()))
+    if reduced.min() < -REDUCED_COST_TOLERANCE * scale:
+        raise ValueError("Sensitivity analysis needs an optimal basis.")
+    reduced = np.maximum(reduced, 0)
+
+    in_basis = np.zeros((num_rows, num_cols), dtype=bool)
+    for cell in basis:
+        in_basis[cell] = True
+    # Non-basic cells: up freely, down by their reduced cost
+    decrease = np.where(in_basis, 0.0, reduced)
+    increase = np.full((num_rows, num_cols), np.inf)
+    non_basic = np.where(in_basis, np.inf, reduced)
+
+    start, end = _subtree_intervals(tree)
+    for (r, c) in basis:
+        # The end of (r, c) hanging below the other one
+        child = r if tree.parent[r] == num_rows + c else num_rows + c
+        below = (start >= start[child]) & (start < end[child])
+        rows_a, cols_a = below[:num_rows], below[num_rows:]
+        if child != r:
+            rows_a, cols_a = ~rows_a, ~cols_a
+
+        up = non_basic[np.ix_(rows_a, ~cols_a)]
+        down = non_basic[np.ix_(~rows_a, cols_a)]
+        increase[r, c] = up.min() if up.size else np.inf
+        decrease[r, c] = down.min() if down.size else np.inf
+    return decrease, increase
+
+def rim_ranges(allocations, basis):
+    """
+    How far supply i and demand j can both change by the same delta with
+    the basis staying feasible (and so optimal).
+
+    Args:
+        allocations (list[list]): Balanced optimal allocation matrix.
+        basis (set): Its basic (r, c) cells (a spanning tree).
+
+    Returns:
+        tuple: (decrease, increase) m x n arrays, both >= 0 (np.inf if
+               unbounded).
+    """
+    num_rows, num_cols = len(allocations), len(allocations[0])
+    neighbours = [[] for _ in range(num_rows + num_cols)]
+    for (r, c) in basis:
+        neighbours[r].append(num_rows + c)
+        neighbours[num_rows + c].append(r)
+
+    decrease = np.zeros((num_rows, num_cols))
+    increase = np.zeros((num_rows, num_cols))
+    for i in range(num_rows):
+        # Walk the tree from row i: row -> column cells get +delta (their
+        # allocation bounds the decrease), column -> row cells -delta
+        stack = [(i, None, np.inf, np.inf)]
+        while stack:
+            node, came_from, min_plus, min_minus = stack.pop()
+            for other in neighbours[node]:
+                if other == came_from:
+                    continue
+                if node < num_rows:
+                    amount = allocations[node][other - num_rows]
+                    next_plus, next_minus = min(min_plus, amount), min_minus
+                    decrease[i, other - num_rows] = next_plus
+                    increase[i, other - num_rows] = next_minus
+                else:
+                    amount = allocations[other][node - num_rows]
+                    next_plus, next_minus = min_plus, min(min_minus, amount)
+                stack.append((other, node, next_plus, next_minus))
+    return decrease, increase
+
+def _range(low, high):
+    """[low, high] as JSON-friendly floats, None for an unbounded end."""
+    return [float(low) if np.isfinite(low) else None,
+            float(high) if np.isfinite(high) else None]
+
+def sensitivity_analysis(supply, demand, costs, allocations, basis, problem_type="min"):
+    """
+    Cost ranging, shadow prices and supply/demand ranging for an optimal
+    solution, from its final basis.
+
+    Args:
+        supply, demand, costs, problem_type: The problem as given to the
+            solvers (unbalanced, original costs).
+        allocations (list[list]): The optimal allocation, dummy row/col
+            included (as returned by solve_MODI).
+        basis: Its final basic cells, (r, c) or [r, c] pairs.
+
+    Returns:
+        dict: On the balanced table, in the problem's own costs/profits:
+              'cost_ranges': [low, high] each cell's cost can take with
+                  the plan unchanged (None = unbounded).
+              'shadow_prices': total cost (or profit) change per extra
+                  unit of supply i and demand j.
+              'rim_ranges': [low, high] change of supply i and demand j
+                  together that keeps the same basis.
+    """
+    original_costs = [list(row) for row in costs]
+    converted_costs = max_to_min(original_costs) if problem_type == "max" else original_costs
+    _, _, costs_to_solve, _ = balance_problem(supply, demand, converted_costs)
+    _, _, original_costs, _ = balance_problem(supply, demand, original_costs)
+    basis = {(int(r), int(c)) for r, c in basis}
+
+    cost_down, cost_up = cost_ranges(costs_to_solve, basis)
+    if problem_type == "max":
+        # The minimization matrix is max - profit, so its directions swap
+        cost_down, cost_up = cost_up, cost_down
+
+    original_array = np.asarray(original_costs, dtype=float)
+    tree = BasisTree(original_costs, sorted(basis))
+    potential = np.asarray(tree.potential, dtype=float)
+    num_rows = len(original_costs)
+    shadow_prices = potential[:num_rows, None] + potential[None, num_rows:]
+
+    rim_down, rim_up = rim_ranges(allocations, basis)
+
+    num_cols = original_array.shape[1]
+    return {
+        'cost_ranges': [[_range(original_array[r, c] - cost_down[r, c], original_array[r, c] + cost_up[r, c])
+                         for c in range(num_cols)] for r in range(num_rows)],
+        'shadow_prices': shadow_prices.tolist(),
+        'rim_ranges': [[_range(-rim_down[r, c], rim_up[r, c])
+                        for c in range(num_cols)] for r in range(num_rows)]
+    }
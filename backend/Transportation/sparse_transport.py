@@ -0,0 +1,418 @@
+import numpy as np
+
+from VAM_solver import _line_penalties
+from MODI_solver import BasisTree, STALL_LIMIT
+from network_simplex import NetworkSimplex
+
+# --- Sparse Transportation Problems ---
+# Real supply chains only allow some supplier -> destination routes. Instead
+# of faking forbidden routes with huge costs in a dense matrix, a sparse
+# problem is an edge list of allowed routes, stored CSR-style (routes sorted
+# by row, then column). VAM, MODI and the network simplex all work on that
+# route list, so memory and the work per iteration grow with the number of
+# routes instead of m x n.
+
+class SparseCosts:
+    """
+    The allowed routes of a transportation problem in CSR form.
+
+    Route (arc) k goes from row arc_rows[k] to column arc_cols[k] and costs
+    data[k]. Row r's routes are k = indptr[r] .. indptr[r+1]-1, and column
+    c's routes are col_arcs[col_indptr[c] .. col_indptr[c+1]-1].
+
+    It can also be read like a cost matrix (len(costs), len(costs[0]) and
+    costs[r][c]), which is all BasisTree needs.
+    """
+
+    def __init__(self, num_rows, num_cols, routes):
+        """
+        Args:
+            num_rows (int): Number of sources.
+            num_cols (int): Number of destinations.
+            routes (list): (row, col, cost) for every allowed route.
+        """
+        self.num_rows, self.num_cols = num_rows, num_cols
+
+        routes = sorted((int(r), int(c), cost) for (r, c, cost) in routes)
+        for (r, c, _) in routes:
+            if not (0 <= r < num_rows and 0 <= c < num_cols):
+                raise ValueError(f"Route ({r}, {c}) is outside the {num_rows}x{num_cols} problem.")
+        for previous, route in zip(routes, routes[1:]):
+            if previous[:2] == route[:2]:
+                raise ValueError(f"Route ({route[0]}, {route[1]}) is given more than once.")
+
+        self.arc_rows = np.array([r for (r, _, _) in routes], dtype=np.int64)
+        self.arc_cols = np.array([c for (_, c, _) in routes], dtype=np.int64)
+        self.data = np.array([cost for (_, _, cost) in routes])
+        if not len(routes):
+            self.data = self.data.astype(np.int64)
+
+        self.indptr = np.searchsorted(self.arc_rows, np.arange(num_rows + 1))
+        self.col_arcs = np.lexsort((self.arc_rows, self.arc_cols))
+        self.col_indptr = np.searchsorted(self.arc_cols[self.col_arcs], np.arange(num_cols + 1))
+
+    @property
+    def num_arcs(self):
+        return len(self.data)
+
+    def routes(self):
+        """The routes as (row, col, cost) tuples (Python numbers)."""
+        return list(zip(self.arc_rows.tolist(), self.arc_cols.tolist(), self.data.tolist()))
+
+    def row_arcs(self, r):
+        return np.arange(self.indptr[r], self.indptr[r + 1])
+
+    def column_arcs(self, c):
+        return self.col_arcs[self.col_indptr[c]:self.col_indptr[c + 1]]
+
+    def arc(self, r, c):
+        """The index of route (r, c), or -1 if it is not allowed."""
+        start, stop = self.indptr[r], self.indptr[r + 1]
+        k = start + int(np.searchsorted(self.arc_cols[start:stop], c))
+        if k < stop and self.arc_cols[k] == c:
+            return int(k)
+        return -1
+
+    # --- Matrix-style access ---
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, r):
+        return _SparseRow(self, r)
+
+    def with_costs(self, data):
+        """Same routes, different costs (e.g. the max -> min conversion)."""
+        copy = object.__new__(SparseCosts)
+        copy.__dict__.update(self.__dict__)
+        copy.data = np.asarray(data)
+        return copy
+
+class _SparseRow:
+    """One row of a SparseCosts, so costs[r][c] works."""
+
+    def __init__(self, costs, r):
+        self.costs, self.r = costs, r
+
+    def __len__(self):
+        return self.costs.num_cols
+
+    def __getitem__(self, c):
+        k = self.costs.arc(self.r, c)
+        if k < 0:
+            raise KeyError(f"Route ({self.r}, {c}) is not allowed.")
+        return self.costs.data[k].item()
+
+def balance_sparse_problem(supply, demand, costs):
+    """
+    Sparse version of balance_problem: a dummy row or column gets a 0-cost
+    route to every column or row.
+
+    Returns:
+        tuple: (supply, demand, costs, is_dummy_added)
+    """
+    supply, demand = list(supply), list(demand)
+    total_supply, total_demand = sum(supply), sum(demand)
+    if total_supply == total_demand:
+        return supply, demand, costs, False
+
+    routes = costs.routes()
+    num_rows, num_cols = costs.num_rows, costs.num_cols
+    if total_supply < total_demand:
+        supply.append(total_demand - total_supply)
+        routes += [(num_rows, c, 0) for c in range(num_cols)]
+        num_rows += 1
+    else:
+        demand.append(total_supply - total_demand)
+        routes += [(r, num_cols, 0) for r in range(num_rows)]
+        num_cols += 1
+    return supply, demand, SparseCosts(num_rows, num_cols, routes), True
+
+def _two_smallest(values, arcs):
+    """(arc of the smallest value, smallest, second smallest) of one line."""
+    if len(arcs) == 0:
+        return -1, np.inf, np.inf
+    line = values[arcs]
+    best = int(np.argmin(line))
+    min2 = np.partition(line, 1)[1] if len(arcs) >= 2 else np.inf
+    return int(arcs[best]), line[best], min2
+
+def solve_vam_sparse(supply, demand, costs):
+    """
+    Vogel's Approximation Method on the allowed routes only, with the same
+    tie-breaking as solve_vam. Each line keeps its two cheapest open routes
+    and only lines that lose one of them are recomputed.
+
+    If the greedy choices leave supply that no open route can take, the
+    rest is placed on artificial routes (north-west corner over what is
+    left). MODI then has to move that flow onto real routes.
+
+    Args:
+        supply, demand (list): Balanced supply and demand.
+        costs (SparseCosts): The (min) costs of the allowed routes.
+
+    Returns:
+        tuple: (allocations, artificial_routes) where allocations is a list
+               of (row, col, quantity) and artificial_routes a list of
+               (row, col) cells that are not real routes.
+    """
+    m, n = costs.num_rows, costs.num_cols
+    current_supply, current_demand = list(supply), list(demand)
+    supply_left = np.array(current_supply, dtype=float)
+    demand_left = np.array(current_demand, dtype=float)
+    available_rows = np.ones(m, dtype=bool)
+    available_cols = np.ones(n, dtype=bool)
+    work = costs.data.astype(float)
+
+    row_arg, row_min1, row_min2 = np.full(m, -1), np.full(m, np.inf), np.full(m, np.inf)
+    col_arg, col_min1, col_min2 = np.full(n, -1), np.full(n, np.inf), np.full(n, np.inf)
+    for r in range(m):
+        row_arg[r], row_min1[r], row_min2[r] = _two_smallest(work, costs.row_arcs(r))
+    for c in range(n):
+        col_arg[c], col_min1[c], col_min2[c] = _two_smallest(work, costs.column_arcs(c))
+
+    allocations = []
+    total_supply_left = sum(current_supply)
+    while total_supply_left > 0:
+        row_pen = _line_penalties(row_min1, row_min2)
+        col_pen = _line_penalties(col_min1, col_min2)
+        max_penalty = max(row_pen.max(), col_pen.max())
+        if max_penalty < 0:
+            break # No open route can take what is left
+
+        # Candidates: the cheapest route of every max-penalty line
+        candidates = np.concatenate([row_arg[row_pen == max_penalty],
+                                     col_arg[col_pen == max_penalty]])
+        candidates = candidates[candidates >= 0]
+        cand_rows, cand_cols = costs.arc_rows[candidates], costs.arc_cols[candidates]
+        potential_alloc = np.minimum(supply_left[cand_rows], demand_left[cand_cols])
+        best = np.lexsort((np.arange(len(candidates)), work[candidates], -potential_alloc))[0]
+        r, c = int(cand_rows[best]), int(cand_cols[best])
+
+        amount = min(current_supply[r], current_demand[c])
+        allocations.append((r, c, amount))
+        current_supply[r] -= amount
+        current_demand[c] -= amount
+        supply_left[r], demand_left[c] = current_supply[r], current_demand[c]
+        total_supply_left -= amount
+
+        # Cross out, and find the lines whose two cheapest routes changed
+        stale_rows, stale_cols = set(), set()
+        if current_supply[r] == 0:
+            arcs = costs.row_arcs(r)
+            cols = costs.arc_cols[arcs]
+            hit = available_cols[cols] & (work[arcs] <= col_min2[cols])
+            stale_cols.update(cols[hit].tolist())
+            work[arcs] = np.inf
+            available_rows[r] = False
+            row_arg[r], row_min1[r], row_min2[r] = -1, np.inf, np.inf
+        if current_demand[c] == 0:
+            arcs = costs.column_arcs(c)
+            rows = costs.arc_rows[arcs]
+            hit = available_rows[rows] & (work[arcs] <= row_min2[rows])
+            stale_rows.update(rows[hit].tolist())
+            work[arcs] = np.inf
+            available_cols[c] = False
+            col_arg[c], col_min1[c], col_min2[c] = -1, np.inf, np.inf
+
+        for row in stale_rows:
+            if available_rows[row]:
+                row_arg[row], row_min1[row], row_min2[row] = _two_smallest(work, costs.row_arcs(row))
+        for col in stale_cols:
+            if available_cols[col]:
+                col_arg[col], col_min1[col], col_min2[col] = _two_smallest(work, costs.column_arcs(col))
+
+    # Whatever is left goes on artificial routes
+    artificial_routes = []
+    rows_left = [r for r in range(m) if current_supply[r] > 0]
+    cols_left = [c for c in range(n) if current_demand[c] > 0]
+    i = j = 0
+    while i < len(rows_left) and j < len(cols_left):
+        r, c = rows_left[i], cols_left[j]
+        amount = min(current_supply[r], current_demand[c])
+        allocations.append((r, c, amount))
+        artificial_routes.append((r, c))
+        current_supply[r] -= amount
+        current_demand[c] -= amount
+        if current_supply[r] == 0:
+            i += 1
+        if current_demand[c] == 0:
+            j += 1
+
+    return allocations, artificial_routes
+
+def _connecting_routes(costs, basic, diff):
+    """
+    Sparse version of find_min_cost_unallocated: the 'diff' cheapest
+    non-basic routes that join two separate parts of the basis.
+    """
+    m = costs.num_rows
+    group = list(range(m + costs.num_cols))
+    def find_group(node):
+        while group[node] != node:
+            group[node] = group[group[node]]
+            node = group[node]
+        return node
+
+    for k in np.flatnonzero(basic):
+        group[find_group(int(costs.arc_rows[k]))] = find_group(m + int(costs.arc_cols[k]))
+
+    chosen = []
+    for k in np.argsort(costs.data, kind="stable"):
+        if len(chosen) == diff:
+            break
+        if basic[k]:
+            continue
+        row_group = find_group(int(costs.arc_rows[k]))
+        col_group = find_group(m + int(costs.arc_cols[k]))
+        if row_group != col_group:
+            group[row_group] = col_group
+            chosen.append(int(k))
+    return chosen
+
+def solve_MODI_sparse(costs, initial_allocation):
+    """
+    MODI on the allowed routes only. Opportunity costs are computed for the
+    routes (not every cell), and the basis is kept in a BasisTree.
+
+    Args:
+        costs (SparseCosts): The (min) costs of the allowed routes.
+        initial_allocation (list): (row, col, quantity) from solve_vam_sparse.
+
+    Returns:
+        list: The flow on each route (same order as costs.data).
+    """
+    m, n = costs.num_rows, costs.num_cols
+    flow = [0] * costs.num_arcs
+    for (r, c, amount) in initial_allocation:
+        flow[costs.arc(r, c)] += amount
+    basic = np.array([amount > 0 for amount in flow], dtype=bool)
+
+    tree = None
+    stalled_pivots = 0
+    while True:
+        # 1. Degeneracy: (symbolic) epsilons on the cheapest routes that
+        # connect the basis. Their flow stays 0.
+        diff = (m + n - 1) - int(basic.sum())
+        if diff > 0:
+            for k in _connecting_routes(costs, basic, diff):
+                basic[k] = True
+            tree = None
+
+        # 2. u, v from the basis tree
+        if tree is None:
+            cells = list(zip(costs.arc_rows[basic].tolist(), costs.arc_cols[basic].tolist()))
+            tree = BasisTree(costs, cells)
+        u, v = np.array(tree.u), np.array(tree.v)
+
+        # 3./4. Opportunity costs of the non-basic routes; the most positive
+        # enters (the first positive one while stalled, as in solve_MODI)
+        opportunity = u[costs.arc_rows] + v[costs.arc_cols] - costs.data
+        opportunity[basic] = 0
+        if stalled_pivots >= STALL_LIMIT:
+            entering = int(np.argmax(opportunity > 0))
+        else:
+            entering = int(np.argmax(opportunity))
+        if opportunity[entering] <= 0:
+            break
+
+        # 5. Loop and theta
+        pivot_cell = (int(costs.arc_rows[entering]), int(costs.arc_cols[entering]))
+        loop = tree.find_loop(pivot_cell)
+        if loop is None:
+            break
+        loop_arcs = [costs.arc(r, c) for (r, c) in loop]
+        plus_arcs, minus_arcs = loop_arcs[0::2], loop_arcs[1::2]
+        theta = min(flow[k] for k in minus_arcs)
+        stalled_pivots = stalled_pivots + 1 if theta == 0 else 0
+
+        for k in plus_arcs:
+            flow[k] += theta
+        for k in minus_arcs:
+            flow[k] -= theta
+
+        # One route leaves (the first that dropped to 0), the rest stay as epsilons
+        leaving = min(k for k in minus_arcs if flow[k] == 0)
+        basic[entering] = True
+        basic[leaving] = False
+        tree.pivot(pivot_cell, (int(costs.arc_rows[leaving]), int(costs.arc_cols[leaving])))
+
+    return flow
+
+def solve_sparse_transportation(supply, demand, num_rows, num_cols, routes,
+                                problem_type="min", solution_type="both"):
+    """
+    Solves a transportation problem given as allowed routes.
+
+    Args:
+        supply, demand (list): Supply of each row, demand of each column.
+        num_rows, num_cols (int): Problem size.
+        routes (list): (row, col, cost) for every allowed route.
+        problem_type (str): 'min' or 'max'.
+        solution_type (str): 'initial' (VAM), 'final' / 'both' (VAM + MODI)
+                             or 'network' (network simplex).
+
+    Returns:
+        dict: 'initial' and/or 'final' results, each with 'assignments' as a
+              list of [row, col, quantity] for the routes that are used,
+              'total_cost' and 'problem_type'.
+    """
+    original = SparseCosts(num_rows, num_cols, routes)
+    if problem_type == "max":
+        # Regret over the allowed routes only
+        to_solve = original.with_costs(original.data.max() - original.data) if original.num_arcs else original
+    else:
+        to_solve = original
+
+    balanced_supply, balanced_demand, to_solve, _ = balance_sparse_problem(supply, demand, to_solve)
+    _, _, original, _ = balance_sparse_problem(supply, demand, original)
+
+    def result(arc_flow):
+        assignments = [[int(original.arc_rows[k]), int(original.arc_cols[k]), amount]
+                       for k, amount in enumerate(arc_flow) if amount]
+        total_cost = sum(original.data[k].item() * amount for k, amount in enumerate(arc_flow) if amount)
+        return {'assignments': assignments, 'total_cost': total_cost, 'problem_type': problem_type}
+
+    solution = {'initial': None, 'final': None}
+
+    if solution_type == 'network':
+        engine = NetworkSimplex(to_solve.num_rows, to_solve.num_cols, to_solve.arc_rows,
+                                to_solve.arc_cols, to_solve.data, balanced_supply, balanced_demand)
+        engine.run()
+        solution['final'] = result(engine.arc_flows())
+        return solution
+
+    initial_allocation, artificial_routes = solve_vam_sparse(balanced_supply, balanced_demand, to_solve)
+
+    if artificial_routes:
+        # Artificial routes cost more than any real path, so MODI drops them
+        big_m = (np.abs(to_solve.data).max().item() + 1) * (to_solve.num_rows + to_solve.num_cols)
+        with_artificial = SparseCosts(to_solve.num_rows, to_solve.num_cols,
+                                      to_solve.routes() + [(r, c, big_m) for (r, c) in artificial_routes])
+    else:
+        with_artificial = to_solve
+
+    if artificial_routes and solution_type == 'initial':
+        raise ValueError("VAM could not place all the supply on the allowed routes; "
+                         "use solutionType 'final' or 'network'.")
+    if solution_type in ('initial', 'both') and not artificial_routes:
+        flow = [0] * original.num_arcs
+        for (r, c, amount) in initial_allocation:
+            flow[original.arc(r, c)] += amount
+        solution['initial'] = result(flow)
+
+    if solution_type in ('final', 'both'):
+        arc_flow = solve_MODI_sparse(with_artificial, initial_allocation)
+        flow = [0] * original.num_arcs
+        for k, amount in enumerate(arc_flow):
+            if not amount:
+                continue
+            r, c = int(with_artificial.arc_rows[k]), int(with_artificial.arc_cols[k])
+            if (r, c) in artificial_routes and original.arc(r, c) < 0:
+                raise ValueError("Transportation problem is infeasible: the allowed routes can't carry all the supply.")
+            flow[original.arc(r, c)] += amount
+        solution['final'] = result(flow)
+
+    if solution_type not in ('initial', 'final', 'both'):
+        raise ValueError(f"Unknown solution type: {solution_type}")
+    return solution
@@ -2,82 +2,24 @@ import argparse
 import sys
 import json
 import numpy as np
-import subprocess  # Used to call Manim
+import subprocess  # Used to call ffmpeg
 import os          # Used to get file paths
-import shutil      # Used to move the final video file
 
 # Import the solver logic from your other files
-from VAM_solver import solve_vam, max_to_min, balance_problem
-from MODI_solver import solve_MODI, calculate_final_cost, check_degeneracy, find_min_cost_unallocated, add_epsilon_allocations, u_v_calculation, calculate_opportunity_costs, check_optimality, find_loop, adjust_allocations
+from VAM_solver import solve_vam
+from MODI_solver import solve_MODI, iter_MODI, calculate_final_cost
+from network_simplex import solve_network_simplex
+from sparse_transport import solve_sparse_transportation
+from warm_start import solve_warm_start, apply_changes
+from initial_methods import solve_initial
+from lp_engine import solve_linprog_transportation
+from sensitivity import sensitivity_analysis
 
-# --- Manim Helper Functions ---
+# --- Shared Manim renderer (backend/manim_render.py) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manim_render import render_scene
 
-# In transportation_main.py
-
-def _run_manim_scene(script_name, scene_name, cwd_dir):
-    """
-    Runs a specific Manim scene and handles errors.
-    """
-    animation_script_path = os.path.join(cwd_dir, script_name)
-    
-    # Command: manim -q (quality) l (low).
-    manim_command = ["manim", "-ql", animation_script_path, scene_name, "--disable_caching"]
-    
-    print(f"Running command: {' '.join(manim_command)}")
-    
-    # Run from the `backend/Transportation` directory
-    result = subprocess.run(manim_command, cwd=cwd_dir, capture_output=True, text=True, encoding='utf-8')
-
-    if result.returncode != 0:
-        print("--- MANIM FAILED ---", file=sys.stderr)
-        print("STDOUT:", result.stdout, file=sys.stdout)
-        print("STDERR:", result.stderr, file=sys.stderr)
-        raise Exception(f"Manim rendering for {script_name} failed. See stderr.")
-    
-    print(f"Manim render complete for {scene_name}")
-    
-    # --- Find Rendered File ---
-    script_name_no_ext = os.path.splitext(script_name)[0]
-    
-    # --- START FIX: Handle Manim stripping underscores from filenames ---
-    
-    # This is the filename you saw on disk: "VAMTransportation.mp4"
-    scene_name_no_underscore = scene_name.replace("_", "") 
-    
-    # This is the filename the code was *expecting*: "VAM_Transportation.mp4"
-    # We will keep it as a fallback.
-    
-    possible_paths = [
-        # Path 1: The one you observed (no underscore)
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p15", f"{scene_name_no_underscore}.mp4"),
-        
-        # Path 2: The original one (with underscore)
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p15", f"{scene_name}.mp4"),
-        
-        # --- Fallbacks ---
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "720p30", f"{scene_name_no_underscore}.mp4"),
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "720p30", f"{scene_name}.mp4"),
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p", f"{scene_name_no_underscore}.mp4"),
-        os.path.join(cwd_dir, "media", "videos", script_name_no_ext, "480p", f"{scene_name}.mp4"),
-    ]
-    
-    print("Searching for rendered file...")
-    
-    rendered_file_path = None
-    for path in possible_paths:
-        print(f"Checking for file at: {path}")
-        if os.path.exists(path):
-            print(f"FOUND file at: {path}")
-            rendered_file_path = path
-            break
-    
-    if rendered_file_path is None:
-        print(f"Error: Could not find rendered file after checking all paths:", file=sys.stderr)
-        for path in possible_paths:
-            print(f"- {path}", file=sys.stderr)
-        raise Exception("Manim rendered, but output file not found.")
-        
-    return rendered_file_path
+# --- Video Helper Functions ---
 
 def _stitch_videos(video_paths, output_path, cwd_dir):
     """
@@ -120,19 +62,110 @@ def _stitch_videos(video_paths, output_path, cwd_dir):
         
     print("Stitching complete.")
 
+# --- Solver Trace (shared by all scenes) ---
+
+def build_solution_trace(input_data):
+    """
+    Solves the problem once (VAM + MODI) and returns everything the
+    scenes need to draw it, so they never have to re-solve inside
+    construct(). The MODI part holds one entry per iteration.
+    """
+    vam_trace = []
+    modi_trace = []
+    (initial_allocation, initial_cost,
+     original_costs, costs_to_solve,
+     balanced_demand, balanced_supply) = solve_vam(
+        list(input_data['supply']), list(input_data['demand']),
+        [list(row) for row in input_data['costMatrix']],
+        input_data['problemType'], trace=vam_trace
+    )
+    final_allocation, total_cost = solve_MODI(
+        costs_to_solve, original_costs, initial_allocation, trace=modi_trace
+    )
+
+    return {
+        "vam": {
+            "allocations": initial_allocation,
+            "total_cost": initial_cost,
+            "original_costs": original_costs,
+            "costs_to_solve": costs_to_solve,
+            "supply": balanced_supply,
+            "demand": balanced_demand,
+            "steps": vam_trace
+        },
+        "modi": {
+            "allocations": final_allocation,
+            "total_cost": total_cost,
+            "iterations": modi_trace
+        }
+    }
+
+# --- MODI Event Stream (direct output) ---
+
+def run_modi_stream(costs_to_solve, original_costs, initial_allocation, basis, input_data, output_file):
+    """
+    Runs MODI through iter_MODI for a direct job. With 'streamEvents' set,
+    every event is appended to '<output>_events.ndjson' as it happens (one
+    JSON object per line) so the API can hand them to the client while the
+    job is still running. 'maxIterations' / 'timeBudget' (seconds) stop the
+    solve early with the best allocation found so far, and 'pivotRule'
+    picks the entering-cell rule (see pivot_rules.py).
+
+    Returns:
+        tuple: (allocations, total_cost, status), status being the last
+               event's ('optimal', 'iteration_limit', 'time_limit', ...).
+    """
+    events_file = None
+    if input_data.get('streamEvents'):
+        events_path = output_file.replace('.json', '_events.ndjson')
+        events_file = open(events_path, 'w', encoding='utf-8')
+
+    allocations = [list(row) for row in initial_allocation]
+    try:
+        for event in iter_MODI(costs_to_solve, original_costs, initial_allocation, basis=basis,
+                               max_iterations=input_data.get('maxIterations'),
+                               time_budget=input_data.get('timeBudget'),
+                               pivot_rule=input_data.get('pivotRule', 'dantzig')):
+            for (r, c, value) in event.get('changed_cells', []):
+                allocations[r][c] = value
+            if events_file is not None:
+                events_file.write(json.dumps(event, default=lambda value: value.item()) + "\n")
+                events_file.flush()
+    finally:
+        if events_file is not None:
+            events_file.close()
+
+    print(f"MODI stopped after {event['pivots']} pivots ({event['status']})")
+    return allocations, calculate_final_cost(original_costs, allocations), event['status']
+
+def sensitivity_report(input_data, allocations, basis, status='optimal'):
+    """
+    Cost / supply / demand ranging for the 'final' solution (see
+    sensitivity.py). None when the request sets 'sensitivity' to false or
+    MODI stopped before the optimum.
+    """
+    if not input_data.get('sensitivity', True) or status != 'optimal':
+        return None
+    return sensitivity_analysis(input_data['supply'], input_data['demand'], input_data['costMatrix'],
+                                allocations, basis, input_data['problemType'])
+
 # --- Main Generation Functions ---
 
 def generate_video(input_data, output_video_path, solution_type):
     """
     Generates a Manim video by:
-    1. Writing the user's data to 'transportation_problem.json'.
+    1. Solving the problem once and writing the user's data plus the
+       solver trace to 'transportation_problem.json'.
     2. Dynamically selecting the correct Manim script(s) to run.
     3. Stitching videos if 'both' is requested.
-    4. Moving the final video to the public/outputs path.
+    4. Writing the final video to the public/outputs path.
     """
     print("Starting Manim video generation process...")
+    if input_data.get('routes') is not None:
+        raise ValueError("Videos need a full costMatrix; route lists are only supported for direct output.")
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    narration_mode = input_data.get('videoMode', 'narrated') # 'narrated' or 'subtitles'
     
     # 1. --- Prepare Manim Input File ---
     manim_input_json = os.path.join(script_dir, "transportation_problem.json")
@@ -142,7 +175,8 @@ def generate_video(input_data, output_video_path, solution_type):
         "supply": input_data['supply'],
         "demand": input_data['demand'],
         "problemType": input_data['problemType'],
-        "solutionType": solution_type 
+        "solutionType": solution_type,
+        "trace": build_solution_trace(input_data)
     }
     
     try:
@@ -156,30 +190,32 @@ def generate_video(input_data, output_video_path, solution_type):
     # 2. --- Run the correct animation(s) using match/case ---
     
     videos_to_stitch = []
+    # Part files for 'both', rendered next to the final video
+    output_base = os.path.splitext(output_video_path)[0]
     
     match solution_type:
         case 'initial':
             print("Rendering VAM-only video...")
-            vam_video_path = _run_manim_scene("VAM_animation.py", "VAM_Transportation", script_dir)
-            # Move the single video to the final output path
-            shutil.move(vam_video_path, output_video_path)
-            print(f"VAM video moved to {output_video_path}")
+            render_scene("VAM_animation.py", "VAMTransportation", script_dir, output_video_path,
+                         narration_mode=narration_mode)
+            print(f"VAM video saved to {output_video_path}")
             
         case 'final':
             print("Rendering MODI-only video...")
-            modi_video_path = _run_manim_scene("MODI_animation.py", "MODI_Transportation", script_dir)
-            # Move the single video to the final output path
-            shutil.move(modi_video_path, output_video_path)
-            print(f"MODI video moved to {output_video_path}")
+            render_scene("MODI_animation.py", "MODI_Transportation", script_dir, output_video_path,
+                         narration_mode=narration_mode)
+            print(f"MODI video saved to {output_video_path}")
 
         case 'both':
             print("Rendering 'both' videos (VAM then MODI)...")
             # Step A: Run VAM
-            vam_video_path = _run_manim_scene("VAM_animation.py", "VAM_Transportation", script_dir)
+            vam_video_path = render_scene("VAM_animation.py", "VAMTransportation", script_dir, output_base + "_vam.mp4",
+                                          narration_mode=narration_mode)
             videos_to_stitch.append(vam_video_path)
             
             # Step B: Run MODI
-            modi_video_path = _run_manim_scene("MODI_animation.py", "MODI_Transportation", script_dir)
+            modi_video_path = render_scene("MODI_animation.py", "MODI_Transportation", script_dir, output_base + "_modi.mp4",
+                                           narration_mode=narration_mode)
             videos_to_stitch.append(modi_video_path)
             
             # Step C: Stitch them
@@ -192,6 +228,45 @@ def generate_video(input_data, output_video_path, solution_type):
 def generate_direct_solution(input_data, output_file):
     """Solves the problem directly and writes a JSON output."""
     print("Solving transportation problem (direct)...")
+
+    if input_data.get('routes') is not None:
+        # Sparse input: only the listed routes are allowed
+        solution = solve_sparse_transportation(
+            input_data['supply'], input_data['demand'],
+            len(input_data['supply']), len(input_data['demand']),
+            input_data['routes'], input_data['problemType'], input_data['solutionType']
+        )
+        with open(output_file, 'w') as f:
+            json.dump(solution, f, indent=2)
+        print("Direct solution generated successfully!")
+        return
+
+    if input_data.get('warmStart') is not None:
+        # What-if re-solve from a previous job's final basis (no VAM)
+        warm_start = input_data['warmStart']
+        final_allocation, total_cost, final_basis = solve_warm_start(
+            input_data['supply'], input_data['demand'], input_data['costMatrix'],
+            warm_start['basis'], input_data['problemType'], warm_start.get('changes')
+        )
+        # The ranges are for the edited problem
+        costs, supply, demand = apply_changes(input_data['costMatrix'], input_data['supply'],
+                                              input_data['demand'], warm_start.get('changes') or {})
+        edited_data = {**input_data, 'costMatrix': costs, 'supply': supply, 'demand': demand}
+        solution = {
+            'initial': None,
+            'final': {
+                'assignments': np.array(final_allocation).tolist(),
+                'total_cost': float(total_cost),
+                'problem_type': input_data['problemType'],
+                'basis': final_basis,
+                'sensitivity': sensitivity_report(edited_data, final_allocation, final_basis)
+            }
+        }
+        with open(output_file, 'w') as f:
+            json.dump(solution, f, indent=2)
+        print("Direct solution generated successfully!")
+        print(f"Final Cost: {solution['final']['total_cost']}")
+        return
     
     costs = np.array(input_data['costMatrix'])
     supply = np.array(input_data['supply'])
@@ -199,10 +274,13 @@ def generate_direct_solution(input_data, output_file):
     problem_type = input_data['problemType']
     solution_type = input_data['solutionType']
     
-    # 1. Run VAM
-    (initial_allocation, initial_cost, 
-     original_costs, costs_to_solve, 
-     _, _) = solve_vam(supply.copy(), demand.copy(), costs.copy(), problem_type)
+    # 1. Initial solution, VAM unless the request picks another method
+    # ('network' and 'linprog' don't need a starting solution)
+    if solution_type not in ('network', 'linprog'):
+        (initial_allocation, initial_cost, 
+         original_costs, costs_to_solve, 
+         _, _) = solve_initial(supply.copy(), demand.copy(), costs.copy(), problem_type,
+                               input_data.get('initialMethod', 'vam'))
     
     solution = {}
     
@@ -220,20 +298,27 @@ def generate_direct_solution(input_data, output_file):
             }
             
         case 'final':
-            final_allocation, total_cost = solve_MODI(costs_to_solve, original_costs, initial_allocation)
+            final_basis = set() # Filled by MODI, for a later warm start
+            final_allocation, total_cost, status = run_modi_stream(
+                costs_to_solve, original_costs, initial_allocation, final_basis, input_data, output_file)
             # --- FIX: Wrap solution in 'final' key ---
             solution = {
                 'initial': None, # Add a null 'initial' key
                 'final': {
                     'assignments': np.array(final_allocation).tolist(),
                     'total_cost': float(total_cost),
-                    'problem_type': problem_type
+                    'problem_type': problem_type,
+                    'basis': [[r, c] for r, c in sorted(final_basis)],
+                    'status': status,
+                    'sensitivity': sensitivity_report(input_data, final_allocation, final_basis, status)
                 }
             }
 
         case 'both':
             # This case was already correct
-            final_allocation, total_cost = solve_MODI(costs_to_solve, original_costs, initial_allocation)
+            final_basis = set()
+            final_allocation, total_cost, status = run_modi_stream(
+                costs_to_solve, original_costs, initial_allocation, final_basis, input_data, output_file)
             solution = {
                 'initial': {
                     'assignments': np.array(initial_allocation).tolist(),
@@ -243,10 +328,43 @@ def generate_direct_solution(input_data, output_file):
                 'final': {
                     'assignments': np.array(final_allocation).tolist(),
                     'total_cost': float(total_cost), 
+                    'problem_type': problem_type,
+                    'basis': [[r, c] for r, c in sorted(final_basis)],
+                    'status': status,
+                    'sensitivity': sensitivity_report(input_data, final_allocation, final_basis, status)
+                }
+            }
+        
+        case 'network':
+            # Network simplex engine, for large instances
+            final_allocation, total_cost = solve_network_simplex(supply, demand, costs, problem_type)
+            solution = {
+                'initial': None,
+                'final': {
+                    'assignments': np.array(final_allocation).tolist(),
+                    'total_cost': float(total_cost),
                     'problem_type': problem_type
                 }
             }
         
+        case 'linprog':
+            # HiGHS LP engine; the optimal basis and u/v are rebuilt for display
+            lp_trace, final_basis = [], set()
+            final_allocation, total_cost = solve_linprog_transportation(
+                supply, demand, costs, problem_type, trace=lp_trace, basis=final_basis)
+            solution = {
+                'initial': None,
+                'final': {
+                    'assignments': np.array(final_allocation).tolist(),
+                    'total_cost': float(total_cost),
+                    'problem_type': problem_type,
+                    'basis': [[r, c] for r, c in sorted(final_basis)],
+                    'u': np.array(lp_trace[0]['u']).tolist(),
+                    'v': np.array(lp_trace[0]['v']).tolist(),
+                    'sensitivity': sensitivity_report(input_data, final_allocation, final_basis)
+                }
+            }
+        
         case _:
             raise ValueError(f"Unknown solution type: {solution_type}")
 
@@ -263,12 +381,48 @@ def generate_direct_solution(input_data, output_file):
          print(f"Final Cost: {solution['final']['total_cost']}")
 
 def generate_pdf_report(input_data, output_file):
-    """Generates a PDF report (placeholder)."""
-    # TODO: Implement PDF logic
-    print(f"PDF generation logic for {output_file} goes here.")
-    # For now, just create an empty file as a placeholder
-    with open(output_file, 'w') as f:
-        f.write("PDF generation not yet implemented.")
+    """
+    Generates a step-by-step PDF report by:
+    1. Solving the problem once and writing the data, the solver trace
+       and the target PDF path to 'transportation_problem.json'.
+    2. Running the static MODI scene, which draws one vector page per
+       step straight into 'output_file' while it renders.
+    """
+    print("Starting PDF report generation process...")
+    if input_data.get('routes') is not None:
+        raise ValueError("PDF reports need a full costMatrix; route lists are only supported for direct output.")
+    
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    output_pdf_path = os.path.abspath(output_file)
+    
+    # 1. --- Prepare Manim Input File ---
+    manim_input_json = os.path.join(script_dir, "transportation_problem.json")
+    
+    manim_data = {
+        "costs": input_data['costMatrix'],
+        "supply": input_data['supply'],
+        "demand": input_data['demand'],
+        "problemType": input_data['problemType'],
+        "solutionType": input_data.get('solutionType', 'both'),
+        "trace": build_solution_trace(input_data),
+        "pdfOutput": output_pdf_path,
+        "pdfBackend": "vector"
+    }
+    
+    try:
+        with open(manim_input_json, 'w') as f:
+            json.dump(manim_data, f, indent=2)
+        print(f"Wrote user input to {manim_input_json}")
+    except Exception as e:
+        print(f"Error writing Manim input JSON: {e}", file=sys.stderr)
+        raise
+
+    # 2. --- Render the frames into the PDF ---
+    render_scene("MODI_IMG.py", "MODI_Static_PDF", script_dir, quality="high_quality", static=True)
+    
+    if not os.path.exists(output_pdf_path):
+        raise Exception("Manim rendered, but the PDF was not written.")
+    print(f"PDF report saved to {output_pdf_path}")
 
 # --- Main Execution ---
 # In transportation_main.py
@@ -316,6 +470,7 @@ def main():
 
             case 'pdf':
                 generate_pdf_report(input_data, args.output)
+                print(f"PDF process complete. Final file at: {args.output}")
             
             case _:
                 # This case is redundant thanks to argparse 'choices', but is good practice
@@ -0,0 +1,83 @@
+from manim import *
+import cairo
+import os
+
+class VectorPdfWriter:
+    """
+    Writes each captured frame of a static scene as a vector PDF page.
+
+    Instead of rasterizing the frame, the scene's mobjects are drawn
+    straight onto a Cairo PDF surface using the camera's own vector
+    drawing code, so tables and text stay sharp at any zoom. Cairo
+    streams finished pages to disk, so memory does not grow with the
+    number of pages.
+
+    Pages go to '<output_pdf>.part' and the file is only moved to
+    'output_pdf' once close() is called, so a failed render never
+    leaves a half-written PDF behind.
+    """
+
+    def __init__(self, output_pdf, page_width=842):
+        self.output_pdf = output_pdf
+        self.part_path = output_pdf + ".part"
+        self.page_width = page_width # In points (842pt = A4 landscape width)
+        self.page_height = page_width * config.frame_height / config.frame_width
+        self.page_count = 0
+        self.surface = cairo.PDFSurface(self.part_path, self.page_width, self.page_height)
+
+    def add_scene_frame(self, scene):
+        """Draws everything currently in 'scene' as the next page."""
+        camera = scene.camera
+        ctx = cairo.Context(self.surface)
+
+        # --- 1. Background ---
+        r, g, b = color_to_rgb(camera.background_color)
+        ctx.set_source_rgba(r, g, b, camera.background_opacity)
+        ctx.paint()
+
+        # --- 2. Map Manim frame coordinates to page points ---
+        # Same transform as Camera.get_cairo_context, with the page
+        # size in place of the pixel size.
+        sx = self.page_width / camera.frame_width
+        sy = self.page_height / camera.frame_height
+        fc = camera.frame_center
+        ctx.set_matrix(cairo.Matrix(
+            sx, 0,
+            0, -sy,
+            (self.page_width / 2) - fc[0] * sx,
+            (self.page_height / 2) + fc[1] * sy
+        ))
+
+        # --- 3. Draw every mobject in z-order ---
+        for mobject in camera.get_mobjects_to_display(scene.mobjects):
+            if isinstance(mobject, VMobject):
+                camera.display_vectorized(mobject, ctx)
+
+        self.surface.show_page()
+        self.page_count += 1
+
+    def close(self):
+        """Finishes the PDF and moves it into place."""
+        self.surface.finish()
+
+        if self.page_count == 0:
+            self.discard()
+            raise Exception("No pages were written to the PDF.")
+
+        os.replace(self.part_path, self.output_pdf)
+        print(f"PDF created: {self.output_pdf} ({self.page_count} pages)")
+
+    def discard(self):
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.surface.finish()
+            self.discard()
+        return False
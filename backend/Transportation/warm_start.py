@@ -0,0 +1,162 @@
+from VAM_solver import max_to_min, balance_problem
+from MODI_solver import solve_MODI
+
+# --- Warm-Start Re-Solve ---
+# A "what-if" edit (one cost, one supply, one demand) usually leaves the
+# previous optimal basis optimal or a few pivots away from it, so instead of
+# VAM + a full MODI run this restarts MODI from that basis:
+#
+# * The basis cells form a tree, so they fix a unique solution. It's found by
+#   peeling leaves: a row/column with one basic cell left puts everything it
+#   still has on that cell.
+# * A cost change never breaks that solution, only its optimality, and MODI
+#   carries on from it. A supply/demand change can make a basic cell go
+#   negative, so each allocation is clipped to what the other end has left
+#   and the rest is placed least-cost first (a "repair").
+# * Zero basic cells that still link the tree stay in as epsilon cells, and
+#   solve_MODI adds any that are missing.
+
+def apply_changes(costs, supply, demand, changes):
+    """
+    Applies a what-if delta to a copy of the problem.
+
+    Args:
+        costs (list[list]): The previous cost matrix.
+        supply (list): The previous supplies.
+        demand (list): The previous demands.
+        changes (dict): Any of 'costs' ([[row, col, value], ...]),
+                        'supply' ([[row, value], ...]) and
+                        'demand' ([[col, value], ...]).
+
+    Returns:
+        tuple: (costs, supply, demand) with the changes applied.
+    """
+    costs = [list(row) for row in costs]
+    supply, demand = list(supply), list(demand)
+
+    for r, c, value in changes.get('costs', []):
+        costs[r][c] = value
+    for r, value in changes.get('supply', []):
+        supply[r] = value
+    for c, value in changes.get('demand', []):
+        demand[c] = value
+    return costs, supply, demand
+
+def repair_allocation(costs, supply, demand, previous_basis):
+    """
+    Builds a feasible starting solution for the (balanced) problem that
+    stays on the previous basis as far as the new supplies and demands allow.
+
+    Args:
+        costs (list[list]): Balanced minimization cost matrix.
+        supply (list): Balanced supplies.
+        demand (list): Balanced demands.
+        previous_basis (list): (r, c) cells of the previous final basis.
+            Cells outside the matrix (a dummy row/col that went away) or
+            that would close a loop are ignored.
+
+    Returns:
+        tuple: (allocations, basis) - the m x n allocation matrix and the
+               set of basic cells to hand to solve_MODI. Every allocated
+               cell is in the basis and the basis has no loop.
+    """
+    num_rows, num_cols = len(costs), len(costs[0])
+    supply_left, demand_left = list(supply), list(demand)
+    allocations = [[0] * num_cols for _ in range(num_rows)]
+
+    # Node r is row r, node num_rows + c is column c
+    group = list(range(num_rows + num_cols))
+    def find_group(node):
+        while group[node] != node:
+            group[node] = group[group[node]]
+            node = group[node]
+        return node
+
+    # --- 1. The usable part of the previous basis (a forest) ---
+    tree_cells = []
+    for r, c in sorted({(int(r), int(c)) for r, c in previous_basis}):
+        if 0 <= r < num_rows and 0 <= c < num_cols:
+            row_group, col_group = find_group(r), find_group(num_rows + c)
+            if row_group != col_group:
+                group[row_group] = col_group
+                tree_cells.append((r, c))
+
+    # --- 2. Peel leaves: a line with one tree cell left puts all it has there ---
+    node_cells = [[] for _ in range(num_rows + num_cols)]
+    for cell in tree_cells:
+        node_cells[cell[0]].append(cell)
+        node_cells[num_rows + cell[1]].append(cell)
+    cells_left = [len(cells) for cells in node_cells]
+    leaves = [node for node in range(num_rows + num_cols) if cells_left[node] == 1]
+    placed = set()
+
+    while leaves:
+        node = leaves.pop()
+        if cells_left[node] != 1:
+            continue
+        r, c = next(cell for cell in node_cells[node] if cell not in placed)
+        placed.add((r, c))
+        # Clipped, so a changed supply/demand can't make it negative
+        amount = min(supply_left[r], demand_left[c])
+        allocations[r][c] = amount
+        supply_left[r] -= amount
+        demand_left[c] -= amount
+        for end in (r, num_rows + c):
+            cells_left[end] -= 1
+            if cells_left[end] == 1:
+                leaves.append(end)
+
+    # --- 3. Repair: whatever is left goes to the cheapest cells ---
+    # Every allocation uses up a row or a column, so no loop can form.
+    for _, r, c in sorted((costs[r][c], r, c) for r in range(num_rows) for c in range(num_cols)):
+        amount = min(supply_left[r], demand_left[c])
+        if amount > 0:
+            allocations[r][c] += amount
+            supply_left[r] -= amount
+            demand_left[c] -= amount
+
+    # --- 4. Basis: allocated cells, then zero previous cells as epsilons ---
+    basis = set()
+    group = list(range(num_rows + num_cols))
+    allocated = [(r, c) for r in range(num_rows) for c in range(num_cols) if allocations[r][c] > 0]
+    for r, c in allocated + tree_cells:
+        row_group, col_group = find_group(r), find_group(num_rows + c)
+        if row_group != col_group:
+            group[row_group] = col_group
+            basis.add((r, c))
+
+    return allocations, basis
+
+def solve_warm_start(supply, demand, costs, basis, problem_type="min", changes=None):
+    """
+    Re-solves a Transportation Problem from a previous final basis.
+
+    Args:
+        supply (list): Supply of each source.
+        demand (list): Demand of each destination.
+        costs (list[list]): Cost (or profit, for 'max') matrix.
+        basis (list): [r, c] cells of the previous final basis, as returned
+                      in the 'final' solution (dummy row/col included).
+        problem_type (str): 'min' or 'max'.
+        changes (dict): Optional what-if delta applied to supply, demand
+                        and costs first. See apply_changes().
+
+    Returns:
+        tuple: (allocations, total_cost, final_basis), where final_basis is
+               the sorted [r, c] list to warm-start the next edit from.
+    """
+    if changes:
+        costs, supply, demand = apply_changes(costs, supply, demand, changes)
+
+    original_costs = [list(row) for row in costs]
+    converted_costs = max_to_min(original_costs) if problem_type == "max" else original_costs
+
+    balanced_supply, balanced_demand, costs_to_solve, _ = balance_problem(supply, demand, converted_costs)
+    # Same dummy row/col on the original costs, for the final sum
+    _, _, original_costs, _ = balance_problem(supply, demand, original_costs)
+
+    initial_allocation, start_basis = repair_allocation(costs_to_solve, balanced_supply, balanced_demand, basis)
+    allocations, total_cost = solve_MODI(costs_to_solve, original_costs, initial_allocation,
+                                         basis=start_basis)
+
+    return allocations, total_cost, [[r, c] for r, c in sorted(start_basis)]
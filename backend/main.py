@@ -8,10 +8,24 @@ import uuid
 import subprocess
 import sys
 from typing import List, Dict, Any # Added for new model
+from render_workers import RenderWorkerPool
 
 # --- App Setup ---
 app = FastAPI()
 
+# --- Render Workers ---
+# Video/PDF jobs run on long-lived workers that keep Manim and the Kokoro
+# voices loaded. 'direct' jobs are quick and still run as plain scripts.
+render_pool = RenderWorkerPool(
+    num_workers=int(os.environ.get("RENDER_WORKERS", 1)),
+    max_jobs=int(os.environ.get("RENDER_WORKER_MAX_JOBS", 20)),
+    max_memory_mb=int(os.environ.get("RENDER_WORKER_MAX_MEMORY_MB", 4096))
+)
+
+@app.on_event("shutdown")
+def stop_render_workers():
+    render_pool.shutdown()
+
 # --- CORS ---
 origins = [
     "http://localhost:3000",
@@ -26,12 +40,21 @@ app.add_middleware(
 
 # --- Pydantic Models (Data Validation) ---
 class TransportRequest(BaseModel):
-    costMatrix: list
+    costMatrix: list = None
+    routes: list = None # Sparse input: [[from, to, cost], ...] allowed routes only (direct output)
     supply: list
     demand: list
     problemType: str
     outputType: str
-    solutionType: str
+    solutionType: str # "initial", "final", "both", "network" or "linprog" (the last two direct output only)
+    initialMethod: str = "vam" # "vam", "nwc", "least_cost", "russell" or "auto" (direct output)
+    streamEvents: bool = False # Write MODI events to <job>_events.ndjson while solving (direct output)
+    maxIterations: int = None # Stop MODI early after this many pivots (direct output)
+    timeBudget: float = None # ... or after this many seconds
+    pivotRule: str = "dantzig" # "dantzig", "first_improving", "block_search", "candidate_list" or "steepest_edge" (direct output)
+    sensitivity: bool = True # Add cost/supply/demand ranging to 'final' (direct output)
+    warmStart: dict = None # {"basis": [[r, c], ...], "changes": {...}} from a previous 'final' solution (direct output)
+    videoMode: str = "narrated" # "narrated" or "subtitles" (no TTS)
 
 class EOTRequest(BaseModel):
     load: float
@@ -40,11 +63,13 @@ class EOTRequest(BaseModel):
     speedUnit: str
     liftHeight: float
     outputType: str
+    videoMode: str = "narrated"
 
 class LaplaceRequest(BaseModel):
     latex: str
     operation: str
     outputType: str
+    videoMode: str = "narrated"
 
 class AssignmentRequest(BaseModel):
     isSquare: bool
@@ -52,7 +77,9 @@ class AssignmentRequest(BaseModel):
     cols: int
     problemType: str
     tableData: list
+    restrictions: list = None # rows x cols booleans, true = that worker can't take that task
     outputType: str
+    videoMode: str = "narrated"
 
 # --- NEW SFD_BMD MODEL ---
 class SFD_BMD_Request(BaseModel):
@@ -60,6 +87,7 @@ class SFD_BMD_Request(BaseModel):
     supports: List[Dict[str, Any]] # List of support objects
     loads: List[Dict[str, Any]]    # List of load objects
     outputType: str
+    videoMode: str = "narrated"
 # --- END NEW MODEL ---
 
 
@@ -77,11 +105,17 @@ def run_script_in_background(job_id: str, command: list, output_file_json: str):
 
     try:
         print(f"Starting job {job_id}: {' '.join(command)}")
-        command.insert(0, sys.executable) 
-        command.insert(1, "-X")
-        command.insert(2, "utf8")
+        output_type = command[command.index('--type') + 1]
+
+        if output_type in ('video', 'pdf'):
+            # Runs on a warm render worker (same result shape as subprocess.run)
+            result = render_pool.run(command)
+        else:
+            command.insert(0, sys.executable) 
+            command.insert(1, "-X")
+            command.insert(2, "utf8")
 
-        result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+            result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
         
         if result.returncode != 0:
             print(f"Job {job_id} FAILED. Stderr: {result.stderr}")
@@ -244,6 +278,24 @@ async def solve_sfd_bmd(req: SFD_BMD_Request, tasks: BackgroundTasks):
 # --- END NEW ENDPOINT ---
 
 
+@app.get("/api/transportation/events/{job_id}")
+async def get_transportation_events(job_id: str, since: int = 0):
+    """
+    MODI events a 'streamEvents' job has written so far. The client polls
+    with since=<next> to only get the new ones.
+    """
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    events_file = os.path.join(base_dir, '..', 'algo-viz', 'public', 'outputs', f"{job_id}_events.ndjson")
+
+    if not os.path.exists(events_file):
+        return {"events": [], "next": since}
+    with open(events_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    # A line still being written has no newline yet
+    complete = [line for line in lines[since:] if line.endswith("\n")]
+    return {"events": [json.loads(line) for line in complete], "next": since + len(complete)}
+
+
 @app.get("/api/status/{job_id}")
 async def get_status(job_id: str):
     """
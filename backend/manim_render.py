@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import sys
+
+# --- Shared In-Process Manim Renderer ---
+# Used by every *_main.py script instead of shelling out to the `manim` CLI.
+# The scene class is imported and rendered in the current interpreter, and
+# the movie is written straight to the path the caller asks for, so there
+# is no second interpreter start-up and no guessing where Manim put the file.
+
+def _load_scene_module(script_path):
+    """
+    Imports an animation script by path. The script's directory is put on
+    sys.path first so its own helper imports (e.g. MODI_helper_funcs) work.
+    """
+    script_dir = os.path.dirname(script_path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    module_name = os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def _prefetch_scene_narrations(scene_class):
+    """
+    For narrated scenes: dry-runs the scene with animations skipped to
+    collect every line it will speak, then starts synthesizing them all
+    in the background (see narration_prefetch).
+
+    Returns:
+        dict or None: The prefetch futures, or None for other scenes.
+    """
+    from manim import tempconfig
+    from narration_prefetch import PrefetchNarrationScene, prefetch_narrations
+
+    if not issubclass(scene_class, PrefetchNarrationScene):
+        return None
+
+    with tempconfig({"skip_animations": True, "write_to_movie": False}):
+        dry_run = scene_class()
+        dry_run.collect_narrations = True
+        dry_run.render()
+
+    return prefetch_narrations(getattr(dry_run, "collected_narrations", []))
+
+def render_scene(script_name, scene_name, cwd_dir, output_path=None, quality="low_quality", static=False,
+                 narration_mode="narrated"):
+    """
+    Renders 'scene_name' from 'cwd_dir/script_name' in this process.
+
+    Args:
+        script_name (str): The animation script, e.g. "animation.py".
+        scene_name (str): The Scene class to render.
+        cwd_dir (str): The module directory; scripts read their JSON input
+                       from here and Manim keeps its media/ cache here.
+        output_path (str): Where the final .mp4 must end up.
+        quality (str): A Manim quality name ("low_quality" matches -ql).
+        static (bool): For frame-capturing scenes (like manim -s). No movie
+                       is written, so 'output_path' is not needed.
+        narration_mode (str): "narrated" (TTS voice) or "subtitles" (no TTS,
+                              each line is burned in as a timed subtitle).
+
+    Returns:
+        str: The absolute path of the rendered video (None if static).
+    """
+    from manim import tempconfig
+
+    script_path = os.path.join(cwd_dir, script_name)
+    media_dir = os.path.join(cwd_dir, "media")
+
+    render_config = {
+        "quality": quality,
+        "disable_caching": True,
+        "media_dir": media_dir,
+        "verbosity": "WARNING",
+    }
+
+    if static:
+        render_config.update({
+            "write_to_movie": False,
+            "save_last_frame": True,
+            "skip_animations": True,
+        })
+    else:
+        if output_path is None:
+            raise ValueError("render_scene needs an output_path for video scenes.")
+        output_path = os.path.abspath(output_path)
+        render_config.update({
+            # Write the movie directly to the requested file
+            "video_dir": os.path.dirname(output_path),
+            "output_file": os.path.splitext(os.path.basename(output_path))[0],
+            # Keep the partial movie files out of the output folder
+            "partial_movie_dir": os.path.join(media_dir, "partial_movie_files", scene_name),
+        })
+
+    if narration_mode not in ("narrated", "subtitles"):
+        raise ValueError(f"Unknown narration mode: {narration_mode}")
+
+    print(f"Rendering {scene_name} from {script_name} (in-process, {narration_mode})")
+
+    # Scripts open their JSON input relative to their own folder
+    previous_cwd = os.getcwd()
+    os.chdir(cwd_dir)
+    try:
+        with tempconfig(render_config):
+            module = _load_scene_module(script_path)
+            scene_class = getattr(module, scene_name, None)
+            if scene_class is None:
+                raise Exception(f"Scene '{scene_name}' not found in {script_name}.")
+
+            prefetched = None
+            if not static and narration_mode == "narrated":
+                prefetched = _prefetch_scene_narrations(scene_class)
+
+            scene = scene_class()
+            scene.narration_mode = narration_mode
+            scene.prefetched_narrations = prefetched
+            scene.render()
+
+            rendered_file_path = None
+            if not static:
+                rendered_file_path = str(scene.renderer.file_writer.movie_file_path)
+    except Exception as e:
+        print("--- MANIM FAILED ---", file=sys.stderr)
+        raise Exception(f"Manim rendering for {script_name} failed: {e}") from e
+    finally:
+        os.chdir(previous_cwd)
+
+    print(f"Manim render complete for {scene_name}")
+
+    if static:
+        return None
+
+    if not os.path.exists(rendered_file_path):
+        raise Exception(f"Manim rendered, but output file not found at {rendered_file_path}.")
+    if os.path.abspath(rendered_file_path) != output_path:
+        # Only happens if Manim changed the extension (e.g. .mov)
+        os.replace(rendered_file_path, output_path)
+
+    return output_path
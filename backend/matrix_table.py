@@ -0,0 +1,355 @@
+from manim import *
+
+# --- Cached, Windowed Matrix Table ---
+# IntegerTable typesets every cell from scratch (LaTeX -> SVG -> paths), and
+# the MODI helpers used to rebuild the whole table on every iteration, so
+# scene construction grew with rows x cols x iterations.
+#
+# MatrixTable instead:
+#   - builds each distinct glyph once (GlyphCache) and copies it after that,
+#   - changes cells in place: setters only touch the slots whose content
+#     actually changed and hand back the animations for them,
+#   - for matrices bigger than MAX_VISIBLE_ROWS x MAX_VISIBLE_COLS, only lays
+#     out a window of rows/columns. focus() moves that window to the rows,
+#     columns or loop being explained.
+
+MAX_VISIBLE_ROWS = 8
+MAX_VISIBLE_COLS = 8
+
+MARK_Z_INDEX = 15 # Allocation numbers sit above highlights and lines
+
+class GlyphCache:
+    """
+    Builds each distinct (value, color) glyph once and hands out copies.
+    Copying a mobject is far cheaper than typesetting it again.
+    """
+
+    def __init__(self, factory, max_size=2048):
+        self.factory = factory
+        self.max_size = max_size
+        self._glyphs = {}
+
+    def get(self, value, color):
+        key = (value, str(color))
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            if len(self._glyphs) >= self.max_size:
+                self._glyphs.clear()
+            glyph = self.factory(value, color=color)
+            self._glyphs[key] = glyph
+        return glyph.copy()
+
+integer_glyphs = GlyphCache(Integer)
+tex_glyphs = GlyphCache(Tex)
+math_glyphs = GlyphCache(MathTex)
+
+def play_updates(scene, animations, **kwargs):
+    """Plays table update animations; does nothing if there are none."""
+    if animations:
+        scene.play(*animations, **kwargs)
+
+class MatrixTable(Table):
+    """
+    An IntegerTable for cost matrices whose cells can be changed in place.
+
+    Positions passed to get_cell()/get_entries() use the same numbering as
+    Manim's Table ((1, 1) is the top-left label corner), and (r, c) passed to
+    the setters are 0-based data indices. Both always refer to the *full*
+    matrix, so callers never need to know which rows are on screen. The last
+    'pinned_rows' rows and 'pinned_cols' columns (e.g. the demand row and
+    supply column) are always shown.
+
+    Setters change the table's state right away and return the animations
+    that bring the visible slots up to date (empty if nothing visible
+    changed). With animate=False the slots are updated immediately instead.
+    """
+
+    def __init__(self, values, row_labels, col_labels, pinned_rows=0, pinned_cols=0,
+                 max_rows=MAX_VISIBLE_ROWS, max_cols=MAX_VISIBLE_COLS, text_color=WHITE,
+                 marks=False, notes=False, **kwargs):
+        self.values = [list(row) for row in values]
+        self.row_names = [str(label) for label in row_labels]
+        self.col_names = [str(label) for label in col_labels]
+        self.pinned_rows = pinned_rows
+        self.pinned_cols = pinned_cols
+        self.text_color = text_color
+        self.num_rows = len(self.values) - pinned_rows # Data rows/cols, without the pinned ones
+        self.num_cols = len(self.values[0]) - pinned_cols
+
+        self.visible_rows = list(range(min(self.num_rows, max_rows or self.num_rows)))
+        self.visible_cols = list(range(min(self.num_cols, max_cols or self.num_cols)))
+        self.is_windowed = len(self.visible_rows) < self.num_rows or len(self.visible_cols) < self.num_cols
+
+        self.highlights = {} # (r, c) -> (color, fill_opacity)
+        self.marks = {}      # (r, c) -> (tex, color), e.g. allocations
+        self.row_notes = {}  # r -> Mobject shown right of the row (e.g. u_i)
+        self.col_notes = {}  # c -> Mobject shown below the column (e.g. v_j)
+        self.glyph_scale = 1.0
+        self._shown = {}     # slot key -> what the slot currently shows
+
+        slot_rows = self._slot_rows()
+        slot_cols = self._slot_cols()
+        if self.is_windowed:
+            # Size every slot for the widest value/label it could ever hold,
+            # so scrolling never overflows a cell. The real window is filled
+            # in by the first _refresh() below.
+            widest_value = max((v for row in self.values for v in row), key=lambda v: len(str(v)))
+            widest_row = max(self.row_names, key=len)
+            widest_col = max(self.col_names, key=len)
+            layout = [[widest_value] * len(slot_cols) for _ in slot_rows]
+            row_mobs = [tex_glyphs.get(widest_row, text_color) for _ in slot_rows]
+            col_mobs = [tex_glyphs.get(widest_col, text_color) for _ in slot_cols]
+        else:
+            layout = [[self.values[r][c] for c in slot_cols] for r in slot_rows]
+            row_mobs = [tex_glyphs.get(self.row_names[r], text_color) for r in slot_rows]
+            col_mobs = [tex_glyphs.get(self.col_names[c], text_color) for c in slot_cols]
+
+        super().__init__(
+            layout,
+            row_labels=row_mobs,
+            col_labels=col_mobs,
+            element_to_mobject=lambda value: integer_glyphs.get(value, text_color),
+            **kwargs
+        )
+
+        # One invisible rectangle per slot. It keeps the cell geometry fixed
+        # while the glyphs inside change, and doubles as the cell highlight.
+        self.cell_slots = {}
+        for i in range(1, len(slot_rows) + 2):
+            for j in range(1, len(slot_cols) + 2):
+                self.cell_slots[(i, j)] = super().get_cell((i, j), stroke_width=0, fill_opacity=0)
+        self.add_to_back(*self.cell_slots.values())
+
+        # Corner marks for the data cells, invisible until set_mark()
+        self.mark_slots = {}
+        if marks:
+            for i in range(2, len(self.visible_rows) + 2):
+                for j in range(2, len(self.visible_cols) + 2):
+                    placeholder = self._placeholder().move_to(self._mark_anchor(i, j)).set_z_index(MARK_Z_INDEX)
+                    self.mark_slots[(i, j)] = placeholder
+            self.add(*self.mark_slots.values())
+
+        # Notes in the margin right of each row / below each column
+        self.row_note_slots = {}
+        self.col_note_slots = {}
+        if notes:
+            for i in range(2, len(self.visible_rows) + 2):
+                self.row_note_slots[i] = self._placeholder().move_to(self._row_note_anchor(i))
+            for j in range(2, len(self.visible_cols) + 2):
+                self.col_note_slots[j] = self._placeholder().move_to(self._col_note_anchor(j))
+            self.add(*self.row_note_slots.values(), *self.col_note_slots.values())
+
+        if self.is_windowed:
+            self._refresh(animate=False) # Swap the sizing glyphs for the real window
+        else:
+            for i, r in enumerate(slot_rows, start=2):
+                self._shown[("row_label", i)] = self.row_names[r]
+                for j, c in enumerate(slot_cols, start=2):
+                    self._shown[("entry", i, j)] = self.values[r][c]
+            for j, c in enumerate(slot_cols, start=2):
+                self._shown[("col_label", j)] = self.col_names[c]
+
+    # --- Window ---
+
+    def _slot_rows(self):
+        """Full row indices shown by slot rows 2, 3, ... (pinned rows last)."""
+        return self.visible_rows + list(range(self.num_rows, self.num_rows + self.pinned_rows))
+
+    def _slot_cols(self):
+        return self.visible_cols + list(range(self.num_cols, self.num_cols + self.pinned_cols))
+
+    @staticmethod
+    def _slot_index(index, visible, total):
+        """Table index (labels = 1) -> slot index, or None if it is off-screen."""
+        if index < 2:
+            return index
+        i = index - 2
+        if i >= total: # Pinned
+            return len(visible) + 2 + (i - total)
+        if i in visible:
+            return visible.index(i) + 2
+        return None
+
+    def _slot(self, pos):
+        """Maps a full-matrix table position to its slot, scrolling to it if needed."""
+        slot = (
+            self._slot_index(pos[0], self.visible_rows, self.num_rows),
+            self._slot_index(pos[1], self.visible_cols, self.num_cols),
+        )
+        if None in slot:
+            self.focus(rows=[pos[0] - 2], cols=[pos[1] - 2], animate=False)
+            return self._slot(pos)
+        return slot
+
+    @staticmethod
+    def _window(current, wanted, total):
+        """Picks which data lines to show so that every line in 'wanted' is visible (if it fits)."""
+        size = len(current)
+        wanted = sorted({i for i in wanted if 0 <= i < total})
+        if size == total or not wanted or all(i in current for i in wanted):
+            return current
+
+        if wanted[-1] - wanted[0] < size:
+            # A contiguous block centred on the wanted lines
+            start = wanted[0] - (size - (wanted[-1] - wanted[0] + 1)) // 2
+            start = max(0, min(start, total - size))
+            return list(range(start, start + size))
+
+        # Too far apart for one block: the wanted lines (as many as fit)
+        # topped up with their nearest neighbours
+        chosen = set(wanted[:size])
+        others = sorted(
+            (i for i in range(total) if i not in chosen),
+            key=lambda i: min(abs(i - w) for w in chosen)
+        )
+        chosen.update(others[:size - len(chosen)])
+        return sorted(chosen)
+
+    def focus(self, rows=(), cols=(), animate=True):
+        """
+        Scrolls the window so the data rows 'rows' and columns 'cols' are on
+        screen (as many as fit). Does nothing for tables that fit entirely.
+        """
+        new_rows = self._window(self.visible_rows, rows, self.num_rows)
+        new_cols = self._window(self.visible_cols, cols, self.num_cols)
+        if new_rows == self.visible_rows and new_cols == self.visible_cols:
+            return []
+        self.visible_rows = new_rows
+        self.visible_cols = new_cols
+        return self._refresh(animate)
+
+    def is_visible(self, r, c):
+        return (r in self.visible_rows or r >= self.num_rows) and (c in self.visible_cols or c >= self.num_cols)
+
+    # --- Table API (full-matrix positions) ---
+
+    def get_cell(self, pos=(1, 1), **kwargs):
+        return Polygon(*self.cell_slots[self._slot(pos)].get_vertices(), **kwargs)
+
+    def get_entries(self, pos=None):
+        if pos is None:
+            return super().get_entries()
+        return super().get_entries(self._slot(pos))
+
+    def add_highlighted_cell(self, pos=(1, 1), color=YELLOW, **kwargs):
+        self.set_highlight(pos[0] - 2, pos[1] - 2, color, kwargs.get("fill_opacity", 0.75), animate=False)
+        return self
+
+    def scale(self, scale_factor, **kwargs):
+        # New glyphs must come out at the same size as the ones already in the table
+        self.glyph_scale *= scale_factor
+        return super().scale(scale_factor, **kwargs)
+
+    # --- Setters ---
+
+    def set_entry(self, r, c, value, animate=True):
+        self.values[r][c] = value
+        return self._refresh(animate)
+
+    def set_highlight(self, r, c, color=None, fill_opacity=0.45, animate=True):
+        """Fills cell (r, c) with 'color' (None removes the highlight)."""
+        if color is None:
+            self.highlights.pop((r, c), None)
+        else:
+            self.highlights[(r, c)] = (ManimColor(color), fill_opacity)
+        return self._refresh(animate)
+
+    def set_mark(self, r, c, tex, color=BLACK, animate=True):
+        """Shows 'tex' in the top-left corner of cell (r, c) (None removes it)."""
+        if tex is None:
+            self.marks.pop((r, c), None)
+        else:
+            self.marks[(r, c)] = (tex, ManimColor(color))
+        return self._refresh(animate)
+
+    def set_row_note(self, r, mobject, animate=True):
+        self.row_notes[r] = mobject
+        return self._refresh(animate)
+
+    def set_col_note(self, c, mobject, animate=True):
+        self.col_notes[c] = mobject
+        return self._refresh(animate)
+
+    def clear_notes(self, animate=True):
+        self.row_notes.clear()
+        self.col_notes.clear()
+        return self._refresh(animate)
+
+    # --- Slot updates ---
+
+    def _placeholder(self):
+        return math_glyphs.get("0", self.text_color).scale(self.glyph_scale).set_opacity(0)
+
+    def _mark_anchor(self, i, j):
+        cell = self.cell_slots[(i, j)]
+        return cell.get_corner(UP + LEFT) + (DOWN * 0.24 + RIGHT * 0.28) * self.glyph_scale
+
+    def _row_note_anchor(self, i):
+        last_col = max(j for (_, j) in self.cell_slots)
+        cell = self.cell_slots[(i, last_col)]
+        return np.array([cell.get_right()[0] + 1.0 * self.glyph_scale, cell.get_center()[1], 0])
+
+    def _col_note_anchor(self, j):
+        last_row = max(i for (i, _) in self.cell_slots)
+        cell = self.cell_slots[(last_row, j)]
+        return np.array([cell.get_center()[0], cell.get_bottom()[1] - 0.85 * self.glyph_scale, 0])
+
+    def _refresh(self, animate):
+        """Updates every slot whose content differs from what it shows."""
+        animations = []
+
+        def update(key, state, slot, build_target):
+            if self._shown.get(key) == state: # Unset highlights/marks/notes start out empty
+                return
+            self._shown[key] = state
+            target = build_target()
+            if animate:
+                animations.append(Transform(slot, target))
+            else:
+                slot.become(target)
+
+        s = self.glyph_scale
+        slot_rows = self._slot_rows()
+        slot_cols = self._slot_cols()
+
+        for i, r in enumerate(slot_rows, start=2):
+            cell = self.cell_slots[(i, 1)]
+            update(("row_label", i), self.row_names[r], self.mob_table[i - 1][0],
+                   lambda: tex_glyphs.get(self.row_names[r], self.text_color).scale(s).move_to(cell))
+
+        for j, c in enumerate(slot_cols, start=2):
+            cell = self.cell_slots[(1, j)]
+            update(("col_label", j), self.col_names[c], self.mob_table[0][j - 1],
+                   lambda: tex_glyphs.get(self.col_names[c], self.text_color).scale(s).move_to(cell))
+
+        for i, r in enumerate(slot_rows, start=2):
+            for j, c in enumerate(slot_cols, start=2):
+                cell = self.cell_slots[(i, j)]
+                value = self.values[r][c]
+                update(("entry", i, j), value, self.mob_table[i - 1][j - 1],
+                       lambda: integer_glyphs.get(value, self.text_color).scale(s).move_to(cell))
+
+                highlight = self.highlights.get((r, c))
+                update(("highlight", i, j), highlight, cell,
+                       lambda: cell.copy().set_fill(*highlight) if highlight else cell.copy().set_fill(opacity=0))
+
+                mark_slot = self.mark_slots.get((i, j))
+                if mark_slot is not None:
+                    mark = self.marks.get((r, c))
+                    update(("mark", i, j), mark, mark_slot,
+                           lambda: (math_glyphs.get(*mark).scale(s) if mark else mark_slot.copy().set_opacity(0))
+                                   .move_to(self._mark_anchor(i, j)).set_z_index(MARK_Z_INDEX))
+
+        for i, note_slot in self.row_note_slots.items():
+            note = self.row_notes.get(slot_rows[i - 2])
+            update(("row_note", i), id(note) if note is not None else None, note_slot,
+                   lambda: (note.copy() if note is not None else note_slot.copy().set_opacity(0))
+                           .move_to(self._row_note_anchor(i)))
+
+        for j, note_slot in self.col_note_slots.items():
+            note = self.col_notes.get(slot_cols[j - 2])
+            update(("col_note", j), id(note) if note is not None else None, note_slot,
+                   lambda: (note.copy() if note is not None else note_slot.copy().set_opacity(0))
+                           .move_to(self._col_note_anchor(j)))
+
+        return animations
@@ -0,0 +1,196 @@
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+import threading
+
+import numpy as np
+import soundfile as sf
+from manim import config
+from manim_narration import NarrationScene
+
+from speech_services import VoiceRef, get_kokoro_model, get_kokoro_service, service_voice
+
+# --- Concurrent Narration Prefetch ---
+# NarrationScene synthesizes speech one `with self.narration(...)` block at a
+# time, so TTS and frame rendering never overlap. render_scene() instead runs
+# a quick dry pass of the scene (animations skipped) that only collects the
+# narration texts, hands them all to a thread pool, and then starts the real
+# render. The real render only waits when it reaches a line whose audio is
+# not ready yet.
+#
+# With narration_mode = "subtitles" there is no TTS at all: each line is
+# burned into the video as a subtitle for as long as it would have been
+# spoken (cached audio length if we have it, else a words-per-second guess).
+
+PREFETCH_WORKERS = int(os.environ.get("NARRATION_PREFETCH_WORKERS", 2))
+WORDS_PER_SECOND = 2.5 # Typical Kokoro speaking rate, used for estimates
+
+KOKORO_SAMPLE_RATE = 24000
+KOKORO_LANG_CODES = {"en-us": "a", "en-gb": "b"}
+
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="narration"
+)
+_thread_state = threading.local()
+
+def estimate_duration(text, words_per_second=WORDS_PER_SECOND):
+    """Estimated speaking time of 'text' in seconds (at least one second)."""
+    return max(1.0, len(text.split()) / words_per_second)
+
+def _kokoro_pipeline(lang_code):
+    """
+    One Kokoro pipeline per thread and language (pipelines aren't
+    thread-safe), all running the one shared model.
+    """
+    if not hasattr(_thread_state, "pipelines"):
+        _thread_state.pipelines = {}
+    if lang_code not in _thread_state.pipelines:
+        from kokoro import KPipeline
+        _thread_state.pipelines[lang_code] = KPipeline(lang_code=KOKORO_LANG_CODES.get(lang_code, "a"),
+                                                       model=get_kokoro_model())
+    return _thread_state.pipelines[lang_code]
+
+def narration_audio_path(voice, lang_code, text, cache_dir):
+    key = hashlib.sha1(f"{voice}|{lang_code}|{text}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{key}.wav")
+
+def synthesize(voice, lang_code, text, cache_dir):
+    """
+    Synthesizes 'text' to a .wav in 'cache_dir' (reused if it already exists).
+
+    Returns:
+        tuple: (audio_path, duration_in_seconds)
+    """
+    audio_path = narration_audio_path(voice, lang_code, text, cache_dir)
+    if os.path.exists(audio_path):
+        return audio_path, sf.info(audio_path).duration
+
+    pipeline = _kokoro_pipeline(lang_code)
+    chunks = []
+    for _, _, audio in pipeline(text, voice=voice):
+        if audio is not None:
+            chunks.append(np.asarray(audio, dtype=np.float32))
+    audio = np.concatenate(chunks) if chunks else np.zeros(KOKORO_SAMPLE_RATE, dtype=np.float32)
+
+    # Write to a temp file first so a half-written .wav is never picked up
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{audio_path}.{threading.get_ident()}.tmp"
+    sf.write(temp_path, audio, KOKORO_SAMPLE_RATE, format="WAV")
+    os.replace(temp_path, audio_path)
+
+    return audio_path, len(audio) / KOKORO_SAMPLE_RATE
+
+def prefetch_narrations(narrations, cache_dir=None):
+    """
+    Starts synthesizing every (voice, lang_code, text) in 'narrations'.
+
+    Returns:
+        dict: (voice, lang_code, text) -> Future of (audio_path, duration)
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(config.media_dir, "narration")
+
+    futures = {}
+    for key in narrations:
+        if key not in futures:
+            voice, lang_code, text = key
+            futures[key] = _executor.submit(synthesize, voice, lang_code, text, cache_dir)
+    print(f"Prefetching {len(futures)} narration lines on {PREFETCH_WORKERS} threads")
+    return futures
+
+class NarrationTracker:
+    """What `with self.narration(...) as narration` gives back."""
+
+    def __init__(self, duration):
+        self.duration = duration
+
+@contextlib.contextmanager
+def timed_narration(scene, duration, audio_path=None):
+    """
+    Plays 'audio_path' (if any) from the current time and keeps the scene
+    running until 'duration' seconds have passed, like NarrationScene does.
+    """
+    if audio_path is not None:
+        scene.add_sound(audio_path)
+    start_time = scene.renderer.time
+    yield NarrationTracker(duration)
+    remaining = start_time + duration - scene.renderer.time
+    if remaining > 0:
+        scene.wait(remaining)
+
+def make_subtitle(text, width=60):
+    """A wrapped caption box pinned to the bottom of the frame."""
+    import textwrap
+    from manim import Text, BackgroundRectangle, VGroup, BLACK, WHITE, DOWN
+
+    caption = Text("\n".join(textwrap.wrap(text, width)), font_size=22, color=WHITE, line_spacing=0.8)
+    box = BackgroundRectangle(caption, color=BLACK, fill_opacity=0.7, buff=0.12)
+    subtitle = VGroup(box, caption).to_edge(DOWN, buff=0.15)
+    subtitle.set_z_index(100)
+    return subtitle
+
+@contextlib.contextmanager
+def subtitled_narration(scene, text, duration):
+    """Shows 'text' as a subtitle for 'duration' seconds instead of speaking it."""
+    subtitle = make_subtitle(text)
+    scene.add(subtitle)
+    with timed_narration(scene, duration) as tracker:
+        yield tracker
+    scene.remove(subtitle)
+
+def subtitle_duration(voice, text):
+    """How long 'text' is on screen: cached audio length, else an estimate."""
+    if voice is not None:
+        cache_dir = os.path.join(config.media_dir, "narration")
+        audio_path = narration_audio_path(*voice, text, cache_dir)
+        if os.path.exists(audio_path):
+            return sf.info(audio_path).duration
+    return estimate_duration(text)
+
+class PrefetchNarrationScene(NarrationScene):
+    """
+    NarrationScene that can (a) only collect its narration texts, for the
+    dry pass, (b) play audio that was synthesized ahead of time, and
+    (c) show subtitles instead of speaking (narration_mode "subtitles").
+    Lines that were not prefetched fall back to NarrationScene.
+    """
+
+    collect_narrations = False  # Set by render_scene for the dry pass
+    prefetched_narrations = None # (voice, lang_code, text) -> Future
+    narration_mode = "narrated"  # Or "subtitles"
+
+    def set_speech_services(self, **services):
+        if not hasattr(self, "_service_voices"):
+            self._service_voices = {}
+        for service_id, service in services.items():
+            self._service_voices[service_id] = service_voice(service)
+
+        if self.narration_mode == "subtitles":
+            return # No TTS model is needed
+
+        super().set_speech_services(**{
+            service_id: get_kokoro_service(*service) if isinstance(service, VoiceRef) else service
+            for service_id, service in services.items()
+        })
+
+    def narration(self, speech_service_id, text, **kwargs):
+        voice = getattr(self, "_service_voices", {}).get(speech_service_id)
+        key = (*voice, text) if voice is not None else None
+
+        if self.narration_mode == "subtitles":
+            return subtitled_narration(self, text, subtitle_duration(voice, text))
+
+        if self.collect_narrations:
+            if not hasattr(self, "collected_narrations"):
+                self.collected_narrations = []
+            if key is not None:
+                self.collected_narrations.append(key)
+            return timed_narration(self, estimate_duration(text))
+
+        future = (self.prefetched_narrations or {}).get(key)
+        if future is None:
+            return super().narration(speech_service_id=speech_service_id, text=text, **kwargs)
+
+        audio_path, duration = future.result()
+        return timed_narration(self, duration, audio_path)
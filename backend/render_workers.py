@@ -0,0 +1,220 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import resource
+import runpy
+import subprocess
+import sys
+import traceback
+
+try:
+    import psutil # Optional: used for the memory-based recycling
+except ImportError:
+    psutil = None
+
+# --- Long-Lived Render Workers ---
+# A video job used to start a fresh interpreter that imported Manim and then
+# loaded the Kokoro TTS model, which can take longer than rendering a short
+# scene. A render worker does that set-up once and then runs many jobs.
+# Workers are recycled after 'max_jobs' jobs or once they grow past
+# 'max_memory_mb', so leaks in Manim/torch can't build up forever.
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _memory_mb():
+    """
+    Resident memory of this process in MB. Without psutil this falls back
+    to the peak resident size, which never goes down but still trips the
+    recycling threshold once the worker has grown too big.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _warm_up():
+    """Loads Manim, the narration plugin and the Kokoro voices once."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.append(BACKEND_DIR)
+
+    import manim
+    import manim_narration
+    from speech_services import preload_voices
+
+    preload_voices()
+    print(f"Render worker {os.getpid()} ready ({_memory_mb():.0f} MB)")
+
+def _forget_job_modules():
+    """
+    Drops the job's own modules (solvers, helper_funcs, animation...) from
+    sys.modules. Several modules share names (e.g. every folder has an
+    'animation.py'), so the next job must import its own copies. Manim,
+    torch and the shared backend modules stay loaded.
+    """
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+        module_dir = os.path.dirname(os.path.abspath(module_file))
+        if not module_dir.startswith(BACKEND_DIR + os.sep):
+            continue
+        if "site-packages" in module_dir: # A virtualenv inside backend/
+            continue
+        del sys.modules[name]
+
+def _reset_manim_defaults():
+    """
+    Undoes Mobject.set_default(...) calls made by the job's modules (the
+    MODI helpers make Tex/MathTex/Line/Table black for their white
+    background). tempconfig only restores 'config', so without this the
+    next scene in this worker would draw black text on black.
+    """
+    from manim import Tex, MathTex, Line, Table
+
+    for mobject_class in (Tex, MathTex, Line, Table):
+        mobject_class.set_default() # No arguments: back to the original __init__
+
+def _run_job(command):
+    """
+    Runs one *_main.py command (script path + arguments) as if it was
+    started with 'python <script> <args>', and collects its output.
+    """
+    script_path = command[0]
+    job_dir = os.path.dirname(os.path.abspath(script_path))
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+
+    sys.argv = list(command)
+    sys.path.insert(0, job_dir)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                runpy.run_path(script_path, run_name="__main__")
+            except SystemExit as e:
+                # The *_main scripts report failure with sys.exit(1)
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        _reset_manim_defaults()
+        _forget_job_modules()
+
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+def _worker_main(conn, max_jobs, max_memory_mb):
+    """Entry point of a worker process: warm up, then serve jobs."""
+    _warm_up()
+
+    jobs_done = 0
+    while True:
+        try:
+            command = conn.recv()
+        except EOFError:
+            break
+        if command is None: # Shutdown request
+            break
+
+        result = _run_job(command)
+        jobs_done += 1
+
+        memory = _memory_mb()
+        result["recycle"] = jobs_done >= max_jobs or memory > max_memory_mb
+        if result["recycle"]:
+            print(f"Render worker {os.getpid()} recycling after {jobs_done} jobs ({memory:.0f} MB)")
+        conn.send(result)
+
+        if result["recycle"]:
+            break
+    conn.close()
+
+class _RenderWorker:
+    """Parent-side handle for one worker process."""
+
+    def __init__(self, ctx, max_jobs, max_memory_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, max_jobs, max_memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=10)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.conn.close()
+
+class RenderWorkerPool:
+    """
+    A fixed number of render worker slots. run() blocks until a worker is
+    free, so at most 'num_workers' renders happen at once. Workers are
+    started on first use and replaced when they recycle or crash.
+    """
+
+    def __init__(self, num_workers=1, max_jobs=20, max_memory_mb=4096):
+        # 'spawn' so workers never inherit the server's threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self._slots = queue.Queue()
+        for _ in range(num_workers):
+            self._slots.put(None) # No process yet
+
+    def run(self, command):
+        """
+        Runs a *_main.py command on a worker. Returns a CompletedProcess,
+        the same shape subprocess.run() gives back.
+        """
+        worker = self._slots.get()
+        try:
+            if worker is None or not worker.is_alive():
+                worker = _RenderWorker(self._ctx, self.max_jobs, self.max_memory_mb)
+
+            try:
+                worker.conn.send(list(command))
+                result = worker.conn.recv()
+            except (EOFError, BrokenPipeError, OSError) as e:
+                # The worker died mid-job (e.g. killed for memory)
+                result = {"returncode": 1, "stdout": "",
+                          "stderr": f"Render worker crashed: {e}", "recycle": True}
+
+            if result.get("recycle"):
+                worker.stop()
+                worker = None
+        finally:
+            self._slots.put(worker)
+
+        return subprocess.CompletedProcess(command, result["returncode"], result["stdout"], result["stderr"])
+
+    def shutdown(self):
+        """Stops every running worker."""
+        while True:
+            try:
+                worker = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
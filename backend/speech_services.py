@@ -0,0 +1,58 @@
+import threading
+from collections import namedtuple
+from manim_narration.speech import KokoroService
+
+# --- Shared Kokoro TTS Services ---
+# Loading a Kokoro voice is expensive (model weights + pipeline set-up), and
+# scenes call set_speech_services() in construct() and again inside helper
+# methods. This keeps one service per voice for the life of the process, so
+# a render worker only pays for the model load once. The narration prefetch
+# threads (narration_prefetch.py) each need their own KPipeline, but those
+# are just text-to-phoneme front ends around get_kokoro_model().
+
+DEFAULT_VOICES = ("af_heart", "af_jessica")
+
+# What scenes pass to set_speech_services(). The scene only turns it into
+# a real KokoroService when it actually speaks, so subtitle-only renders
+# never load the TTS model.
+VoiceRef = namedtuple("VoiceRef", ["voice", "lang_code"])
+
+def kokoro_voice(voice, lang_code="en-us"):
+    return VoiceRef(voice, lang_code)
+
+_services = {}
+_service_keys = {} # id(service) -> (voice, lang_code)
+
+def get_kokoro_service(voice, lang_code="en-us"):
+    """Returns the shared KokoroService for 'voice', creating it on first use."""
+    key = (voice, lang_code)
+    if key not in _services:
+        print(f"Loading Kokoro voice '{voice}' ({lang_code})...")
+        _services[key] = KokoroService(voice=voice, lang_code=lang_code)
+        _service_keys[id(_services[key])] = key
+    return _services[key]
+
+_kokoro_model = None
+_model_lock = threading.Lock()
+
+def get_kokoro_model():
+    """Returns the Kokoro model weights, loaded once per process and shared by every pipeline."""
+    global _kokoro_model
+    with _model_lock:
+        if _kokoro_model is None:
+            from kokoro import KModel
+            print("Loading Kokoro model...")
+            _kokoro_model = KModel().eval()
+    return _kokoro_model
+
+def service_voice(service):
+    """Returns (voice, lang_code) for a VoiceRef or a service made by get_kokoro_service, else None."""
+    if isinstance(service, VoiceRef):
+        return tuple(service)
+    return _service_keys.get(id(service))
+
+def preload_voices(voices=DEFAULT_VOICES, lang_code="en-us"):
+    """Loads every voice and the prefetch model up front (used when a render worker starts)."""
+    for voice in voices:
+        get_kokoro_service(voice, lang_code)
+    get_kokoro_model()
@@ -0,0 +1,51 @@
+"""
+Checks that render worker jobs don't leak Manim state into each other.
+
+Usage (from backend/):
+    python test_render_workers.py    or    python -m pytest test_render_workers.py
+"""
+import os
+import tempfile
+
+from manim import WHITE, Line
+
+from render_workers import _run_job
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Job 1 imports the MODI helpers, which set black defaults at import time
+MODI_JOB = f"""
+import sys
+sys.path.insert(0, {os.path.join(BACKEND_DIR, "Transportation")!r})
+import MODI_helper_funcs
+from manim import Line
+print("modi line color", Line().get_color().to_hex())
+"""
+
+# Job 2 stands in for any other scene (VAM, Assignment, EOT...)
+OTHER_JOB = """
+from manim import Line
+print("other line color", Line().get_color().to_hex())
+"""
+
+def _write_script(folder, name, source):
+    path = os.path.join(folder, name)
+    with open(path, "w") as f:
+        f.write(source)
+    return path
+
+def test_two_jobs_in_sequence_on_one_worker():
+    with tempfile.TemporaryDirectory() as folder:
+        first = _run_job([_write_script(folder, "modi_job.py", MODI_JOB)])
+        second = _run_job([_write_script(folder, "other_job.py", OTHER_JOB)])
+
+    assert first["returncode"] == 0, first["stderr"]
+    assert "modi line color #000000" in first["stdout"]
+    assert second["returncode"] == 0, second["stderr"]
+    assert f"other line color {WHITE.to_hex()}" in second["stdout"]
+    # And the worker process itself is back to Manim's defaults
+    assert Line().get_color().to_hex() == WHITE.to_hex()
+
+if __name__ == "__main__":
+    test_two_jobs_in_sequence_on_one_worker()
+    print("OK")